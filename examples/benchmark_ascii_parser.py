@@ -0,0 +1,73 @@
+# ---
+# jupyter:
+#   jupytext:
+#     formats: ipynb,py:percent
+#     text_representation:
+#       extension: .py
+#       format_name: percent
+#       format_version: '1.3'
+#       jupytext_version: 1.13.6
+#   kernelspec:
+#     display_name: Python (etlp)
+#     language: python
+#     name: etlp
+# ---
+
+# %% [markdown]
+# # Benchmark the ASCII keyword parsers
+#
+# `EclAsciiParser` has two parsers. The default `"earley"` parser builds a full parse tree with the `lark` grammar, the `"scanner"` parser reads the file line by line straight into keyword records. Large property files like GRDECL exports are mostly plain numeric data records, this compares how the two parsers scale with file size.
+
+# %%
+import time
+import pathlib
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from eclx import EclAsciiParser
+
+tmp = pathlib.Path(tempfile.mkdtemp())
+
+
+def write_grdecl(filepath, n, keywords=("PORO", "PERMX")):
+    """Write n values for each keyword, 6 values per line"""
+    values = np.random.default_rng(42).random(n)
+    with open(filepath, "w") as f:
+        for kw in keywords:
+            f.write(f"-- {kw} property\n{kw}\n")
+            for i in range(0, n, 6):
+                f.write(" ".join(f"{v:.6f}" for v in values[i : i + 6]) + "\n")
+            f.write("/\n\n")
+
+
+def time_parser(filepath, parser):
+    p = EclAsciiParser(parser)
+    tic = time.perf_counter()
+    p.parse(filepath)
+    return time.perf_counter() - tic
+
+
+# %% [markdown]
+# The grammar parser is only timed for the small files.
+
+# %%
+results = []
+for n in [1_000, 5_000, 20_000, 100_000, 1_000_000]:
+    filepath = tmp / f"PROPS_{n}.GRDECL"
+    write_grdecl(filepath, n)
+    size = filepath.stat().st_size / 1e6
+    for parser in ["earley", "scanner"]:
+        if parser == "earley" and n > 20_000:
+            continue
+        seconds = time_parser(filepath, parser)
+        results.append(
+            dict(parser=parser, values=n, MB=size, seconds=seconds, MB_s=size / seconds)
+        )
+
+results = pd.DataFrame(results)
+results
+
+# %%
+results.pivot(index="values", columns="parser", values="MB_s")
@@ -58,3 +58,14 @@ q = EclAsciiParser()
 q.parse("../tests/resources/t1a/TUT1A.DATA")
 
 # %%
+
+# %% [markdown]
+# ## Streaming typed arrays
+#
+# `iter_keywords` reads a file one keyword at a time. Numeric records are returned as NumPy masked arrays with the `x*y` repeats expanded and `x*` defaults masked, so large property includes can be loaded without holding every value as a string.
+
+# %%
+for kw, values in q.iter_keywords(
+    "../tests/resources/t1a/TUT1A.DATA", types={"SATNUM": "INTE"}
+):
+    print(kw, values if not isinstance(values, list) else len(values))
@@ -1,15 +1,44 @@
 from ._version import version as __version__
 
-from ._eclascii import EclAsciiParser
+from ._eclascii import EclAsciiParser, parse_ecl_deck
 from ._ecldeck import EclDeck
-from ._utils import get_filetype, get_ecl_deck
+from ._session import EclSession
+from ._eclbinary import (
+    EclBinaryFile,
+    open_EclBinaryFile,
+    load_keyword_index,
+    write_ecl_binary,
+)
+from ._utils import get_filetype, get_ecl_deck, find_ecl_decks
 from ._ecl_file import (
     open_EclFile,
     load_ecl_property,
+    expand_ecl_property,
     load_ecl_grid_index,
     get_ecl_property_keys,
+    get_ecl_file_reports,
+)
+from ._grid import (
+    open_EclGrid,
+    load_ecl_grid,
+    load_ecl_geometry,
+    EclGridGeometry,
+    EclGridSurfaces,
+)
+from ._init import load_init_intehead, load_init_headers
+from ._rst import (
+    load_ecl_rst,
+    load_ecl_rst_store,
+    iter_ecl_rst,
+    get_restart_reports,
+    EclReportStore,
+)
+from ._sum import (
+    get_summary_keys,
+    load_summary_df,
+    load_summary_index,
+    load_ensemble_summary,
+    export_summary,
+    open_EclSum,
 )
-from ._grid import open_EclGrid, load_ecl_grid
-from ._init import load_init_intehead
-from ._rst import load_ecl_rst, get_restart_reports
-from ._sum import get_summary_keys, load_summary_df, open_EclSum
+from ._store import export_ecl_arrays
@@ -7,13 +7,24 @@ from warnings import warn
 
 import numpy as np
 
+from ecl import EclFileEnum
 from ecl.eclfile import EclFile
 
-from ._grid import load_ecl_grid_index, open_EclGrid
+from ._eclbinary import EclBinaryFile, is_ecl_binary_file, native_array
+from ._grid import load_ecl_grid_index
+from ._session import session_cached
 from ._utils import import_tqdm, get_ecl_deck
 
 tqdm = import_tqdm()
 
+# native dtypes of the keyword values returned by _iget_named_kw_values
+_ECL_TYPE_DTYPES = {
+    "INTE": np.dtype("int32"),
+    "REAL": np.dtype("float32"),
+    "DOUB": np.dtype("float64"),
+    "LOGI": np.dtype(bool),
+}
+
 _ECL_NON3D_IGNORE = [
     "INTEHEAD",
     "LOGIHEAD",
@@ -41,7 +52,7 @@ def open_EclFile(filepath):
     efile = None
     # safety clause for loading eclipse data with ecl
     try:
-        efile = EclFile(str(filepath))
+        efile = session_cached("EclFile", filepath, lambda: EclFile(str(filepath)))
         yield efile
     except ValueError as e:
         print(e)
@@ -50,43 +61,114 @@ def open_EclFile(filepath):
         del efile
 
 
+@contextlib.contextmanager
+def _open_indexed_EclFile(filepath):
+    """Open an ecl file through its keyword index
+
+    Unformatted files are opened as an `EclBinaryFile` which uses the saved keyword
+    index, formatted files fall back to ecl's `EclFile`.
+    """
+    filepath = pathlib.Path(filepath)
+    if not filepath.exists():
+        raise FileNotFoundError(f"Cannot find input file {filepath}")
+
+    if not is_ecl_binary_file(filepath):
+        with open_EclFile(filepath) as efile:
+            yield efile
+        return
+
+    yield session_cached("EclBinaryFile", filepath, lambda: EclBinaryFile(filepath))
+
+
+def _iget_named_kw_values(efile, name, index):
+    """Get the values of a keyword as a native NumPy array"""
+    kw = efile.iget_named_kw(name, index)
+    if isinstance(efile, EclBinaryFile):
+        return native_array(kw)
+    return kw.numpy_copy()
+
+
+def _file_report_list(efile, filepath):
+    if not isinstance(efile, EclBinaryFile):
+        try:
+            return EclFile.file_report_list(str(filepath))
+        except TypeError:
+            return []
+
+    reports = efile.reports
+    if not reports:
+        # split restart files have no SEQNUM, the report is in the file extension
+        file_type, report_step, _ = EclFile.getFileType(str(filepath))
+        if file_type == EclFileEnum.ECL_RESTART_FILE:
+            reports = [report_step]
+    return reports
+
+
 def get_ecl_property_keys(filepath):
     """Get the Keywords in an ecl file"""
-    with open_EclFile(filepath) as efile:
+    with _open_indexed_EclFile(filepath) as efile:
         keys = efile.keys()
         return [key for key in keys if key not in _ECL_NON3D_IGNORE]
 
 
-def load_ecl_property(
-    filepath,
-    report_index=0,
-    grid_filepath=None,
-    keys=None,
-    ignore_keys=None,
-    silent=True,
-):
-    """Load a kw grid property from the simulation output files
-
-    keys are loaded into `pandas.DataFrame` `self.data`.
+def get_ecl_file_reports(filepath):
+    """Get the report numbers in an ecl file
 
     Args:
-        filepath (pathlike) -- Full file name and path
-        keys (list/str, optional): Key or list of keys to load.
-            Defaults to None - loads all keys.
-        ignore_keys
+        filepath (pathlike): A restart file
 
     Returns:
+        list: The report numbers in file order, empty if the file has no reports.
+    """
+    with _open_indexed_EclFile(filepath) as efile:
+        return _file_report_list(efile, filepath)
+
+
+def _scatter_active(values, active, fill=0):
+    """Scatter active cell values to the full grid"""
+    data = np.full(active.size, fill, dtype=values.dtype)
+    data[active] = values
+    return data
+
+
+def expand_ecl_property(data, grid_filepath, fill=0):
+    """Expand an `active_only` property dataframe to the full grid
+
+    Args:
+        data (pd.DataFrame): Property dataframe from `load_ecl_property` or
+            `load_ecl_rst` loaded with `active_only=True`
+        grid_filepath (pathlike): The grid file the properties were loaded with
+        fill (optional): Defaults to 0; The value of properties in inactive cells
 
+    Returns:
+        pd.DataFrame: The properties for every cell in the grid
     """
-    deck_files = get_ecl_deck(filepath)
+    grid = load_ecl_grid_index(grid_filepath)
+    rows = grid.index.get_indexer(data.index)
+    if (rows < 0).any():
+        raise ValueError("The property data does not match the grid index.")
+    for col in data.columns[5:]:
+        values = data[col].values
+        full = np.full(grid.shape[0], fill, dtype=values.dtype)
+        full[rows] = values
+        grid[col] = full
+    return grid
+
 
-    if grid_filepath is None and not deck_files["GRID"]:
+def _find_grid_filepath(filepath, grid_filepath=None):
+    """Get the grid file for a deck file if it is not specified"""
+    if grid_filepath is not None:
+        return grid_filepath
+
+    deck_files = get_ecl_deck(filepath)
+    if not deck_files["GRID"]:
         raise ValueError("Cannot find a grid file for this deck, please specify one.")
-    elif grid_filepath is None:
-        grid_filepath = deck_files["GRID"][
-            0
-        ]  # ecl looks for grid files referenced to the init name
+    # ecl looks for grid files referenced to the init name
+    return deck_files["GRID"][0]
 
+
+def _find_keys_to_load(filepath, keys=None, ignore_keys=None):
+    """Get the list of keys to load from a file"""
     if keys is None:  # get all keys
         keys_to_load = get_ecl_property_keys(filepath)
     elif isinstance(keys, list):
@@ -98,40 +180,83 @@ def load_ecl_property(
 
     if ignore_keys:
         keys_to_load = [key for key in keys_to_load if key not in ignore_keys]
+    return keys_to_load
 
-    data = load_ecl_grid_index(grid_filepath)
-    active_size = data["actnum"].sum()
 
-    try:
-        reports = EclFile.file_report_list(str(filepath))
-        reports = [f"_{r}" for r in reports]
-    except TypeError:
-        reports = [""]
-
-    with open_EclFile(filepath) as efile, open_EclGrid(grid_filepath) as egrid:
-        # filter to values that are active_size long
-        headers = efile.headers
-        headers = set(
-            map(lambda x: x[0], filter(lambda x: x[1] == active_size, headers))
+def _ecl_property_key_types(efile, keys_to_load, active_size):
+    """Get the ecl type of the keys to load that have `active_size` values"""
+    types = dict()
+    for name, length, ecl_type in efile.headers:
+        if length == active_size:
+            types.setdefault(name, ecl_type)
+    return {key: types[key] for key in dict.fromkeys(keys_to_load) if key in types}
+
+
+def _iter_ecl_property_arrays(efile, keys_to_load, report_index, active_size, silent):
+    """Yield the key and active cell values of each key to load for a report"""
+    # filter to values that are active_size long
+    ktl = list(_ecl_property_key_types(efile, keys_to_load, active_size))
+
+    if not ktl:
+        warn(
+            "None of the selected keys to load match the provided grid active cell count. No properties will be loaded."
         )
-        ktl = headers.intersection(keys_to_load)
 
-        if not ktl:
-            warn(
-                "None of the selected keys to load match the provided grid active cell count. No properties will be loaded."
-            )
+    for var in (pbar := tqdm(ktl, disable=silent, leave=True)):
+        pbar.set_description(f"Loading KW: {var}")
+        try:
+            values = _iget_named_kw_values(efile, var, report_index)
+        except KeyError:
+            raise ValueError(f"The keyword {var} is not in the ecl file.")
+        yield var, values
+
+
+def load_ecl_property(
+    filepath,
+    report_index=0,
+    grid_filepath=None,
+    keys=None,
+    ignore_keys=None,
+    silent=True,
+    active_only=False,
+):
+    """Load a kw grid property from the simulation output files
+
+    keys are loaded into `pandas.DataFrame` `self.data`.
+
+    Args:
+        filepath (pathlike) -- Full file name and path
+        keys (list/str, optional): Key or list of keys to load.
+            Defaults to None - loads all keys.
+        ignore_keys
+        active_only (bool, optional): Defaults to False; Only return rows for the
+            active cells, indexed by global cell index. The i, j, k and active
+            columns map between the active, global and ijk indices. Use
+            `expand_ecl_property` to expand the result to the full grid.
+
+    Returns:
+
+    """
+    grid_filepath = _find_grid_filepath(filepath, grid_filepath)
+    keys_to_load = _find_keys_to_load(filepath, keys, ignore_keys)
+
+    data = load_ecl_grid_index(grid_filepath)
+    active = data["actnum"].values > 0
+    active_size = active.sum()
+    if active_only:
+        data = data[active].copy()
+
+    with _open_indexed_EclFile(filepath) as efile:
+        reports = [f"_{r}" for r in _file_report_list(efile, filepath)] or [""]
+        report_n = reports[report_index]
 
-        for var in (pbar := tqdm(ktl, disable=silent, leave=True)):
-            pbar.set_description(f"Loading KW: {var}")
-            try:
+        for var, kw in _iter_ecl_property_arrays(
+            efile, keys_to_load, report_index, active_size, silent=silent
+        ):
+            if active_only:
+                data[f"{var}{report_n}"] = kw
+            else:
                 # non-active cells need to be filled for this work
-                kw = efile.iget_named_kw(var, report_index)
-                report_n = reports[report_index]
-                var_np = egrid.create3D(kw)
-                data[f"{var}{report_n}"] = np.moveaxis(
-                    var_np, (0, 1, 2), (2, 1, 0)
-                ).flatten()
-            except KeyError:
-                raise ValueError("The keyword {var} is not in the ecl file.")
+                data[f"{var}{report_n}"] = _scatter_active(kw, active)
 
     return data
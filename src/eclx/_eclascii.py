@@ -1,24 +1,574 @@
+import os
+import re
+import hashlib
+import itertools
 import pathlib
+import tempfile
+import contextlib
+from collections import defaultdict
+from concurrent.futures import Future, ProcessPoolExecutor
 
+import numpy as np
 from lark import Lark, Token
-from collections import defaultdict
+
+from ._eclmaps import EclipseAsciiTypeMap
+from ._eclbinary import ECLX_INDEX_CACHE
 
 with open(pathlib.Path(__file__).parent / "ecl_grammar.lark", "r") as grammar:
     LARK_GRAMMAR = grammar.read()
 
+ASCII_PARSERS = ("earley", "scanner")
+
+_KEYWORD = re.compile(r"[A-Z][A-Z0-9_+-]{0,7}")
+# quoted strings, comments, record ends and plain items
+_TOKENS = re.compile(r"'[^']*'|--.*|/|[^\s/']+")
+# keywords whose record is the next line, without a closing /
+_LINE_KEYWORDS = ("TITLE",)
+
+
+def _split_ecl_line(line):
+    """Split a line into its items, stopping at a comment or the end of a record
+
+    Returns:
+        tuple: The items and True if the line ends a record
+    """
+    if "'" not in line and "--" not in line:
+        head, slash, _ = line.partition("/")
+        return head.split(), bool(slash)
+
+    items = []
+    for token in _TOKENS.findall(line):
+        if token.startswith("--"):
+            break
+        if token == "/":
+            return items, True
+        items.append(token)
+    return items, False
+
+
+def _iter_ecl_keyword_records(lines):
+    """Scan the keywords and records of an ecl ASCII file line by line
+
+    A line holding only a keyword name outside of a record starts a keyword, the
+    other lines are split on whitespace into the items of records that end with /.
+    Empty records are dropped.
+
+    Args:
+        lines (iterable): The lines of the file
+
+    Yields:
+        tuple: Each keyword in file order and its records as lists of string items
+    """
+    keyword = None
+    records = []
+    record = []
+    line_record = False
+
+    for n, line in enumerate(lines, start=1):
+        if line_record:
+            items = line.split("--", 1)[0].split()
+            if items:
+                records.append(items)
+                line_record = False
+            continue
+
+        items, end = _split_ecl_line(line)
+        if not record and not end and len(items) == 1 and _KEYWORD.fullmatch(items[0]):
+            if keyword is not None:
+                yield keyword, records
+            keyword = items[0]
+            records = []
+            line_record = keyword in _LINE_KEYWORDS
+            continue
+
+        if (items or end) and keyword is None:
+            raise ValueError(f"Data before the first keyword on line {n}")
+        record.extend(items)
+        if end:
+            if record:  # don't add empties
+                records.append(record)
+            record = []
+
+    if keyword is not None:
+        yield keyword, records
+
+
+def _merge_keyword_records(keyword_records):
+    """Collect the records of repeated keywords, keywords without records are empty"""
+    data = defaultdict(list)
+    for keyword, records in keyword_records:
+        if records:
+            data[keyword].extend(records)
+        else:
+            data[keyword] = []
+    return dict(data)
+
+
+def _scan_ecl_ascii(lines):
+    """Scan an ecl ASCII file into the records of each keyword
+
+    Args:
+        lines (iterable): The lines of the file
+
+    Returns:
+        dict: The records of each keyword, as lists of string items
+    """
+    return _merge_keyword_records(_iter_ecl_keyword_records(lines))
+
+
+_REPEAT_DEFAULT = re.compile(r"(\d+)\*(?=\s|$)")
+_REPEAT = re.compile(r"(\d+)\*")
+_NOT_NUMERIC = re.compile(r"[^0-9eE.+\-*\s]")
+_FLOAT = re.compile(r"[.eE]")
+
+
+def _expand_ecl_values(text):
+    """Parse whitespace separated numbers expanding `N*value` repeats
+
+    `N*` defaults are returned as `inf` so they can be masked.
+
+    Args:
+        text (str): Numeric ecl data without comments or record ends
+
+    Returns:
+        numpy.ndarray: The float64 values
+    """
+    if "*" not in text:
+        return np.fromstring(text, sep=" ")
+
+    # N* -> nan N inf, N*v -> nan N v; the nan marks the repeat count that follows
+    text = _REPEAT_DEFAULT.sub(r" nan \1 inf ", text)
+    text = _REPEAT.sub(r" nan \1 ", text)
+    values = np.fromstring(text, sep=" ")
+    repeat = np.flatnonzero(np.isnan(values))
+    counts = np.ones(values.size, dtype=np.int64)
+    counts[repeat + 2] = values[repeat + 1]
+    keep = np.ones(values.size, dtype=bool)
+    keep[repeat] = False
+    keep[repeat + 1] = False
+    return np.repeat(values[keep], counts[keep])
+
+
+def _ecl_record_array(chunks, ecl_type=None, floats=True):
+    """Join parsed record chunks into a typed masked array, defaults are masked"""
+    values = np.concatenate(chunks) if len(chunks) > 1 else chunks[0]
+    mask = np.isinf(values)
+    if mask.any():
+        values[mask] = 0
+    else:
+        mask = np.ma.nomask
+    if ecl_type is None:
+        ecl_type = "REAL" if floats else "INTE"
+    dtype = np.dtype(EclipseAsciiTypeMap[ecl_type].value)
+    return np.ma.masked_array(values.astype(dtype, copy=False), mask=mask)
+
+
+def _iter_ecl_ascii_arrays(lines, types=None, batch=100000):
+    """Scan the keywords of an ecl ASCII file yielding numeric records as arrays
+
+    Keyword and record boundaries follow `_scan_ecl_ascii`. Numeric records are
+    parsed a batch of lines at a time so the values never exist as Python strings.
+
+    Args:
+        lines (iterable): The lines of the file
+        types (dict, optional): The ecl type name e.g. "INTE" for each keyword, by
+            default records with decimals or exponents are "REAL" and others "INTE".
+        batch (int, optional): The number of lines to parse at once.
+
+    Yields:
+        tuple: The keyword name and a masked array for keywords with a single numeric
+            record, otherwise a list of the records as masked arrays or lists of
+            string items for non-numeric records.
+    """
+    types = dict() if types is None else types
+    keyword = None
+    records = []
+    parts, chunks, items = [], [], None
+    floats = False
+    line_record = False
+
+    def parse_parts():
+        # non-numeric data turns the record into a list of string items
+        nonlocal parts, items, floats
+        text = "\n".join(parts)
+        parts = []
+        if _NOT_NUMERIC.search(text):
+            if chunks:
+                raise ValueError(f"Non-numeric data after numeric data in {keyword}")
+            items = text.split()
+        else:
+            floats = floats or bool(_FLOAT.search(text))
+            chunks.append(_expand_ecl_values(text))
+
+    def close_record():
+        nonlocal chunks, items, floats
+        if items is None:
+            parse_parts()
+        if items is None:
+            record = _ecl_record_array(chunks, types.get(keyword), floats)
+        else:
+            record = items
+        if len(record):  # don't add empties
+            records.append(record)
+        chunks, items = [], None
+        floats = False
+
+    for n, line in enumerate(lines, start=1):
+        # plain data lines inside a numeric record
+        if (
+            items is None
+            and (parts or chunks)
+            and "/" not in line
+            and "'" not in line
+            and "--" not in line
+        ):
+            parts.append(line)
+            if len(parts) >= batch:
+                parse_parts()
+            continue
+
+        if line_record:
+            head = line.split("--", 1)[0].split()
+            if head:
+                records.append(head)
+                line_record = False
+            continue
+
+        if not (parts or chunks or items):
+            name = line.split("--", 1)[0].strip()
+            if _KEYWORD.fullmatch(name):
+                if keyword is not None:
+                    yield keyword, _keyword_value(records)
+                keyword, records = name, []
+                line_record = keyword in _LINE_KEYWORDS
+                continue
+
+        if "'" in line:
+            line_items, end = _split_ecl_line(line)
+            if not end and not line_items:
+                continue
+        else:
+            head, slash, _ = line.split("--", 1)[0].partition("/")
+            line_items, end = None, bool(slash)
+            if not end and not head.strip():
+                continue
+        if keyword is None:
+            raise ValueError(f"Data before the first keyword on line {n}")
+
+        if line_items is None and items is None:
+            parts.append(head)
+        else:
+            if items is None:
+                if chunks:
+                    raise ValueError(f"Non-numeric data on line {n} for {keyword}")
+                items = "\n".join(parts).split()
+                parts = []
+            items.extend(head.split() if line_items is None else line_items)
+        if end:
+            close_record()
+
+    if keyword is not None:
+        yield keyword, _keyword_value(records)
+
+
+_DECK_CACHE_VERSION = 2
+
+
+def _ascii_cache_path(digest):
+    return ECLX_INDEX_CACHE / "ascii" / f"{digest}.eclxkw.npz"
+
+
+def _file_digest(filepath):
+    """Hash the contents of a file"""
+    digest = hashlib.sha256(f"eclx-ascii-{_DECK_CACHE_VERSION}".encode())
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _keyword_records(value):
+    """The records of a keyword value from `_iter_ecl_ascii_arrays`"""
+    return [value] if isinstance(value, np.ndarray) else value
+
+
+def _keyword_value(records):
+    """A keyword with a single numeric record is the array, else its records"""
+    if len(records) == 1 and isinstance(records[0], np.ndarray):
+        return records[0]
+    return records
+
+
+def _pack_keyword_arrays(keyword_arrays):
+    """Pack keyword arrays into flat arrays that save without pickling
+
+    The values of numeric records are joined by dtype and string items are joined
+    into one array, the layout of each keyword and record is kept in index arrays.
+    """
+    keywords, nrecords, kinds, lengths, masked = [], [], [], [], []
+    dtypes, values, masks, items = [], [], [], []
+    for keyword, value in keyword_arrays:
+        records = _keyword_records(value)
+        keywords.append(keyword)
+        nrecords.append(len(records))
+        for record in records:
+            lengths.append(len(record))
+            if not isinstance(record, np.ndarray):
+                kinds.append(0)
+                masked.append(False)
+                items.extend(record)
+                continue
+            data = np.ma.getdata(record)
+            if data.dtype.str not in dtypes:
+                dtypes.append(data.dtype.str)
+                values.append([])
+            kind = dtypes.index(data.dtype.str)
+            kinds.append(kind + 1)
+            values[kind].append(data)
+            masked.append(np.ma.is_masked(record))
+            if masked[-1]:
+                masks.append(np.ma.getmaskarray(record))
+
+    packed = dict(
+        keywords=np.array(keywords, dtype=str),
+        nrecords=np.array(nrecords, dtype=np.int64),
+        kinds=np.array(kinds, dtype=np.int16),
+        lengths=np.array(lengths, dtype=np.int64),
+        masked=np.array(masked, dtype=bool),
+        dtypes=np.array(dtypes, dtype=str),
+        masks=np.concatenate(masks) if masks else np.empty(0, dtype=bool),
+        items=np.array(items, dtype=str),
+    )
+    for kind, (dtype, arrays) in enumerate(zip(dtypes, values)):
+        packed[f"values{kind}"] = np.concatenate(arrays).astype(dtype, copy=False)
+    return packed
+
+
+def _unpack_keyword_arrays(packed):
+    """Rebuild the keyword arrays of `_pack_keyword_arrays`"""
+    offsets = [0] * (len(packed["dtypes"]) + 1)
+    mask_offset = item_offset = 0
+    keyword_arrays = []
+    records = iter(zip(packed["kinds"], packed["lengths"], packed["masked"]))
+    for keyword, nrecords in zip(packed["keywords"], packed["nrecords"]):
+        keyword_records = []
+        for kind, length, masked in itertools.islice(records, int(nrecords)):
+            if kind == 0:
+                items = packed["items"][item_offset : item_offset + length]
+                keyword_records.append(items.tolist())
+                item_offset += length
+                continue
+            start = offsets[kind]
+            data = packed[f"values{kind - 1}"][start : start + length]
+            offsets[kind] += length
+            mask = np.ma.nomask
+            if masked:
+                mask = packed["masks"][mask_offset : mask_offset + length]
+                mask_offset += length
+            keyword_records.append(np.ma.masked_array(data, mask=mask))
+        keyword_arrays.append((str(keyword), _keyword_value(keyword_records)))
+    return keyword_arrays
+
+
+def _read_keyword_arrays_cache(digest):
+    """Read cached keyword arrays, None if they are missing or unreadable"""
+    try:
+        with np.load(_ascii_cache_path(digest), allow_pickle=False) as cache:
+            return _unpack_keyword_arrays({name: cache[name] for name in cache.files})
+    except Exception:  # a corrupt or stale cache file is a cache miss
+        return None
+
+
+def _write_keyword_arrays_cache(digest, keyword_arrays):
+    """Save parsed keyword arrays, silently skipped if the cache is not writeable"""
+    cache_path = _ascii_cache_path(digest)
+    tmp_path = None
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".npz")
+        with os.fdopen(fd, "wb") as tmp:
+            np.savez(tmp, **_pack_keyword_arrays(keyword_arrays))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if tmp_path is not None:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+
+
+def _parse_keyword_arrays(filepath):
+    with open(filepath, "r") as f:
+        return list(_iter_ecl_ascii_arrays(f))
+
+
+def _merge_keyword_arrays(keyword_arrays):
+    """Collect the records of repeated keywords, keywords without records are empty"""
+    data = defaultdict(list)
+    for keyword, value in keyword_arrays:
+        records = _keyword_records(value)
+        if records:
+            data[keyword].extend(records)
+        else:
+            data[keyword] = []
+    return {keyword: _keyword_value(records) for keyword, records in data.items()}
+
+
+def _include_path(records, aliases, root):
+    """Resolve the file of an INCLUDE keyword, `$ALIAS` prefixes are set by PATHS"""
+    if not records or not isinstance(records[0], list):
+        raise ValueError("INCLUDE without a file name")
+    include = records[0][0].strip("'")
+    if include.startswith("$"):
+        alias, _, rest = include[1:].partition("/")
+        try:
+            include = pathlib.Path(aliases[alias]) / rest
+        except KeyError:
+            raise ValueError(f"Unknown PATHS alias ${alias}") from None
+    return root / include
+
+
+def _paths_aliases(records):
+    return {alias.strip("'"): path.strip("'") for alias, path, *_ in records}
+
+
+class _KeywordArraysLoader:
+    """Parse ASCII files once per unique content, in a process pool if given"""
+
+    def __init__(self, pool=None, use_cache=True):
+        self.pool = pool
+        self.use_cache = use_cache
+        self._files = dict()
+        self._digests = dict()
+
+    def submit(self, filepath):
+        """Start loading a file, cached keyword arrays are read straight away"""
+        filepath = pathlib.Path(filepath).resolve()
+        if filepath in self._files:
+            return
+        if not filepath.exists():
+            raise FileNotFoundError(f"Cannot find include file {filepath}")
+        digest = _file_digest(filepath)
+        if digest not in self._digests:
+            cached = _read_keyword_arrays_cache(digest) if self.use_cache else None
+            if cached is not None:
+                future = Future()
+                future.set_result(cached)
+            elif self.pool is not None:
+                future = self.pool.submit(_parse_keyword_arrays, filepath)
+            else:
+                future = Future()
+                future.set_result(_parse_keyword_arrays(filepath))
+            self._digests[digest] = [future, cached is None]
+        self._files[filepath] = digest
+
+    def result(self, filepath):
+        """The keyword arrays of a file, newly parsed files are saved to the cache"""
+        filepath = pathlib.Path(filepath).resolve()
+        self.submit(filepath)
+        digest = self._files[filepath]
+        future, unsaved = self._digests[digest]
+        keyword_arrays = future.result()
+        if unsaved and self.use_cache:
+            _write_keyword_arrays_cache(digest, keyword_arrays)
+            self._digests[digest][1] = False
+        return keyword_arrays
+
+
+def _iter_deck_keyword_arrays(filepath, loader, aliases, root, parents=()):
+    """Walk a file and its includes in deck order, INCLUDE keywords are replaced"""
+    filepath = pathlib.Path(filepath).resolve()
+    if filepath in parents:
+        raise ValueError(f"Recursive INCLUDE of {filepath}")
+    keyword_arrays = loader.result(filepath)
+
+    # start parsing the includes of this file before walking it
+    prefetch_aliases = dict(aliases)
+    for keyword, records in keyword_arrays:
+        if keyword == "PATHS":
+            prefetch_aliases.update(_paths_aliases(records))
+        elif keyword == "INCLUDE":
+            with contextlib.suppress(ValueError, FileNotFoundError):
+                loader.submit(_include_path(records, prefetch_aliases, root))
+
+    for keyword, records in keyword_arrays:
+        if keyword == "INCLUDE":
+            include = _include_path(records, aliases, root)
+            yield from _iter_deck_keyword_arrays(
+                include, loader, aliases, root, parents + (filepath,)
+            )
+            continue
+        if keyword == "PATHS":
+            aliases.update(_paths_aliases(records))
+        yield keyword, records
+
+
+def parse_ecl_deck(filepath, workers=None, use_cache=True):
+    """Parse an ecl DATA deck and all of the files it includes
+
+    INCLUDE keywords are followed recursively and replaced by the keywords of the
+    included file, relative paths are from the folder of the DATA file and `$ALIAS`
+    paths are set by the PATHS keyword. Files are parsed as by
+    `EclAsciiParser.iter_keywords`, numeric records are typed arrays.
+
+    The parsed arrays of each file are cached in `ECLX_INDEX_CACHE` as `.npz` files
+    keyed by a hash of their contents, so includes shared by many decks e.g.
+    ensemble realisations are only parsed once.
+
+    Args:
+        filepath (pathlike): The DATA file
+        workers (int, optional): Defaults to None; Parse uncached includes in a pool of
+            this many processes.
+        use_cache (bool, optional): Defaults to True; Read and save parsed files in the
+            cache.
+
+    Returns:
+        dict: Each keyword in the deck and a masked array for keywords with a single
+            numeric record, otherwise a list of the records as masked arrays or lists
+            of strings for non-numeric records.
+    """
+    filepath = pathlib.Path(filepath)
+    if not filepath.exists():
+        raise FileNotFoundError(f"Cannot find input file {filepath}")
+
+    with contextlib.ExitStack() as stack:
+        pool = None
+        if workers is not None and workers > 1:
+            pool = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+        loader = _KeywordArraysLoader(pool, use_cache=use_cache)
+        return _merge_keyword_arrays(
+            _iter_deck_keyword_arrays(
+                filepath, loader, dict(), filepath.parent.resolve()
+            )
+        )
+
+
 class EclAsciiParser:
     """A class for passing ASCII files -> generally the input files for Eclipse
 
     From these files it is possible to key keywords and keyword tables.
+
+    Args:
+        parser (str, optional): Defaults to "earley"; The grammar parser builds a full
+            parse tree, "scanner" reads the file line by line into keyword records
+            without a tree and is much faster for large keyword/data files. The
+            scanner keeps whitespace separated items whole e.g. `A1`.
     """
 
     _parser = Lark(LARK_GRAMMAR)
 
-    def __init__(self):
+    def __init__(self, parser="earley"):
+        if parser not in ASCII_PARSERS:
+            raise ValueError(f"parser must be one of {ASCII_PARSERS}, got {parser}")
+        self.parser = parser
         self.tree = None
+        self.data = dict()
 
     def parse(self, filepath):
         """Read a file and parse it with the parser."""
+        if self.parser == "scanner":
+            with open(filepath, "r") as f:
+                self.data = _scan_ecl_ascii(f)
+            return
+
         with open(filepath, "r") as f:
             txt = f.read()
 
@@ -54,10 +604,32 @@ class EclAsciiParser:
 
         self.data = dict(data)
 
+    def iter_keywords(self, filepath, types=None):
+        """Stream the keywords of a file one at a time as typed arrays
+
+        Numeric records are parsed straight to NumPy, `N*value` repeats are expanded
+        and `N*` defaults are masked. Keyword boundaries follow the "scanner" parser.
+
+        Args:
+            filepath (pathlike): The file to read
+            types (dict, optional): The ecl type e.g. `{"ACTNUM": "INTE"}` of keywords,
+                see `EclipseAsciiTypeMap`. By default records with decimal points or
+                exponents are "REAL" and others are "INTE".
+
+        Yields:
+            tuple: The keyword and a masked array for keywords with a single numeric
+                record, otherwise a list of the records as masked arrays or lists
+                of strings for non-numeric records.
+        """
+        with open(filepath, "r") as f:
+            yield from _iter_ecl_ascii_arrays(f, types=types)
+
     def __str__(self):
-        return str(self.tree)
+        return str(self.tree if self.tree is not None else self.data)
 
     def __repr__(self):
+        if self.tree is None:
+            return f"EclAsciiParser(keywords={list(self.data)})"
         return self.tree.pretty()
 
     def get_keywords(self):
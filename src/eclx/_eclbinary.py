@@ -0,0 +1,519 @@
+"""Pure NumPy reader for unformatted (binary) Eclipse files
+
+Eclipse binary files are sequences of big-endian Fortran records. Each keyword is a
+16 byte header record (name, length, type) followed by the data split into blocks of
+at most 1000 numeric or 105 string items, each block being its own Fortran record.
+
+The file is memory-mapped and only the keyword headers are read when it is opened,
+keyword data is read on request as NumPy arrays backed by the memory-map.
+
+The keyword headers of a file are scanned once and saved to a sidecar index file,
+which is reused while the size and modification time of the file are unchanged.
+"""
+import os
+import mmap
+import hashlib
+import pathlib
+import tempfile
+import contextlib
+from typing import NamedTuple
+
+import numpy as np
+
+_MARKER = np.dtype(">i4")
+_HEADER = np.dtype([("name", "S8"), ("length", ">i4"), ("type", "S4")])
+
+ECL_BINARY_DTYPES = {
+    "INTE": np.dtype(">i4"),
+    "REAL": np.dtype(">f4"),
+    "DOUB": np.dtype(">f8"),
+    "LOGI": np.dtype(">i4"),
+    "CHAR": np.dtype("S8"),
+    "MESS": np.dtype("S0"),
+}
+
+_NUMERIC_BLOCK_SIZE = 1000
+_STRING_BLOCK_SIZE = 105
+
+_INDEX_VERSION = 1
+_INDEX_DTYPE = np.dtype(
+    [
+        ("name", "S8"),
+        ("length", "i8"),
+        ("type", "S4"),
+        ("offset", "i8"),
+        ("occurrence", "i8"),
+        ("report", "i8"),
+    ]
+)
+ECLX_INDEX_CACHE = pathlib.Path(
+    os.environ.get("ECLX_INDEX_CACHE", pathlib.Path.home() / ".cache" / "eclx")
+)
+
+
+def _ecl_binary_dtype(ecl_type):
+    """Get the NumPy dtype of an ecl binary type string e.g. INTE, C042"""
+    try:
+        return ECL_BINARY_DTYPES[ecl_type]
+    except KeyError:
+        if ecl_type.startswith("C0"):
+            return np.dtype(f"S{int(ecl_type[1:])}")
+        raise ValueError(f"Unknown ecl binary type {ecl_type}")
+
+
+def _ecl_block_size(dtype):
+    return _STRING_BLOCK_SIZE if dtype.kind == "S" else _NUMERIC_BLOCK_SIZE
+
+
+def _ecl_data_nbytes(length, dtype):
+    """The number of bytes taken by the data records of a keyword"""
+    if length == 0:
+        return 0
+    nblocks = -(-length // _ecl_block_size(dtype))
+    return length * dtype.itemsize + nblocks * 2 * _MARKER.itemsize
+
+
+class EclBinaryKeyword(NamedTuple):
+    """The location of a keyword in a binary ecl file
+
+    `report` is the SEQNUM report the keyword belongs to, -1 if the file has none.
+    """
+
+    name: str
+    length: int
+    type: str
+    offset: int
+    occurrence: int
+    report: int = -1
+
+    @property
+    def dtype(self):
+        return _ecl_binary_dtype(self.type)
+
+    @property
+    def nbytes(self):
+        """The size of the keyword data records in bytes"""
+        return _ecl_data_nbytes(self.length, self.dtype)
+
+
+class EclBinaryFile:
+    """A memory-mapped unformatted ecl file e.g. EGRID, INIT, UNRST
+
+    Args:
+        filepath: The file to open
+        use_index: Defaults to True; Load the keyword headers from the sidecar index
+            and save it if it is missing or out of date, see `load_keyword_index`.
+    """
+
+    def __init__(self, filepath, use_index=True):
+        self.filepath = pathlib.Path(filepath)
+        with open(self.filepath, "rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise ValueError(f"{self.filepath} is not a binary ecl file")
+
+        self.keywords = None
+        if use_index:
+            self.keywords = _read_keyword_index(self.filepath)
+        if self.keywords is None:
+            self.keywords = self._scan()
+            if use_index:
+                _write_keyword_index(self.filepath, self.keywords)
+        self._lookup = {(kw.name, kw.occurrence): kw for kw in self.keywords}
+
+    def _scan(self):
+        keywords = []
+        occurrences = dict()
+        size = len(self._mmap)
+        report = -1
+        pos = 0
+        while pos < size:
+            header = self._read_header(pos)
+            name = header["name"].decode().strip()
+            ecl_type = header["type"].decode()
+            length = int(header["length"])
+            occurrence = occurrences.get(name, 0)
+            occurrences[name] = occurrence + 1
+
+            if name == "SEQNUM":
+                report = int(
+                    np.frombuffer(self._mmap, _MARKER, count=1, offset=pos + 28)[0]
+                )
+
+            keyword = EclBinaryKeyword(
+                name, length, ecl_type, pos + 24, occurrence, report
+            )
+            keywords.append(keyword)
+            pos = keyword.offset + keyword.nbytes
+
+        if pos != size:
+            raise ValueError(f"{self.filepath} is truncated or not a binary ecl file")
+        return keywords
+
+    def _read_header(self, pos):
+        if pos + 24 > len(self._mmap):
+            raise ValueError(f"{self.filepath} is truncated or not a binary ecl file")
+        head = np.frombuffer(self._mmap, _MARKER, count=1, offset=pos)[0]
+        tail = np.frombuffer(self._mmap, _MARKER, count=1, offset=pos + 20)[0]
+        if head != 16 or tail != 16:
+            raise ValueError(f"{self.filepath} is not a binary ecl file")
+        return np.frombuffer(self._mmap, _HEADER, count=1, offset=pos + 4)[0]
+
+    def close(self):
+        """Release the file, arrays already read keep the memory-map alive"""
+        self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __contains__(self, name):
+        return (name, 0) in self._lookup
+
+    def __getitem__(self, name):
+        return self.iget_named_kw(name, 0)
+
+    def keys(self):
+        """The unique keyword names in file order"""
+        return list(dict.fromkeys(kw.name for kw in self.keywords))
+
+    @property
+    def headers(self):
+        """The (name, length, type) of every keyword in the file"""
+        return [(kw.name, kw.length, kw.type) for kw in self.keywords]
+
+    @property
+    def reports(self):
+        """The SEQNUM report numbers in the file, empty if it has none"""
+        return list(dict.fromkeys(kw.report for kw in self.keywords if kw.report >= 0))
+
+    def num_named_kw(self, name):
+        """The number of occurrences of keyword `name`"""
+        return sum(kw.name == name for kw in self.keywords)
+
+    def get_keyword(self, name, index=0):
+        """Get the location of occurrence `index` of keyword `name`"""
+        try:
+            return self._lookup[(name, index)]
+        except KeyError:
+            raise KeyError(
+                f"Keyword {name} occurrence {index} is not in {self.filepath}"
+            )
+
+    def iget_named_kw(self, name, index=0):
+        """Read occurrence `index` of keyword `name`
+
+        Returns:
+            array: The keyword values with a big-endian dtype, LOGI keywords are
+                converted to bool. Keywords held in a single data record are
+                returned as a read-only view of the file.
+        """
+        return self.read_keyword(self.get_keyword(name, index))
+
+    def read_keyword(self, keyword):
+        """Read the data of a keyword from its location"""
+        return _read_ecl_binary_data(self._mmap, keyword)
+
+    def read_keyword_items(self, keywords, items):
+        """Read the same items from several keywords of one type
+
+        Only the requested items are read from the file, e.g. a few summary vectors
+        from the PARAMS keyword of every ministep.
+
+        Args:
+            keywords (list): `EclBinaryKeyword` locations
+            items (array): The item positions to read from each keyword
+
+        Returns:
+            array: (keywords, items) values with a big-endian dtype, LOGI keywords
+                are converted to bool.
+        """
+        return _read_ecl_binary_items(self._mmap, keywords, items)
+
+
+def _read_ecl_binary_data(buffer, keyword):
+    dtype = keyword.dtype
+    if keyword.length == 0 or dtype.itemsize == 0:
+        return np.empty(0, dtype=bool if keyword.type == "LOGI" else dtype)
+    if keyword.type == "LOGI":
+        return _read_ecl_binary_data(buffer, keyword._replace(type="INTE")) != 0
+
+    block_size = _ecl_block_size(dtype)
+    block_nbytes = block_size * dtype.itemsize + 2 * _MARKER.itemsize
+    start = keyword.offset + _MARKER.itemsize
+    nfull, remainder = divmod(keyword.length, block_size)
+
+    if nfull == 0 or (nfull == 1 and remainder == 0):
+        return np.frombuffer(buffer, dtype, count=keyword.length, offset=start)
+
+    # strided view over the full blocks skips the record markers between them
+    data = np.empty(keyword.length, dtype=dtype)
+    full = np.ndarray(
+        (nfull, block_size),
+        dtype=dtype,
+        buffer=buffer,
+        offset=start,
+        strides=(block_nbytes, dtype.itemsize),
+    )
+    data[: nfull * block_size].reshape(nfull, block_size)[:] = full
+    if remainder:
+        data[nfull * block_size :] = np.frombuffer(
+            buffer, dtype, count=remainder, offset=start + nfull * block_nbytes
+        )
+    return data
+
+
+def _read_ecl_binary_items(buffer, keywords, items):
+    types = set(kw.type for kw in keywords)
+    if len(types) > 1:
+        raise ValueError(f"Keywords have different types {types}")
+    ecl_type = types.pop() if types else "INTE"
+    if ecl_type == "LOGI":
+        keywords = [kw._replace(type="INTE") for kw in keywords]
+        return _read_ecl_binary_items(buffer, keywords, items) != 0
+
+    dtype = _ecl_binary_dtype(ecl_type)
+    items = np.asarray(items, dtype=np.int64)
+    if (
+        keywords
+        and items.size
+        and (items.min() < 0 or items.max() >= min(kw.length for kw in keywords))
+    ):
+        raise IndexError("Keyword items out of range")
+
+    # byte offset of each item from the start of the keyword data records
+    block_size = _ecl_block_size(dtype)
+    block, item = np.divmod(items, block_size)
+    block_nbytes = block_size * dtype.itemsize + 2 * _MARKER.itemsize
+    item_offsets = _MARKER.itemsize + block * block_nbytes + item * dtype.itemsize
+    offsets = np.array([kw.offset for kw in keywords], dtype=np.int64)
+    offsets = offsets[:, np.newaxis] + item_offsets[np.newaxis, :]
+
+    if dtype.itemsize and not (offsets % dtype.itemsize).any():
+        values = np.frombuffer(buffer, dtype, count=len(buffer) // dtype.itemsize)
+        return values[offsets // dtype.itemsize]
+
+    raw = np.frombuffer(buffer, np.uint8)
+    data = raw[offsets[..., np.newaxis] + np.arange(dtype.itemsize)]
+    return data.view(dtype).reshape(offsets.shape)
+
+
+def _ecl_binary_type(values):
+    """The ecl binary type of an array e.g. float32 -> REAL"""
+    kind, itemsize = values.dtype.kind, values.dtype.itemsize
+    if kind == "b":
+        return "LOGI"
+    if kind in "iu":
+        return "INTE"
+    if kind == "f":
+        return "REAL" if itemsize <= 4 else "DOUB"
+    if kind in "SU":
+        width = values.dtype.itemsize // (4 if kind == "U" else 1)
+        return "CHAR" if width <= 8 else f"C0{width:02d}"
+    raise ValueError(f"Cannot write arrays of {values.dtype} to ecl binary files")
+
+
+def _ecl_binary_values(values, ecl_type):
+    """Convert an array to the big-endian file dtype of an ecl type"""
+    dtype = _ecl_binary_dtype(ecl_type)
+    if ecl_type == "LOGI":
+        # ecl stores true as -1
+        return np.where(np.asarray(values, dtype=bool), -1, 0).astype(dtype)
+    if dtype.kind == "S":
+        values = np.char.ljust(np.asarray(values).astype(str), dtype.itemsize)
+        return np.char.encode(values, "ascii").astype(dtype)
+    return np.asarray(values).astype(dtype, copy=False)
+
+
+def _write_ecl_binary_keyword(f, name, values, ecl_type=None):
+    """Write a keyword header and its data records to an open binary file
+
+    The data is split into blocks by reshaping, each block is written with its record
+    markers as one structured array.
+    """
+    values = np.asarray(values).reshape(-1)
+    if ecl_type is None:
+        ecl_type = _ecl_binary_type(values)
+    if len(name) > 8:
+        raise ValueError(f"Keyword name {name} is longer than 8 characters")
+    data = _ecl_binary_values(values, ecl_type)
+
+    header = np.zeros(1, dtype=[("m0", _MARKER), ("header", _HEADER), ("m1", _MARKER)])
+    header["m0"] = header["m1"] = _HEADER.itemsize
+    header["header"] = (name.ljust(8).encode(), data.size, ecl_type.encode())
+    header.tofile(f)
+    if data.size == 0 or data.dtype.itemsize == 0:
+        return
+
+    block_size = _ecl_block_size(data.dtype)
+    nfull, remainder = divmod(data.size, block_size)
+    for start, nblocks, size in (
+        (0, nfull, block_size),
+        (nfull * block_size, 1 if remainder else 0, remainder),
+    ):
+        if not nblocks:
+            continue
+        records = np.empty(
+            nblocks,
+            dtype=[("m0", _MARKER), ("data", data.dtype, (size,)), ("m1", _MARKER)],
+        )
+        records["m0"] = records["m1"] = size * data.dtype.itemsize
+        records["data"] = data[start : start + nblocks * size].reshape(nblocks, size)
+        records.tofile(f)
+
+
+def write_ecl_binary(filepath, keywords):
+    """Write keywords to an unformatted (binary) ecl file
+
+    Arrays are written in bulk as big-endian Fortran records, the format read by
+    `EclBinaryFile` and ecl. The file is written next to `filepath` and moved into
+    place when complete.
+
+    Args:
+        filepath: The file to write
+        keywords (iterable): `(name, values)` or `(name, values, ecl_type)` tuples in
+            file order. The type e.g. "INTE", "REAL" defaults to the type of the
+            array dtype, int -> INTE, float32 -> REAL, float64 -> DOUB, bool -> LOGI
+            and strings -> CHAR.
+
+    Returns:
+        pathlib.Path: The written file
+    """
+    filepath = pathlib.Path(filepath)
+    # write to a temporary file and replace, arrays memory-mapped from the file being
+    # replaced stay valid
+    tmp_path = filepath.with_name(f".{filepath.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            for keyword in keywords:
+                _write_ecl_binary_keyword(f, *keyword)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+    return filepath
+
+
+def _is_mmap_array(values):
+    """Check if an array is a view of a memory-mapped file"""
+    base = values
+    while base is not None:
+        if isinstance(base, mmap.mmap):
+            return True
+        base = base.obj if isinstance(base, memoryview) else getattr(base, "base", None)
+    return False
+
+
+def _keyword_index_paths(filepath):
+    """Candidate index locations, next to the file then in the user cache"""
+    filepath = pathlib.Path(filepath).absolute()
+    digest = hashlib.sha1(str(filepath).encode()).hexdigest()[:16]
+    return (
+        filepath.with_name(f".{filepath.name}.eclxidx.npz"),
+        ECLX_INDEX_CACHE / f"{filepath.name}.{digest}.eclxidx.npz",
+    )
+
+
+def _file_signature(filepath):
+    stat = pathlib.Path(filepath).stat()
+    return np.array([_INDEX_VERSION, stat.st_size, stat.st_mtime_ns], dtype="i8")
+
+
+def _read_keyword_index(filepath):
+    """Read the sidecar keyword index, None if missing or out of date"""
+    signature = _file_signature(filepath)
+    for index_path in _keyword_index_paths(filepath):
+        try:
+            with np.load(index_path, allow_pickle=False) as index:
+                if not np.array_equal(index["signature"], signature):
+                    continue
+                keywords = index["keywords"]
+        except (OSError, KeyError, ValueError):
+            continue
+        return [
+            EclBinaryKeyword(
+                kw["name"].decode().strip(),
+                int(kw["length"]),
+                kw["type"].decode(),
+                int(kw["offset"]),
+                int(kw["occurrence"]),
+                int(kw["report"]),
+            )
+            for kw in keywords
+        ]
+    return None
+
+
+def _write_keyword_index(filepath, keywords):
+    """Save the keyword index, silently skipped if no location is writeable"""
+    signature = _file_signature(filepath)
+    table = np.array([tuple(kw) for kw in keywords], dtype=_INDEX_DTYPE)
+    for index_path in _keyword_index_paths(filepath):
+        tmp_path = None
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=index_path.parent, suffix=".npz")
+            with os.fdopen(fd, "wb") as tmp:
+                np.savez(tmp, signature=signature, keywords=table)
+            os.replace(tmp_path, index_path)
+            return index_path
+        except OSError:
+            if tmp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+    return None
+
+
+def load_keyword_index(filepath):
+    """Get the keyword index of a binary ecl file
+
+    The index holds the name, length, type, byte offset, occurrence and report of
+    every keyword. It is built once and saved next to the file (or in
+    `ECLX_INDEX_CACHE` if that is not writeable) keyed on the file size and
+    modification time, later calls read the saved index instead of scanning the file.
+
+    Args:
+        filepath: The binary ecl file
+
+    Returns:
+        list: `EclBinaryKeyword` for each keyword in the file
+    """
+    with open_EclBinaryFile(filepath) as efile:
+        return efile.keywords
+
+
+def is_ecl_binary_file(filepath):
+    """Check if a file starts with an unformatted ecl keyword header"""
+    with open(filepath, "rb") as f:
+        head = f.read(24)
+    if len(head) < 24:
+        return False
+    return (
+        np.frombuffer(head, _MARKER, count=1, offset=0)[0] == 16
+        and np.frombuffer(head, _MARKER, count=1, offset=20)[0] == 16
+    )
+
+
+def native_array(values):
+    """Convert a big-endian keyword array to native byte order"""
+    if values.dtype.kind == "S":
+        return values
+    return values.astype(values.dtype.newbyteorder("="), copy=False)
+
+
+@contextlib.contextmanager
+def open_EclBinaryFile(filepath, use_index=True):
+    """Safely open an EclBinaryFile instance with a context manager"""
+    filepath = pathlib.Path(filepath)
+    if not filepath.exists():
+        raise FileNotFoundError(f"Cannot find input file {filepath}")
+
+    efile = EclBinaryFile(filepath, use_index=use_index)
+    try:
+        yield efile
+    finally:
+        efile.close()
@@ -10,6 +10,7 @@ Eclipse simulation files.
 # pylint: disable=invalid-name
 
 import pathlib
+import functools
 
 import numpy as np
 import pandas as pd
@@ -23,35 +24,53 @@ import pandas as pd
 
 from ._ecl_file import load_ecl_property
 from ._grid import (
-    load_ecl_grid_index,
-    load_ecl_grid,
-    get_ecl_grid_dims,
+    GRID_UNITS,
+    load_ecl_geometry,
     _xcorn_names,
     _ycorn_names,
     _zcorn_names,
 )
-from ._init import load_init_intehead
+from ._init import load_init_intehead, load_init_headers, write_ecl_init
 from ._rst import is_restart_file, get_restart_reports, load_ecl_rst
+from ._session import session_scope
 from ._utils import import_tqdm
 
 tqdm = import_tqdm()
 
 
+def _in_session(method):
+    """Run an EclDeck method with the deck's session, or a session for the call"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.session is None:
+            with session_scope():
+                return method(self, *args, **kwargs)
+        with self.session.activate():
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
 class EclDeck:
     """A class to encapsulate Eclipse Simulator Output Methods and Properties"""
 
-    def __init__(self, silent=False):
+    def __init__(self, silent=False, session=None):
         """Constructor
 
         Args:
             silent (bool, optional): Defaults to False, disable progress bars,
                 log output
+            session (EclSession, optional): Defaults to None, the handles opened
+                by a method are released when it returns. A file handle pool kept
+                between the deck's method calls.
         """
         self.data = pd.DataFrame()
         self.egrid_file = None
         self.einit_file = None
         self.erst_file = None
         self.silent = silent
+        self.session = session
         self.loaded_reports = None
         self.nx = None
         self.ny = None
@@ -59,6 +78,8 @@ class EclDeck:
         self.mapaxes = None
         self.active = None
         self.coord = None
+        self.geometry = None
+        self.surfaces = None
         self.xyzcorn = None
         self.zcorn_names = None
         self._xcorn_names = None
@@ -70,6 +91,11 @@ class EclDeck:
         self.reports_dict = dict()
         self.dates = None
 
+    def _evict_deck_files(self, filepath):
+        """Drop the session's file list of the deck of `filepath`, files may be added"""
+        if self.session is not None:
+            self.session.evict("ecl_deck", pathlib.Path(filepath).with_suffix(""))
+
     def set_grid(self, filepath):
         """Set the simulation grid file and initialise ecl link
 
@@ -79,26 +105,60 @@ class EclDeck:
         filepath = pathlib.Path(filepath)
         if not filepath.exists():
             raise FileNotFoundError(f"Cannot find input file {filepath}")
+        self._evict_deck_files(filepath)
         self.egrid_file = filepath
 
-    def load_grid(self, filename=None):
+    @_in_session
+    def load_grid(self, filename=None, corners=True, backend="ecl"):
         """Load the simulation grid file
 
+        The grid file is read once, cell centres are calculated directly from the
+        grid geometry.
+
         Arguments:
             filename (string): Defaults to None; Full file name and path
+            corners (bool): Defaults to True; Also create the corner point
+                dataframe `self.xyzcorn`. If False only the cell index, actnum and
+                centres are loaded into `self.data`.
+            backend (str): Defaults to "ecl"; The grid reader, "numpy" memory-maps
+                EGRID files, see `load_ecl_geometry`.
         """
         if filename is not None:
             self.set_grid(filename)
         elif self.egrid_file is None:
             raise ValueError("grid file has not been specified")
 
-        self.nx, self.ny, self.nz = get_ecl_grid_dims(self.egrid_file)
-        self.data = load_ecl_grid_index(self.egrid_file, silent=self.silent)
-        self.xyzcorn = load_ecl_grid(self.egrid_file, silent=self.silent)
+        self.geometry = load_ecl_geometry(self.egrid_file, backend=backend)
+        self.surfaces = None
+        self.nx, self.ny, self.nz = self.geometry.shape
+        self.data = self.geometry.index_dataframe()
+
+        centers = self.geometry.centers()
+        self.data["centerx"] = centers[:, 0]
+        self.data["centery"] = centers[:, 1]
+        self.data["centerz"] = centers[:, 2]
+
+        self.xyzcorn = self.geometry.to_dataframe() if corners else None
+
+    def get_surface(self, n, face="top"):
+        """Get the top or base surface of a grid layer
 
-        self.data["centerx"] = self.xyzcorn[_xcorn_names()].mean(axis=1)
-        self.data["centery"] = self.xyzcorn[_ycorn_names()].mean(axis=1)
-        self.data["centerz"] = self.xyzcorn[_zcorn_names()].mean(axis=1)
+        The surfaces of all layers are built from the grid on the first call and
+        cached in `self.surfaces`.
+
+        Arguments:
+            n (int): The k layer
+            face (str): Defaults to "top"; The "top" or "base" face of the layer
+
+        Returns:
+            tuple: x, y, z masked arrays with shape (nx + 1, ny + 1), nodes with
+                no neighbouring active cell are masked.
+        """
+        if self.geometry is None:
+            raise ValueError("grid has not been loaded")
+        if self.surfaces is None:
+            self.surfaces = self.geometry.surfaces()
+        return self.surfaces.get(n, face=face)
 
     @property
     def corner_names(self):
@@ -114,8 +174,10 @@ class EclDeck:
         filepath = pathlib.Path(filepath)
         if not filepath.exists():
             raise FileNotFoundError(f"Cannot find input file {filepath}.")
+        self._evict_deck_files(filepath)
         self.einit_file = filepath
 
+    @_in_session
     def load_init(self, filepath=None, keys=None):
         """Load the init simulation file
 
@@ -155,6 +217,81 @@ class EclDeck:
         else:
             self.data = self.data.join(data.iloc[:, 5:])
 
+    def write_egrid(self, filepath, units=None):
+        """Write the grid geometry to an EGRID file
+
+        Args:
+            filepath (string): Full file name and path
+            units (str, optional): Defaults to None; The GRIDUNIT e.g. "FEET", by
+                default from the units of the loaded INIT file else "METRES".
+
+        Returns:
+            pathlib.Path: The written file
+        """
+        if self.geometry is None:
+            raise ValueError("grid has not been loaded")
+        if units is None:
+            units = GRID_UNITS.get(self.init_intehead.get("UNITS"), "METRES")
+        return self.geometry.to_egrid(filepath, units=units)
+
+    def write_grdecl(self, filepath, units=None, **kwargs):
+        """Write the grid geometry to an ASCII GRDECL file
+
+        Args:
+            filepath (string): Full file name and path
+            units (str, optional): Defaults to None; The GRIDUNIT e.g. "FEET", by
+                default from the units of the loaded INIT file if there is one.
+            kwargs: Formatting options passed to `EclGridGeometry.to_grdecl`
+
+        Returns:
+            pathlib.Path: The written file
+        """
+        if self.geometry is None:
+            raise ValueError("grid has not been loaded")
+        if units is None:
+            units = GRID_UNITS.get(self.init_intehead.get("UNITS"))
+        return self.geometry.to_grdecl(filepath, units=units, **kwargs)
+
+    def write_init(self, filepath, keys=None):
+        """Write cell properties in `self.data` to an INIT file
+
+        The INTEHEAD, LOGIHEAD and DOUBHEAD headers are copied from the loaded INIT
+        file, if there is one, else they are created see `write_ecl_init`.
+
+        Args:
+            filepath (string): Full file name and path
+            keys (list/str, optional): Key or list of keys to write. Defaults to
+                None - all numeric properties in `self.data`.
+
+        Returns:
+            pathlib.Path: The written file
+        """
+        if self.data.empty or self.nx is None:
+            raise ValueError("grid has not been loaded")
+        if keys is None:
+            index_columns = ["i", "j", "k", "active", "actnum"]
+            index_columns += ["centerx", "centery", "centerz"]
+            keys = [
+                key
+                for key in self.data.select_dtypes(include=["number", "bool"])
+                if key not in index_columns
+            ]
+        elif isinstance(keys, str):
+            keys = [keys]
+
+        headers = None
+        if self.einit_file is not None:
+            headers = load_init_headers(self.einit_file)
+        return write_ecl_init(
+            filepath,
+            self.data,
+            (self.nx, self.ny, self.nz),
+            keys,
+            intehead=self.init_intehead,
+            headers=headers,
+        )
+
+    @_in_session
     def set_rst(self, filepath):
         """Load the report list and create report list dictionary
 
@@ -165,6 +302,7 @@ class EclDeck:
         filepath = pathlib.Path(filepath)
         if not filepath.exists():
             raise FileNotFoundError(f"Cannot find input file {filepath}.")
+        self._evict_deck_files(filepath)
         self.erst_file = str(filepath)
 
         if not is_restart_file(filepath):
@@ -175,12 +313,14 @@ class EclDeck:
         self.dates = get_restart_reports(filepath)
         self.reports = self.dates["report"].to_list()
 
-    def load_rst(self, reports=None, keys=None):
+    @_in_session
+    def load_rst(self, reports=None, keys=None, workers=None):
         """Load the restart file
 
         Arguments:
             reports ('all'/list) -- A list of report numbers else
                                      loads 'all' reports
+            workers (int) -- Load the reports in a pool of this many processes
         """
         if reports is None:
             reports = self.dates["report"].to_list()
@@ -195,6 +335,7 @@ class EclDeck:
             reports=reports,
             keys=keys,
             silent=self.silent,
+            workers=workers,
         )
 
         if self.data.empty:
@@ -14,6 +14,9 @@ class InitIntheadMap(Enum):
     NACTIV = 11
     GRID_TYPE = 13
     PHASE = 14
+    IDAY = 64
+    IMON = 65
+    IYEAR = 66
     IPROG = 94
 
 
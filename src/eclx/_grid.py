@@ -12,11 +12,22 @@ from numpy import typing as npt
 
 from ecl.grid import EclGrid
 
-from ._utils import import_tqdm, get_filetype, EclFileEnum
+from ._eclbinary import EclBinaryFile, write_ecl_binary, _is_mmap_array
+from ._session import session_cached
+from ._utils import (
+    import_tqdm,
+    get_filetype,
+    EclFileEnum,
+    _format_lines,
+    _ecl_repeat_items,
+)
 
 tqdm = import_tqdm()
 
 GRID_FILE_TYPES = [EclFileEnum.ECL_GRID_FILE, EclFileEnum.ECL_EGRID_FILE]
+GRID_BACKENDS = ("ecl", "numpy")
+# GRIDUNIT names of the INTEHEAD unit systems
+GRID_UNITS = {1: "METRES", 2: "FEET", 3: "CM", 4: "METRES"}
 
 
 class EclGridCPrefix(Enum):
@@ -75,7 +86,11 @@ def open_EclGrid(filepath):
         file_type = get_filetype(filepath)
         if file_type not in GRID_FILE_TYPES:
             raise ValueError
-        egrid = EclGrid.load_from_file(str(filepath.absolute()))
+        egrid = session_cached(
+            "EclGrid",
+            filepath,
+            lambda: EclGrid.load_from_file(str(filepath.absolute())),
+        )
         yield egrid
     except (ValueError, OSError):  # OSError on windows
         raise ValueError(f"cannot interpret file type {filepath}")
@@ -83,6 +98,414 @@ def open_EclGrid(filepath):
         del egrid
 
 
+@contextlib.contextmanager
+def _open_egrid_binary(filepath):
+    """Open an EGRID file with the pure NumPy memory-mapped reader"""
+    filepath = pathlib.Path(filepath)
+    if not filepath.exists():
+        raise FileNotFoundError(f"Cannot find input grid file {filepath}")
+
+    if get_filetype(filepath) != EclFileEnum.ECL_EGRID_FILE:
+        raise ValueError(f"The numpy grid backend only supports EGRID files {filepath}")
+
+    efile = session_cached("EclBinaryFile", filepath, lambda: EclBinaryFile(filepath))
+    if "GRIDHEAD" not in efile:
+        raise ValueError(f"cannot interpret file type {filepath}")
+    yield efile
+
+
+def _egrid_binary_dims(efile):
+    gridhead = efile["GRIDHEAD"]
+    return tuple(int(n) for n in gridhead[1:4])
+
+
+def _egrid_binary_actnum(efile):
+    if "ACTNUM" in efile:
+        return efile["ACTNUM"]
+    nx, ny, nz = _egrid_binary_dims(efile)
+    return np.ones(nx * ny * nz, dtype=np.int32)
+
+
+def _check_backend(backend):
+    if backend not in GRID_BACKENDS:
+        raise ValueError(
+            f"Unknown grid backend {backend}, expected one of {GRID_BACKENDS}"
+        )
+
+
+def _active_index(actnum):
+    """The active index of each cell, -1 for inactive cells"""
+    active = np.asarray(actnum) > 0
+    return np.where(active, np.cumsum(active) - 1, -1).astype(np.int32)
+
+
+def _grid_index_frame(nx, ny, actnum, index):
+    """The grid index dataframe for the cells at global `index`"""
+    k, ij = np.divmod(index, nx * ny)
+    j, i = np.divmod(ij, nx)
+    return pd.DataFrame(
+        dict(
+            i=i.astype(np.int32),
+            j=j.astype(np.int32),
+            k=k.astype(np.int32),
+            active=_active_index(actnum)[index],
+            actnum=np.asarray(actnum)[index].astype(np.int32),
+        ),
+        index=index,
+    )
+
+
+class EclGridGeometry:
+    """Corner-point grid geometry held in the native Eclipse pillar layout.
+
+    COORD is stored as (ny+1, nx+1, 6) pillars and ZCORN as a (nz, 2, ny, 2, nx, 2)
+    array of corner depths, so the geometry costs 8 depth values per cell plus the
+    pillars. Corner coordinates are interpolated along the pillars only when they
+    are requested, for any subset of cells.
+
+    Args:
+        nx, ny, nz: The grid dimensions
+        coord: COORD keyword values, `6 * (nx + 1) * (ny + 1)` long
+        zcorn: ZCORN keyword values, `8 * nx * ny * nz` long
+        actnum: ACTNUM keyword values, defaults to all cells active
+        mapaxes: MAPAXES keyword values, if given corners are transformed to map
+            coordinates as ecl does when loading a grid
+    """
+
+    def __init__(self, nx, ny, nz, coord, zcorn, actnum=None, mapaxes=None):
+        self.nx = int(nx)
+        self.ny = int(ny)
+        self.nz = int(nz)
+        self.coord = np.asarray(coord).reshape(self.ny + 1, self.nx + 1, 6)
+        self.zcorn = np.asarray(zcorn).reshape(self.nz, 2, self.ny, 2, self.nx, 2)
+        if actnum is None:
+            actnum = np.ones(self.size, dtype=np.int32)
+        self.actnum = np.asarray(actnum).reshape(-1)
+        self.mapaxes = None if mapaxes is None else np.asarray(mapaxes, dtype=float)
+
+    @classmethod
+    def from_eclgrid(cls, egrid):
+        """Create the geometry from an open `ecl.grid.EclGrid`"""
+        mapaxes = egrid.export_mapaxes()
+        if mapaxes is not None:
+            mapaxes = mapaxes.numpy_copy()
+        return cls(
+            egrid.nx,
+            egrid.ny,
+            egrid.nz,
+            egrid.export_coord().numpy_copy(),
+            egrid.export_zcorn().numpy_copy(),
+            actnum=egrid.export_actnum().numpy_copy(),
+            mapaxes=mapaxes,
+        )
+
+    @classmethod
+    def from_egrid_binary(cls, efile):
+        """Create the geometry from an EGRID opened as an `EclBinaryFile`
+
+        Keywords are only read for the main grid, local grid refinements are ignored.
+        Arrays keep the file's big-endian dtypes.
+        """
+        nx, ny, nz = _egrid_binary_dims(efile)
+        return cls(
+            nx,
+            ny,
+            nz,
+            efile["COORD"],
+            efile["ZCORN"],
+            actnum=_egrid_binary_actnum(efile),
+            mapaxes=efile["MAPAXES"] if "MAPAXES" in efile else None,
+        )
+
+    @property
+    def shape(self):
+        """The grid dimensions (nx, ny, nz)"""
+        return (self.nx, self.ny, self.nz)
+
+    @property
+    def size(self):
+        """The number of cells in the grid"""
+        return self.nx * self.ny * self.nz
+
+    @property
+    def active_index(self):
+        """The active index of each cell, -1 for inactive cells"""
+        return _active_index(self.actnum)
+
+    def _cell_index(self, index=None):
+        if index is None:
+            return np.arange(self.size)
+        index = np.asarray(index, dtype=np.int64).reshape(-1)
+        if index.size and (index.min() < 0 or index.max() >= self.size):
+            raise IndexError(f"Cell index out of range for grid of size {self.size}")
+        return index
+
+    def cell_ijk(self, index=None):
+        """Get the i, j, k indices of cells from their global index
+
+        Args:
+            index: Global cell indices, defaults to None - all cells.
+
+        Returns:
+            tuple: i, j, k index arrays
+        """
+        index = self._cell_index(index)
+        k, ij = np.divmod(index, self.nx * self.ny)
+        j, i = np.divmod(ij, self.nx)
+        return i, j, k
+
+    def _pillar_xy(self, pillars, z):
+        """Interpolate x, y along pillars (..., 6) at broadcastable depths z (...)"""
+        pillars = pillars.astype(np.float64)
+        x1, y1, z1, x2, y2, z2 = (pillars[..., n] for n in range(6))
+        dz = z2 - z1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            a = np.where(dz != 0, (z - z1) / dz, 0.0)
+        x = x1 + a * (x2 - x1)
+        y = y1 + a * (y2 - y1)
+
+        if self.mapaxes is not None:
+            yax, origin, xax = self.mapaxes.reshape(3, 2)
+            unit_x = (xax - origin) / np.linalg.norm(xax - origin)
+            unit_y = (yax - origin) / np.linalg.norm(yax - origin)
+            x, y = (
+                origin[0] + x * unit_x[0] + y * unit_y[0],
+                origin[1] + x * unit_x[1] + y * unit_y[1],
+            )
+        return x, y
+
+    def _corner_xyz(self, c, i, j, k):
+        """Get the x, y, z coordinates of corner `c` for cells i, j, k"""
+        di, dj, dk = c & 1, (c >> 1) & 1, c >> 2
+        z = self.zcorn[k, dk, j, dj, i, di].astype(np.float64)
+        x, y = self._pillar_xy(self.coord[j + dj, i + di], z)
+        return x, y, z
+
+    def corners(self, index=None):
+        """Get the corner point coordinates of cells
+
+        Corners are in ecl order, 0-3 are the top face and 4-7 the base face of the
+        cell, see `EclSimFaces`.
+
+        Args:
+            index: Global cell indices, defaults to None - all cells.
+
+        Returns:
+            array: Corner coordinates with shape (n, 8, 3)
+        """
+        i, j, k = self.cell_ijk(index)
+        xyz = np.empty((i.size, 8, 3), dtype=np.float64)
+        for c in EclSimFaces.ecl_order.value:
+            for d, v in enumerate(self._corner_xyz(c, i, j, k)):
+                xyz[:, c, d] = v
+        return xyz
+
+    def centers(self, index=None):
+        """Get the cell centres as the mean of the cell corners
+
+        The centres are accumulated one corner at a time so the (n, 8, 3) corner
+        array is never created.
+
+        Args:
+            index: Global cell indices, defaults to None - all cells.
+
+        Returns:
+            array: Centre coordinates with shape (n, 3)
+        """
+        i, j, k = self.cell_ijk(index)
+        xyz = np.zeros((i.size, 3), dtype=np.float64)
+        for c in EclSimFaces.ecl_order.value:
+            for d, v in enumerate(self._corner_xyz(c, i, j, k)):
+                xyz[:, d] += v
+        return xyz / 8
+
+    def surfaces(self, active_only=True):
+        """Build the node lattice of the top and base face of every layer
+
+        Each node takes the mean depth of the cell corners that meet at it, so
+        faulted nodes are averaged across the fault. The lattice is built for all
+        layers at once from ZCORN.
+
+        Args:
+            active_only: Defaults to True; Only use active cells to define nodes,
+                nodes with no neighbouring active cell are masked.
+
+        Returns:
+            EclGridSurfaces: The surfaces for every layer face
+        """
+        nx, ny, nz = self.shape
+        weight = (
+            (self.actnum.reshape(nz, 1, ny, nx) > 0).astype(np.float64)
+            if active_only
+            else np.ones((nz, 1, ny, nx), dtype=np.float64)
+        )
+        zsum = np.zeros((nz, 2, ny + 1, nx + 1), dtype=np.float64)
+        count = np.zeros((nz, 1, ny + 1, nx + 1), dtype=np.float64)
+        for dj, di in itertools.product((0, 1), (0, 1)):
+            zsum[:, :, dj : dj + ny, di : di + nx] += (
+                self.zcorn[:, :, :, dj, :, di] * weight
+            )
+            count[:, :, dj : dj + ny, di : di + nx] += weight
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = zsum / count
+        x, y = self._pillar_xy(self.coord, z)
+        mask = np.broadcast_to(count == 0, z.shape)
+        # surfaces are returned i by j
+        return EclGridSurfaces(
+            *(np.swapaxes(v, 2, 3) for v in (x, y, z)), mask=np.swapaxes(mask, 2, 3)
+        )
+
+    def index_dataframe(self, index=None):
+        """Get the cell index dataframe of `load_ecl_grid_index`
+
+        Args:
+            index: Global cell indices, defaults to None - all cells.
+
+        Returns:
+            pd.DataFrame: The cell i, j, k and active indices and actnum
+        """
+        return _grid_index_frame(self.nx, self.ny, self.actnum, self._cell_index(index))
+
+    def to_dataframe(self, index=None):
+        """Convert the geometry to the corner point dataframe of `load_ecl_grid`
+
+        Args:
+            index: Global cell indices, defaults to None - all cells.
+
+        Returns:
+            pd.DataFrame: The cell i, j, k and active indices and the x, y, z
+                coordinates of each corner.
+        """
+        index = self._cell_index(index)
+        xyzcorn = self.index_dataframe(index).drop(columns="actnum")
+        corners = pd.DataFrame(
+            self.corners(index).reshape(-1, 24), index=index, columns=_corner_names()
+        )
+        return pd.concat([xyzcorn, corners], axis=1)
+
+    def to_egrid(self, filepath, units="METRES"):
+        """Write the geometry to an EGRID file
+
+        COORD and ZCORN are written as REAL, the pillars are written as held so a
+        grid with MAPAXES keeps its MAPAXES. Arrays memory-mapped from an EGRID are
+        copied into memory first, so a geometry can be written back over the file it
+        was loaded from.
+
+        Args:
+            filepath: The EGRID file to write
+            units (str, optional): Defaults to "METRES"; The GRIDUNIT e.g. "FEET"
+
+        Returns:
+            pathlib.Path: The written file
+        """
+        for name in ("coord", "zcorn", "actnum", "mapaxes"):
+            values = getattr(self, name)
+            if values is not None and _is_mmap_array(values):
+                setattr(self, name, values.copy())
+
+        filehead = np.zeros(100, dtype=np.int32)
+        filehead[:2] = (3, 2007)  # file version, release year
+        gridhead = np.zeros(100, dtype=np.int32)
+        gridhead[:4] = (1, self.nx, self.ny, self.nz)  # corner point grid
+        gridhead[24:26] = (1, 1)  # reservoir number, coarsening
+
+        keywords = [("FILEHEAD", filehead)]
+        if self.mapaxes is not None:
+            keywords.append(("MAPAXES", self.mapaxes, "REAL"))
+        keywords += [
+            ("GRIDUNIT", [units, ""], "CHAR"),
+            ("GRIDHEAD", gridhead),
+            ("COORD", self.coord, "REAL"),
+            ("ZCORN", self.zcorn, "REAL"),
+            ("ACTNUM", self.actnum, "INTE"),
+            ("ENDGRID", np.zeros(0, dtype=np.int32)),
+        ]
+        return write_ecl_binary(filepath, keywords)
+
+    def to_grdecl(self, filepath, units=None, fmt="%.9g", cols=6, block_lines=100000):
+        """Write the geometry to an ASCII GRDECL file
+
+        COORD and ZCORN are formatted a block of lines at a time and ACTNUM is
+        compressed to `N*value` repeats. The default format keeps every digit of
+        REAL (float32) values.
+
+        Args:
+            filepath: The GRDECL file to write
+            units (str, optional): Defaults to None; Write a GRIDUNIT e.g. "FEET"
+            fmt (str, optional): Defaults to "%.9g"; The format of COORD and ZCORN
+                values
+            cols (int, optional): Defaults to 6; Number of values per row
+            block_lines (int, optional): The number of lines formatted at once
+
+        Returns:
+            pathlib.Path: The written file
+        """
+        filepath = pathlib.Path(filepath)
+        fmt = " " + fmt
+        with open(filepath, "w") as f:
+            f.write("-- Python eclx output to ECLIPSE GRDECL\n")
+            if self.mapaxes is not None:
+                f.write("MAPAXES\n")
+                f.write((fmt * 6) % tuple(self.mapaxes.tolist()) + " /\n\n")
+            if units is not None:
+                f.write(f"GRIDUNIT\n'{units}' ' ' /\n\n")
+            f.write(f"SPECGRID\n {self.nx} {self.ny} {self.nz} 1 F /\n\n")
+            for name, values in (("COORD", self.coord), ("ZCORN", self.zcorn)):
+                f.write(f"{name}\n")
+                f.writelines(_format_lines(values.reshape(-1), cols, fmt, block_lines))
+                f.write("/\n\n")
+            f.write("ACTNUM\n")
+            f.writelines(
+                _format_lines(_ecl_repeat_items(self.actnum), cols, " %s", block_lines)
+            )
+            f.write("/\n")
+        return filepath
+
+
+class EclGridSurfaces:
+    """The top and base surfaces of every layer of a grid as node lattices
+
+    Arrays have the shape (nz, 2, nx + 1, ny + 1) where the second axis is the top
+    (0) and base (1) face of the layer. Create with `EclGridGeometry.surfaces`.
+    """
+
+    def __init__(self, x, y, z, mask):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.mask = mask
+
+    @property
+    def shape(self):
+        """The node lattice dimensions (nx + 1, ny + 1)"""
+        return self.z.shape[2:]
+
+    def __len__(self):
+        return self.z.shape[0]
+
+    def get(self, n: int, face: Literal["top", "base"] = "top"):
+        """Get the surface of a layer face
+
+        Args:
+            n: The k layer
+            face: The top or base face of the layer
+
+        Returns:
+            tuple: x, y, z masked arrays with shape (nx + 1, ny + 1), undefined
+                nodes are masked.
+        """
+        if face not in ("top", "base"):
+            raise ValueError(f"face must be top or base, got {face}")
+        if not 0 <= n < len(self):
+            raise ValueError(f"No layer matches k == {n}")
+        f = 0 if face == "top" else 1
+        return tuple(
+            np.ma.masked_array(v[n, f], mask=self.mask[n, f])
+            for v in (self.x, self.y, self.z)
+        )
+
+
 def get_face_corner_names(face: EclSimFaces):
     face_ns = EclSimFaces[face].value
     return _corner_names(order=face_ns)
@@ -112,14 +535,22 @@ def get_sim_surface(
     return corners
 
 
-def get_ecl_grid_dims(filepath):
+def get_ecl_grid_dims(filepath, backend="ecl"):
     """Get the dimensions of the grid
 
     Args:
+        filepath: The grid file
+        backend: Defaults to "ecl"; The grid reader, "numpy" reads only the GRIDHEAD
+            of an EGRID file.
 
     Returns:
         tuple: i, j, k dim sizes
     """
+    _check_backend(backend)
+    if backend == "numpy":
+        with _open_egrid_binary(filepath) as efile:
+            return _egrid_binary_dims(efile)
+
     with open_EclGrid(filepath) as egrid:
         return (
             egrid.nx,
@@ -128,14 +559,34 @@ def get_ecl_grid_dims(filepath):
         )
 
 
-def load_ecl_grid_index(filepath, silent=True):
+def load_ecl_grid_index(filepath, silent=True, backend="ecl"):
     """Load a simulation grid index
 
     Args:
+        filepath: The grid file
+        backend: Defaults to "ecl"; The grid reader, "numpy" reads only the GRIDHEAD
+            and ACTNUM of an EGRID file.
 
     Returns:
-
+        pd.DataFrame: The cell i, j, k and active indices and actnum
     """
+    _check_backend(backend)
+    return session_cached(
+        f"grid_index:{backend}",
+        filepath,
+        lambda: _load_ecl_grid_index(filepath, backend),
+        copy=True,
+    )
+
+
+def _load_ecl_grid_index(filepath, backend):
+    if backend == "numpy":
+        with _open_egrid_binary(filepath) as efile:
+            nx, ny, nz = _egrid_binary_dims(efile)
+            return _grid_index_frame(
+                nx, ny, _egrid_binary_actnum(efile), np.arange(nx * ny * nz)
+            )
+
     with open_EclGrid(filepath) as egrid:
         data = egrid.export_index()
         data["actnum"] = egrid.export_actnum().numpy_copy()
@@ -143,21 +594,35 @@ def load_ecl_grid_index(filepath, silent=True):
     return data
 
 
-def load_ecl_grid(filepath, silent=True):
-    """Load a simulation grid
+def load_ecl_geometry(filepath, backend="ecl"):
+    """Load the corner point geometry of a simulation grid
 
     Args:
+        filepath: The grid file
+        backend: Defaults to "ecl"; The grid reader, "numpy" memory-maps an EGRID
+            file instead of building the ecl grid structure.
 
     Returns:
-
+        EclGridGeometry: The grid pillars and corner depths
     """
+    _check_backend(backend)
+    if backend == "numpy":
+        with _open_egrid_binary(filepath) as efile:
+            return EclGridGeometry.from_egrid_binary(efile)
+
     with open_EclGrid(filepath) as egrid:
-        xyzcorn = pd.DataFrame(egrid.export_index())
-        zcorn = egrid.export_corners(egrid.export_index())
+        return EclGridGeometry.from_eclgrid(egrid)
+
 
-        # create zcorn names list so they can be easily referenced later
-        cnames = _corner_names()
-        for c, zc in enumerate(cnames):
-            xyzcorn[zc] = zcorn[:, c]
+def load_ecl_grid(filepath, silent=True, backend="ecl"):
+    """Load a simulation grid
 
-    return xyzcorn
+    Args:
+        filepath: The grid file
+        backend: Defaults to "ecl"; The grid reader, see `load_ecl_geometry`.
+
+    Returns:
+        pd.DataFrame: The cell i, j, k and active indices and the x, y, z
+            coordinates of each corner.
+    """
+    return load_ecl_geometry(filepath, backend=backend).to_dataframe()
@@ -3,7 +3,8 @@
 import numpy as np
 import pandas as pd
 
-from ._ecl_file import open_EclFile
+from ._ecl_file import _open_indexed_EclFile, _iget_named_kw_values
+from ._eclbinary import write_ecl_binary
 from ._eclmaps import InitIntheadMap
 from ._utils import import_tqdm
 
@@ -58,9 +59,8 @@ def load_init_intehead(filepath):
 
     """
 
-    with open_EclFile(filepath) as einit:
-        intehead = einit.iget_named_kw("INTEHEAD", 0)
-        intehead = intehead.numpy_view()
+    with _open_indexed_EclFile(filepath) as einit:
+        intehead = _iget_named_kw_values(einit, "INTEHEAD", 0)
 
     init_intehead = dict()
 
@@ -68,3 +68,96 @@ def load_init_intehead(filepath):
         init_intehead[enum.name] = intehead[enum.value]
 
     return init_intehead
+
+
+_INIT_HEADER_KEYWORDS = ("INTEHEAD", "LOGIHEAD", "DOUBHEAD")
+_INIT_HEADER_SIZES = dict(INTEHEAD=411, LOGIHEAD=121, DOUBHEAD=229)
+_INIT_HEADER_DTYPES = dict(INTEHEAD=np.int32, LOGIHEAD=bool, DOUBHEAD=np.float64)
+# INTEHEAD items set when there is no header to copy, a metric three phase
+# corner point grid from ECLIPSE 100 starting 1 January 1970
+_INTEHEAD_DEFAULTS = dict(
+    UNITS=1, GRID_TYPE=0, PHASE=7, IDAY=1, IMON=1, IYEAR=1970, IPROG=100
+)
+# INIT keywords with a value for every cell, others are active cells only
+_INIT_GLOBAL_KEYWORDS = ("PORV",)
+
+
+def load_init_headers(filepath):
+    """Load the INTEHEAD, LOGIHEAD and DOUBHEAD header arrays of an INIT file
+
+    Args:
+        filepath
+
+    Returns:
+        (dict): The header arrays of the headers in the file
+    """
+    with _open_indexed_EclFile(filepath) as einit:
+        return {
+            name: _iget_named_kw_values(einit, name, 0)
+            for name in _INIT_HEADER_KEYWORDS
+            if name in einit
+        }
+
+
+def _init_header_keywords(headers, intehead):
+    """The INIT header keywords, copied from `headers` or created"""
+    keywords = dict()
+    for name in _INIT_HEADER_KEYWORDS:
+        if name in headers:
+            values = np.array(headers[name], dtype=_INIT_HEADER_DTYPES[name])
+        else:
+            values = np.zeros(_INIT_HEADER_SIZES[name], _INIT_HEADER_DTYPES[name])
+            if name == "INTEHEAD":
+                for item, value in _INTEHEAD_DEFAULTS.items():
+                    values[InitIntheadMap[item].value] = value
+        keywords[name] = values
+    for name, value in intehead.items():
+        keywords["INTEHEAD"][InitIntheadMap[name].value] = value
+    return keywords
+
+
+def write_ecl_init(filepath, data, shape, keys, intehead=None, headers=None):
+    """Write grid properties to an INIT file
+
+    Properties are written for the active cells in active index order, PORV is
+    written for every cell with zero for the cells missing from `data`. Arrays keep
+    their type, float32 properties are written as REAL and integers as INTE.
+
+    Args:
+        filepath: The INIT file to write
+        data (pd.DataFrame): Cell properties with an `active` index column, indexed
+            by the global cell index e.g. `EclDeck.data`
+        shape (tuple): The grid dimensions (nx, ny, nz)
+        keys (list): The property columns to write
+        intehead (dict, optional): Header items from `load_init_intehead`, the grid
+            dimensions and number of active cells are set from `shape` and `data`.
+        headers (dict, optional): The INTEHEAD, LOGIHEAD and DOUBHEAD arrays to copy
+            e.g. from `load_init_headers`. Missing headers are created, INTEHEAD with
+            the units, grid type, phases, start date and simulator items set to a
+            metric three phase ECLIPSE 100 run unless they are in `intehead`.
+
+    Returns:
+        pathlib.Path: The written file
+    """
+    nx, ny, nz = shape
+    active = data["active"].to_numpy()
+    is_active = active >= 0
+    nactive = int(active.max()) + 1 if is_active.any() else 0
+    if is_active.sum() != nactive:
+        raise ValueError("data must have one row for every active cell")
+    order = np.argsort(active[is_active], kind="stable")
+
+    intehead = dict(intehead or dict())
+    intehead.update(NI=nx, NJ=ny, NK=nz, NACTIV=nactive)
+    header_keywords = _init_header_keywords(headers or dict(), intehead)
+
+    def property_keywords():
+        yield from header_keywords.items()
+        for key in keys:
+            if key in _INIT_GLOBAL_KEYWORDS:
+                values = data[key].reindex(np.arange(nx * ny * nz)).fillna(0)
+                yield key, values.to_numpy(dtype=data[key].dtype)
+            else:
+                yield key, data[key].to_numpy()[is_active][order]
+
+    return write_ecl_binary(filepath, property_keywords())
@@ -1,19 +1,142 @@
 """Load Eclipse Grid Files
 """
 import pathlib
+import datetime
 import contextlib
+import contextvars
+from warnings import warn
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import shared_memory
 
+import numpy as np
 import pandas as pd
 
 from ecl import EclFileEnum
 from ecl.eclfile import EclFile
 
-from ._ecl_file import open_EclFile, load_ecl_property
+from ._eclbinary import EclBinaryFile
+from ._ecl_file import (
+    _file_report_list,
+    _open_indexed_EclFile,
+    _find_grid_filepath,
+    _find_keys_to_load,
+    _iter_ecl_property_arrays,
+    _iget_named_kw_values,
+    _ecl_property_key_types,
+    _ECL_TYPE_DTYPES,
+    _scatter_active,
+)
+from ._grid import load_ecl_grid_index
+from ._session import EclSession, get_active_session, session_scope
 from ._utils import import_tqdm, get_ecl_deck
 
 tqdm = import_tqdm()
 
 
+class EclReportStore:
+    """Restart keyword values for a set of reports, cells x keywords x reports
+
+    Each keyword is held in its own preallocated (reports, cells) array which is
+    filled in place one report at a time.
+
+    Args:
+        index (pd.DataFrame): The grid index of the cells, from
+            `load_ecl_grid_index`
+        reports (list): The report numbers
+        active (array, optional): Boolean active cell mask of the cells in `index`,
+            values set for active cells only are scattered to these cells.
+        fill (optional): Defaults to 0; The value of cells that aren't set
+    """
+
+    def __init__(self, index, reports, active=None, fill=0):
+        self.index = index
+        self.reports = list(reports)
+        self.active = active
+        self.fill = fill
+        self.data = dict()
+        self.loaded = dict()
+
+    @property
+    def keys(self):
+        """The keywords in the store"""
+        return list(self.data.keys())
+
+    @property
+    def shape(self):
+        """The store dimensions (cells, keywords, reports)"""
+        return (self.index.shape[0], len(self.data), len(self.reports))
+
+    def allocate(self, key, dtype):
+        """Allocate the array for a keyword if it doesn't exist"""
+        if key not in self.data:
+            self.data[key] = np.full(
+                (len(self.reports), self.index.shape[0]), self.fill, dtype=dtype
+            )
+            self.loaded[key] = np.zeros(len(self.reports), dtype=bool)
+        return self.data[key]
+
+    def set(self, key, n, values):
+        """Set the values of a keyword for the `n`th report
+
+        Args:
+            key (str): The keyword
+            n (int): The position of the report in `self.reports`
+            values (array): The values for all cells or for the active cells
+        """
+        data = self.allocate(key, values.dtype)
+        if values.size == data.shape[1]:
+            data[n] = values
+        elif self.active is not None and values.size == self.active.sum():
+            data[n, self.active] = values
+        else:
+            raise ValueError(
+                f"{key} has {values.size} values, expected {data.shape[1]}"
+            )
+        self.loaded[key][n] = True
+
+    def to_dataframe(self):
+        """Convert to a dataframe with a column `{key}_{report}` per keyword and report
+
+        Returns:
+            pd.DataFrame: The grid index and keyword columns
+        """
+        columns = {
+            f"{key}_{report}": self.data[key][n]
+            for n, report in enumerate(self.reports)
+            for key in self.data
+            if self.loaded[key][n]
+        }
+        values = pd.DataFrame(columns, index=self.index.index)
+        return pd.concat([self.index, values], axis=1)
+
+    def to_xarray(self):
+        """Convert to an xarray Dataset with a variable per keyword
+
+        Keyword variables have the dimensions (report, cell), reports that were not
+        loaded for a keyword are NaN. Requires `xarray`.
+
+        Returns:
+            xarray.Dataset: The keyword values with the grid index as cell coordinates
+        """
+        try:
+            import xarray as xr
+        except ImportError:
+            raise ImportError("to_xarray requires xarray, install it with pip")
+
+        data_vars = dict()
+        for key, values in self.data.items():
+            if not self.loaded[key].all():
+                values = values.astype(np.float64)
+                values[~self.loaded[key]] = np.nan
+            data_vars[key] = (("report", "cell"), values)
+
+        coords = {"report": self.reports, "cell": self.index.index.values}
+        for col in self.index.columns:
+            coords[col] = ("cell", self.index[col].values)
+        return xr.Dataset(data_vars, coords=coords)
+
+
 def is_restart_file(filepath):
     """Check if a given file is an Eclipse restart file"""
     filepath = pathlib.Path(filepath)
@@ -38,16 +161,35 @@ def is_restart_unified(filepath):
     return file_type == EclFileEnum.ECL_UNIFIED_RESTART_FILE
 
 
+# INTEHEAD items of the report date
+_INTEHEAD_DATE_ITEMS = [64, 65, 66]  # day, month, year
+
+
+def _restart_report_dates(efile):
+    """Get the date of each report from the first INTEHEAD keyword of the report"""
+    if not isinstance(efile, EclBinaryFile):
+        return efile.dates
+
+    intehead = dict()
+    for kw in efile.keywords:
+        if kw.name == "INTEHEAD":
+            intehead.setdefault(kw.report, kw)
+    dmy = efile.read_keyword_items(list(intehead.values()), _INTEHEAD_DATE_ITEMS)
+    return [datetime.datetime(year, month, day) for day, month, year in dmy]
+
+
 def _get_restart_reports_unified(filepath):
-    """Get the restart report df if the restart file is unified"""
+    """Get the restart report df if the restart file is unified
+
+    Only the SEQNUM and INTEHEAD keywords of the reports are read.
+    """
     filepath = pathlib.Path(filepath)
     if not filepath.exists():
         raise FileNotFoundError(f"Cannot find input restart file {filepath}")
 
-    reports = EclFile.file_report_list(str(filepath))
-
-    with open_EclFile(filepath) as erst:
-        edates = erst.dates
+    with _open_indexed_EclFile(filepath) as erst:
+        reports = _file_report_list(erst, filepath)
+        edates = _restart_report_dates(erst)
 
     dates = [d.strftime("%Y-%m-%d") for d in edates]
     year = [d.year for d in edates]
@@ -65,11 +207,20 @@ def _get_restart_reports_unified(filepath):
     return report_df
 
 
-def _get_restart_reports_ununified(filepaths):
-    """Get the restart report df if the restart is split into files"""
-    reports = [
-        _get_restart_reports_unified(filepath) for filepath in filepaths
-    ]
+def _get_restart_reports_ununified(filepaths, workers=8):
+    """Get the restart report df if the restart is split into files
+
+    The files are read concurrently, each task runs in a copy of the caller's context
+    so the files are opened through the active session.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                contextvars.copy_context().run, _get_restart_reports_unified, filepath
+            )
+            for filepath in filepaths
+        ]
+        reports = [future.result() for future in futures]
     report_df = pd.concat(reports).reset_index(drop=True)
     return report_df
 
@@ -84,8 +235,48 @@ def get_restart_reports(filepath):
         return _get_restart_reports_ununified(deck_files["RST"])
 
 
-def load_ecl_rst(filepath, grid_filepath=None, reports=None, keys=None, silent=True):
-    """ """
+def load_ecl_rst(
+    filepath,
+    grid_filepath=None,
+    reports=None,
+    keys=None,
+    silent=True,
+    active_only=False,
+    workers=None,
+):
+    """Load restart grid properties for a list of reports
+
+    Args:
+        filepath (pathlike): The restart file
+        grid_filepath (pathlike, optional): The grid file, defaults to the deck grid
+        reports (int/list, optional): Reports to load, defaults to None - all reports
+        keys (list/str, optional): Key or list of keys to load.
+            Defaults to None - loads all keys.
+        silent (bool, optional): Defaults to True; disable progress bars
+        active_only (bool, optional): Defaults to False; Only return rows for the
+            active cells, see `load_ecl_property`.
+        workers (int, optional): Defaults to None; Load the reports in a pool of
+            this many processes, values are written straight into shared memory.
+
+    Returns:
+        pd.DataFrame: The grid index and a column for each key and report
+
+    Files are opened once for all the reports through the active `EclSession`, or a
+    temporary session if there is none.
+    """
+    return load_ecl_rst_store(
+        filepath,
+        grid_filepath=grid_filepath,
+        reports=reports,
+        keys=keys,
+        silent=silent,
+        active_only=active_only,
+        workers=workers,
+    ).to_dataframe()
+
+
+def _select_reports(filepath, reports):
+    """Get the restart report df for the requested reports"""
     dates = get_restart_reports(filepath)
 
     # only load requested reports
@@ -104,23 +295,253 @@ def load_ecl_rst(filepath, grid_filepath=None, reports=None, keys=None, silent=T
     except AssertionError:
         missing = set(reports).difference(dates.report)
         raise ValueError(f"Report values are not in restart file: {missing}")
+    return dates
+
+
+def load_ecl_rst_store(
+    filepath,
+    grid_filepath=None,
+    reports=None,
+    keys=None,
+    silent=True,
+    active_only=False,
+    workers=None,
+):
+    """Load restart grid properties into a report dimensioned store
 
-    data = None
-    with tqdm(total=dates.shape[0], disable=silent) as pbar:
-        for i, vals in dates.iterrows():
-            pbar.set_description(f"Loading RST Report {vals['report']}")
-            _td = load_ecl_property(
-                vals["file"],
-                keys=keys,
-                grid_filepath=grid_filepath,
-                report_index=vals["file_index"],
-                silent=silent,
+    The arguments are the same as `load_ecl_rst`. Values are written directly into
+    an `EclReportStore` which can be converted to a dataframe or xarray Dataset.
+
+    Returns:
+        EclReportStore: The keyword values for each report
+    """
+    with session_scope():
+        dates = _select_reports(filepath, reports)
+        grid_filepath = _find_grid_filepath(filepath, grid_filepath)
+
+        index = load_ecl_grid_index(grid_filepath)
+        active = index["actnum"].values > 0
+        if active_only:
+            store = EclReportStore(index[active], dates["report"])
+        else:
+            store = EclReportStore(index, dates["report"], active=active)
+
+        if workers is not None and workers > 1:
+            _load_rst_reports_parallel(
+                store, dates, keys, active.sum(), workers, silent
             )
+            return store
+
+        with tqdm(total=dates.shape[0], disable=silent) as pbar:
+            for n, (_, vals) in enumerate(dates.iterrows()):
+                pbar.set_description(f"Loading RST Report {vals['report']}")
+                keys_to_load = _find_keys_to_load(vals["file"], keys)
+                with _open_indexed_EclFile(vals["file"]) as efile:
+                    for var, kw in _iter_ecl_property_arrays(
+                        efile,
+                        keys_to_load,
+                        vals["file_index"],
+                        active.sum(),
+                        silent=silent,
+                    ):
+                        store.set(var, n, kw)
+                pbar.update()
+
+    return store
+
+
+def _load_rst_report(vals, keys, active, active_only):
+    """Load the values of the keys for a row of the restart report df"""
+    keys_to_load = _find_keys_to_load(vals["file"], keys)
+    with _open_indexed_EclFile(vals["file"]) as efile:
+        return {
+            var: kw if active_only else _scatter_active(kw, active)
+            for var, kw in _iter_ecl_property_arrays(
+                efile, keys_to_load, vals["file_index"], active.sum(), silent=True
+            )
+        }
+
+
+def iter_ecl_rst(
+    filepath,
+    grid_filepath=None,
+    reports=None,
+    keys=None,
+    active_only=False,
+    prefetch=1,
+):
+    """Iterate over restart grid properties one report at a time
+
+    Only the current report and the `prefetch` reports after it are held in memory,
+    the following reports are loaded in a background thread while the current
+    report is processed.
+
+    Args:
+        filepath (pathlike): The restart file
+        grid_filepath (pathlike, optional): The grid file, defaults to the deck grid
+        reports (int/list, optional): Reports to load, defaults to None - all reports
+        keys (list/str, optional): Key or list of keys to load.
+            Defaults to None - loads all keys.
+        active_only (bool, optional): Defaults to False; Only return the values of
+            the active cells, see `load_ecl_property`.
+        prefetch (int, optional): Defaults to 1; The number of reports to load ahead
+
+    Yields:
+        tuple: The report row of `get_restart_reports` (report, date, ...) and a dict
+            of the values of each key, in the order of `load_ecl_grid_index`.
+    """
+    # the session is only activated while loading, so it doesn't leak to the
+    # caller between reports
+    session = get_active_session()
+    owned = session is None
+    if owned:
+        session = EclSession()
+
+    with session.activate():
+        dates = _select_reports(filepath, reports)
+        grid_filepath = _find_grid_filepath(filepath, grid_filepath)
+        active = load_ecl_grid_index(grid_filepath)["actnum"].values > 0
+
+    def load(vals):
+        with session.activate():
+            return vals, _load_rst_report(vals, keys, active, active_only)
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    pending = deque()
+    try:
+        for _, vals in dates.iterrows():
+            pending.append(pool.submit(load, vals))
+            if len(pending) > prefetch:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # stop loading ahead if the iteration is stopped early
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
+        if owned:
+            session.close()
+
+
+# shared array name of the active cell mask, keywords are never empty
+_SHARED_ACTIVE = ""
+
+
+@contextlib.contextmanager
+def _create_shared_arrays(specs):
+    """Allocate shared memory arrays, released on exit
+
+    Args:
+        specs (dict): The (shape, dtype) of each array
+
+    Yields:
+        tuple: The arrays and the (name, shape, dtype) of their shared memory
+    """
+    shms = dict()
+    arrays = dict()
+    try:
+        for key, (shape, dtype) in specs.items():
+            nbytes = int(np.prod(shape)) * dtype.itemsize
+            shms[key] = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+            arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shms[key].buf)
+        buffers = {
+            key: (shms[key].name, shape, dtype.str)
+            for key, (shape, dtype) in specs.items()
+        }
+        yield arrays, buffers
+    finally:
+        arrays.clear()
+        for shm in shms.values():
+            shm.close()
+            shm.unlink()
+
+
+@contextlib.contextmanager
+def _attach_shared_arrays(buffers):
+    """Attach to the shared memory arrays created by `_create_shared_arrays`"""
+    shms = dict()
+    arrays = dict()
+    try:
+        for key, (name, shape, dtype) in buffers.items():
+            shms[key] = shared_memory.SharedMemory(name=name)
+            arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shms[key].buf)
+        yield arrays
+    finally:
+        arrays.clear()
+        for shm in shms.values():
+            shm.close()
+
+
+def _load_rst_report_shared(filepath, file_index, n, keys, buffers):
+    """Pool worker, write the values of a report into row `n` of the shared arrays"""
+    with _attach_shared_arrays(buffers) as arrays:
+        with _open_indexed_EclFile(filepath) as efile:
+            for key in keys:
+                try:
+                    values = _iget_named_kw_values(efile, key, file_index)
+                except KeyError:
+                    raise ValueError(f"The keyword {key} is not in the ecl file.")
+                if values.size == arrays[key].shape[1]:
+                    arrays[key][n] = values
+                else:
+                    arrays[key][n, arrays[_SHARED_ACTIVE]] = values
+    return n
+
+
+def _load_rst_reports_parallel(store, dates, keys, active_size, workers, silent):
+    """Fill a store by loading its reports in a process pool
+
+    The keys and dtypes of each report are read from the file headers so the store
+    arrays can be allocated in shared memory up front, the workers write the report
+    values into them directly and only the report position is sent back.
+    """
+    plan = []
+    for _, vals in dates.iterrows():
+        keys_to_load = _find_keys_to_load(vals["file"], keys)
+        with _open_indexed_EclFile(vals["file"]) as efile:
+            key_types = _ecl_property_key_types(efile, keys_to_load, active_size)
+        if not key_types:
+            warn(
+                "None of the selected keys to load match the provided grid active cell count. No properties will be loaded."
+            )
+        try:
+            plan.append({key: _ECL_TYPE_DTYPES[t] for key, t in key_types.items()})
+        except KeyError as err:
+            raise ValueError(f"Cannot load keywords of type {err.args[0]}")
+
+    shape = (len(store.reports), store.index.shape[0])
+    specs = dict()
+    for key_dtypes in plan:
+        for key, dtype in key_dtypes.items():
+            specs.setdefault(key, (shape, dtype))
+    if store.active is not None:
+        specs[_SHARED_ACTIVE] = (store.active.shape, np.dtype(bool))
+
+    with _create_shared_arrays(specs) as (arrays, buffers):
+        for key in specs:
+            arrays[key][:] = store.active if key == _SHARED_ACTIVE else store.fill
 
-            if data is not None:
-                data = data.join(_td.iloc[:, 5:])
-            else:
-                data = _td
-            pbar.update()
+        with ProcessPoolExecutor(max_workers=workers) as pool, tqdm(
+            total=len(plan), disable=silent, desc="Loading RST Reports"
+        ) as pbar:
+            futures = [
+                pool.submit(
+                    _load_rst_report_shared,
+                    vals["file"],
+                    vals["file_index"],
+                    n,
+                    list(plan[n]),
+                    buffers,
+                )
+                for n, (_, vals) in enumerate(dates.iterrows())
+            ]
+            for future in as_completed(futures):
+                future.result()
+                pbar.update()
 
-    return data
+        for key in specs:
+            if key == _SHARED_ACTIVE:
+                continue
+            store.data[key] = arrays[key].copy()
+            store.loaded[key] = np.array([key in key_dtypes for key_dtypes in plan])
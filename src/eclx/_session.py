@@ -0,0 +1,158 @@
+"""Session scoped pool of open ecl file handles
+
+Loaders open files through `session_cached`. Outside of a session a new handle is
+opened on every call, inside an active `EclSession` handles and small derived tables
+(grid indexes, deck file lists) are reused until they are evicted or the session is
+closed.
+"""
+import pathlib
+import threading
+import contextlib
+import contextvars
+from collections import OrderedDict
+
+_ACTIVE_SESSION = contextvars.ContextVar("eclx_session", default=None)
+
+
+def get_active_session():
+    """Get the active `EclSession`, None if there isn't one"""
+    return _ACTIVE_SESSION.get()
+
+
+class EclSession:
+    """A bounded LRU pool of open ecl file handles shared by the eclx loaders
+
+    Use the session as a context manager, all eclx loaders called inside the block
+    share its handles and the pool is released on exit. `activate` makes the
+    session active without releasing it, an `EclDeck` given a session uses this to
+    keep its handles between method calls.
+
+    Handles are released by dropping the pool's reference, so a handle that is
+    still in use when it is evicted stays open until its user is finished with it.
+
+    Args:
+        maxsize (int, optional): Defaults to 16; The number of handles to keep open,
+            the least recently used handle is released when the pool is full.
+    """
+
+    def __init__(self, maxsize=16):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._pool = OrderedDict()
+        self._lock = threading.RLock()
+        self._tokens = []
+
+    def __enter__(self):
+        self._tokens.append(_ACTIVE_SESSION.set(self))
+        return self
+
+    def __exit__(self, *args):
+        _ACTIVE_SESSION.reset(self._tokens.pop())
+        self.close()
+
+    def __len__(self):
+        return len(self._pool)
+
+    def __contains__(self, key):
+        return key in self._pool
+
+    def __getstate__(self):
+        # handles cannot be pickled, a restored session starts empty
+        return dict(maxsize=self.maxsize)
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Make this the active session without closing it on exit"""
+        token = _ACTIVE_SESSION.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE_SESSION.reset(token)
+
+    @staticmethod
+    def key(kind, filepath):
+        """The pool key of a handle of `kind` for `filepath`
+
+        The key includes the size and modification time of the file, if it exists,
+        so a handle is not reused after its file is rewritten.
+        """
+        filepath = pathlib.Path(filepath).resolve()
+        try:
+            stat = filepath.stat()
+        except OSError:
+            return (kind, str(filepath), None, None)
+        return (kind, str(filepath), stat.st_size, stat.st_mtime_ns)
+
+    def get(self, kind, filepath, opener):
+        """Get a pooled handle, calling `opener()` to create it if it isn't pooled
+
+        Args:
+            kind (str): The type of handle e.g. "EclGrid"
+            filepath (pathlike): The file the handle is for
+            opener (callable): Creates the handle
+
+        Returns:
+            The pooled handle
+        """
+        key = self.key(kind, filepath)
+        with self._lock:
+            try:
+                self._pool.move_to_end(key)
+                return self._pool[key]
+            except KeyError:
+                pass
+
+        handle = opener()
+        with self._lock:
+            if key in self._pool:  # opened concurrently
+                self._pool.move_to_end(key)
+                return self._pool[key]
+            self._pool[key] = handle
+            while len(self._pool) > self.maxsize:
+                self._pool.popitem(last=False)
+        return handle
+
+    def evict(self, kind, filepath=None):
+        """Release the pooled handles of `kind`, only those for `filepath` if given"""
+        path = None if filepath is None else str(pathlib.Path(filepath).resolve())
+        with self._lock:
+            for key in list(self._pool):
+                if key[0] == kind and (path is None or key[1] == path):
+                    del self._pool[key]
+
+    def close(self):
+        """Release all the pooled handles"""
+        with self._lock:
+            self._pool.clear()
+
+
+def session_cached(kind, filepath, loader, copy=False):
+    """Get a handle or value from the active session or load it without caching
+
+    Args:
+        kind (str): The type of handle or value e.g. "EclGrid", "grid_index"
+        filepath (pathlike): The file the value was loaded from
+        loader (callable): Loads the value
+        copy (bool, optional): Defaults to False; Return a copy of a cached value so
+            it can be safely modified.
+    """
+    session = get_active_session()
+    if session is None:
+        return loader()
+    value = session.get(kind, filepath, loader)
+    return value.copy() if copy else value
+
+
+@contextlib.contextmanager
+def session_scope():
+    """Use the active session or a temporary one for the length of the block"""
+    session = get_active_session()
+    if session is not None:
+        yield session
+    else:
+        with EclSession() as session:
+            yield session
@@ -0,0 +1,260 @@
+"""Export grid properties to chunked, compressed array stores
+
+Each INIT keyword and each restart report is written to its own dataset as soon as
+it is loaded, so one property of one report can be read back without loading the
+rest of the export.
+"""
+import pathlib
+
+import numpy as np
+
+from ._ecl_file import (
+    _open_indexed_EclFile,
+    _find_keys_to_load,
+    _ecl_property_key_types,
+    _iter_ecl_property_arrays,
+    _scatter_active,
+)
+from ._grid import get_ecl_grid_dims, load_ecl_grid_index
+from ._rst import iter_ecl_rst, get_restart_reports
+from ._session import session_scope
+from ._utils import get_ecl_deck, import_tqdm
+
+tqdm = import_tqdm()
+
+ARRAY_STORE_FORMATS = ("zarr", "hdf5-chunked")
+
+
+def _import_zarr():
+    try:
+        import zarr
+        import numcodecs
+    except ImportError:
+        raise ImportError("zarr export requires zarr, install it with pip")
+    return zarr, numcodecs
+
+
+def _import_h5py():
+    try:
+        import h5py
+    except ImportError:
+        raise ImportError("hdf5-chunked export requires h5py, install it with pip")
+    return h5py
+
+
+class _ZarrArrayStore:
+    """A zarr directory store, datasets are Blosc zstd compressed"""
+
+    def __init__(self, path, append=False):
+        zarr, numcodecs = _import_zarr()
+        self.root = zarr.open_group(str(path), mode="a" if append else "w")
+        self.compressor = numcodecs.Blosc(
+            cname="zstd", clevel=3, shuffle=numcodecs.Blosc.SHUFFLE
+        )
+
+    def __contains__(self, name):
+        return name in self.root
+
+    def write(self, name, values, chunks):
+        self.root.create_dataset(
+            name, data=values, chunks=chunks, compressor=self.compressor, overwrite=True
+        )
+
+    def get_attrs(self):
+        return self.root.attrs.asdict()
+
+    def set_attrs(self, attrs):
+        self.root.attrs.update(attrs)
+
+    def close(self):
+        pass
+
+
+class _HDF5ArrayStore:
+    """An HDF5 file, datasets are gzip compressed with byte shuffling"""
+
+    def __init__(self, path, append=False):
+        h5py = _import_h5py()
+        self.file = h5py.File(path, "a" if append else "w")
+
+    def __contains__(self, name):
+        return name in self.file
+
+    def write(self, name, values, chunks):
+        if name in self.file:
+            del self.file[name]
+        self.file.create_dataset(
+            name,
+            data=values,
+            chunks=chunks,
+            compression="gzip",
+            compression_opts=4,
+            shuffle=True,
+        )
+
+    def get_attrs(self):
+        return {
+            key: value.tolist() if isinstance(value, np.ndarray) else value
+            for key, value in self.file.attrs.items()
+        }
+
+    def set_attrs(self, attrs):
+        self.file.attrs.update(attrs)
+
+    def close(self):
+        self.file.close()
+
+
+_ARRAY_STORES = {"zarr": _ZarrArrayStore, "hdf5-chunked": _HDF5ArrayStore}
+
+
+def _store_chunks(shape, chunksize):
+    """Chunks of whole k layers (or active cells) holding about `chunksize` values"""
+    if len(shape) == 1:
+        return (max(1, min(shape[0], chunksize)),)
+    layer = int(np.prod(shape[1:]))
+    return (max(1, min(shape[0], chunksize // max(layer, 1))),) + tuple(shape[1:])
+
+
+def export_ecl_arrays(
+    filepath,
+    outpath,
+    format="zarr",
+    init_keys=None,
+    rst_keys=None,
+    reports=None,
+    active_only=False,
+    append=False,
+    chunksize=2**20,
+    silent=True,
+):
+    """Export INIT and restart grid properties to a chunked, compressed array store
+
+    The store holds a dataset per keyword, each written as soon as it is loaded so
+    only one INIT keyword or one restart report is held in memory:
+
+        grid/ACTNUM
+        init/<key>
+        rst/<report>/<key>
+
+    Datasets are shaped (nk, nj, ni), or (nactive,) if `active_only`. The store
+    attributes hold the grid `shape` (ni, nj, nk), `nactive`, `active_only` and the
+    `reports` and `dates` written so far.
+
+    Requires `zarr` for the "zarr" format and `h5py` for "hdf5-chunked".
+
+    Args:
+        filepath (pathlike): The deck, any file of the deck or its path without suffix
+        outpath (pathlike): The zarr directory or HDF5 file to write
+        format (str, optional): Defaults to "zarr"; or "hdf5-chunked"
+        init_keys (list, optional): INIT keys to export, defaults to None - all keys
+        rst_keys (list, optional): Restart keys to export, defaults to None - all keys
+        reports (int/list, optional): Reports to export, defaults to None - all reports
+        active_only (bool, optional): Defaults to False; Only export active cells
+        append (bool, optional): Defaults to False; Add to an existing store, reports
+            already in the store are skipped and the grid and INIT keys are only
+            written if they are missing. The grid shape, number of active cells and
+            `active_only` must match the store.
+        chunksize (int, optional): Defaults to 2**20; The approximate number of
+            values per chunk, grid shaped chunks hold whole k layers.
+        silent (bool, optional): Defaults to True; Disable the progress bar
+
+    Returns:
+        pathlib.Path: The store
+    """
+    if format not in ARRAY_STORE_FORMATS:
+        raise ValueError(f"format must be one of {ARRAY_STORE_FORMATS}, got {format}")
+    outpath = pathlib.Path(outpath)
+    deck = get_ecl_deck(filepath)
+    if not deck["GRID"]:
+        raise ValueError(f"Cannot find a grid file for the deck {filepath}")
+    grid_filepath = deck["GRID"][0]
+
+    store = _ARRAY_STORES[format](outpath, append=append)
+    try:
+        with session_scope():
+            ni, nj, nk = get_ecl_grid_dims(grid_filepath)
+            active = load_ecl_grid_index(grid_filepath)["actnum"].values > 0
+            shape = (int(active.sum()),) if active_only else (nk, nj, ni)
+            chunks = _store_chunks(shape, chunksize)
+
+            grid_attrs = dict(
+                shape=[ni, nj, nk], nactive=int(active.sum()), active_only=active_only
+            )
+            attrs = store.get_attrs() if append else dict()
+            for name, value in grid_attrs.items():
+                if attrs and attrs.get(name) != value:
+                    raise ValueError(
+                        f"The {name} {value} of the deck does not match the "
+                        f"{name} {attrs.get(name)} of the store {outpath}"
+                    )
+            attrs.update(grid_attrs)
+            attrs.setdefault("reports", [])
+            attrs.setdefault("dates", [])
+
+            if "grid/ACTNUM" not in store:
+                actnum = active.astype(np.int32)
+                store.write(
+                    "grid/ACTNUM",
+                    actnum.reshape(nk, nj, ni),
+                    _store_chunks((nk, nj, ni), chunksize),
+                )
+
+            if deck["INIT"]:
+                _export_init_arrays(
+                    store, deck["INIT"][0], init_keys, active, shape, chunks, silent
+                )
+            store.set_attrs(attrs)
+
+            if deck["RST"]:
+                if reports is None:
+                    reports = get_restart_reports(deck["RST"][0])["report"].to_list()
+                elif isinstance(reports, int):
+                    reports = [reports]
+                reports = [r for r in reports if r not in set(attrs["reports"])]
+            else:
+                reports = []
+
+            if reports:
+                rst_reports = iter_ecl_rst(
+                    deck["RST"][0],
+                    grid_filepath=grid_filepath,
+                    reports=reports,
+                    keys=rst_keys,
+                    active_only=active_only,
+                )
+                for vals, arrays in tqdm(
+                    rst_reports, total=len(reports), disable=silent, desc="Reports"
+                ):
+                    for key, values in arrays.items():
+                        store.write(
+                            f"rst/{vals['report']}/{key}",
+                            values.reshape(shape),
+                            chunks,
+                        )
+                    # the report is only listed once all of its keys are written
+                    attrs["reports"].append(int(vals["report"]))
+                    attrs["dates"].append(str(vals["date"]))
+                    store.set_attrs(attrs)
+    finally:
+        store.close()
+    return outpath
+
+
+def _export_init_arrays(store, init_filepath, keys, active, shape, chunks, silent):
+    """Write the INIT keys missing from the store one keyword at a time"""
+    keys = _find_keys_to_load(init_filepath, keys)
+    with _open_indexed_EclFile(init_filepath) as efile:
+        keys = [
+            key
+            for key in _ecl_property_key_types(efile, keys, active.sum())
+            if f"init/{key}" not in store
+        ]
+        if not keys:
+            return
+        for key, values in _iter_ecl_property_arrays(
+            efile, keys, 0, active.sum(), silent=silent
+        ):
+            if len(shape) > 1:
+                values = _scatter_active(values, active)
+            store.write(f"init/{key}", values.reshape(shape), chunks)
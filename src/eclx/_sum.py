@@ -1,12 +1,165 @@
 """Load Eclipse Summary Files
 """
 
+import re
+import glob
+import itertools
+import fnmatch
 import pathlib
+import datetime
+import functools
 import contextlib
 from typing import Type
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
+import pandas as pd
+
+from ecl import EclFileEnum
+from ecl.eclfile import EclFile
 from ecl.summary import EclSum
-from ._utils import test_open_eclfile
+from ._eclbinary import EclBinaryFile, is_ecl_binary_file, open_EclBinaryFile
+from ._session import session_cached
+from ._utils import get_ecl_deck
+
+_SUMMARY_HEADER_KEYS = ("DIMENS", "KEYWORDS")
+_SUMMARY_DATA_KEYS = ("SEQHDR",)
+
+SUMMARY_BACKENDS = ("ecl", "numpy")
+
+# the SMSPEC name of an undefined well or group
+_SUMMARY_NO_WGNAME = ":+:+:+:+"
+
+SUMMARY_EXPORT_FORMATS = ("parquet", "arrow")
+
+_SUMMARY_VECTOR_TYPES = {
+    "A": "aquifer",
+    "B": "block",
+    "C": "completion",
+    "F": "field",
+    "G": "group",
+    "N": "network",
+    "R": "region",
+    "S": "segment",
+    "W": "well",
+}
+
+# simulator performance vectors that don't follow the first letter naming rules
+_SUMMARY_MISC_KEYWORDS = {
+    "NEWTON",
+    "NAIMFRAC",
+    "NLINEARS",
+    "NLINSMIN",
+    "NLINSMAX",
+    "ELAPSED",
+    "MAXDPR",
+    "MAXDSO",
+    "MAXDSG",
+    "MAXDSW",
+    "STEPTYPE",
+    "WNEWTON",
+}
+
+
+def _summary_case_files(filepath):
+    """Get the header (SMSPEC) and data (UNSMRY or Snnnn) files of a summary case"""
+    filepath = pathlib.Path(filepath)
+    header, data = [], []
+    for path in sorted(filepath.parent.glob(f"{glob.escape(filepath.stem)}.*")):
+        file_type, _, _ = EclFile.getFileType(str(path))
+        if file_type == EclFileEnum.ECL_SUMMARY_HEADER_FILE:
+            header.append(path)
+        elif file_type in (
+            EclFileEnum.ECL_SUMMARY_FILE,
+            EclFileEnum.ECL_UNIFIED_SUMMARY_FILE,
+        ):
+            data.append(path)
+    return header, data
+
+
+def _file_signature(path):
+    stat = path.stat()
+    return (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+
+
+def _check_summary_file(filepath, required):
+    """Check the keyword structure of a summary file, raises ValueError if invalid
+
+    Returns:
+        list: The `EclBinaryKeyword` headers of an unformatted file, None for a
+            formatted file
+    """
+    if not is_ecl_binary_file(filepath):
+        with open(filepath, "rb") as f:
+            head = f.read(64).lstrip()
+        if not head.startswith(b"'"):
+            raise ValueError(f"{filepath} is not an ecl summary file")
+        return None
+
+    # scanning the keyword headers checks the record framing of the whole file, the
+    # index isn't saved so checking a file never writes one
+    with open_EclBinaryFile(filepath, use_index=False) as efile:
+        keys = efile.keys()
+        keywords = efile.keywords
+        if not keys:
+            raise ValueError(f"{filepath} is empty")
+        missing = [key for key in required if key not in keys]
+        if missing:
+            raise ValueError(
+                f"{filepath} is not an ecl summary file, missing {missing}"
+            )
+        if "DIMENS" in required:
+            nlist = int(efile["DIMENS"][0])
+            nkeywords = efile.get_keyword("KEYWORDS").length
+            if nkeywords != nlist:
+                raise ValueError(
+                    f"{filepath} has {nkeywords} KEYWORDS for {nlist} vectors"
+                )
+    return keywords
+
+
+@functools.lru_cache(maxsize=128)
+def _check_summary_case(header, data):
+    nlist = None
+    for filepath, *_ in header:
+        keywords = _check_summary_file(filepath, _SUMMARY_HEADER_KEYS)
+        if keywords is not None:
+            nlist = next(kw.length for kw in keywords if kw.name == "KEYWORDS")
+    for filepath, *_ in data:
+        keywords = _check_summary_file(filepath, _SUMMARY_DATA_KEYS)
+        if keywords is None or nlist is None:
+            continue
+        for kw in keywords:
+            if kw.name == "PARAMS" and kw.length != nlist:
+                raise ValueError(
+                    f"{filepath} has PARAMS of {kw.length} values, the SMSPEC has "
+                    f"{nlist} vectors"
+                )
+
+
+def check_summary_files(filepath):
+    """Check the SMSPEC and UNSMRY files of a summary can be loaded by EclSum
+
+    The keyword structure of the files is checked in process, and the number of
+    PARAMS values in each data record against the number of SMSPEC vectors. Nothing
+    is written, the result is cached on the path, size and modification time of the
+    files.
+
+    Args:
+        filepath (pathlike): A summary file or the case name
+
+    Raises:
+        ValueError: If the summary files are missing or invalid
+    """
+    header, data = _summary_case_files(filepath)
+    if not header:
+        raise ValueError(f"Cannot find the SMSPEC file of summary {filepath}")
+    if not data:
+        raise ValueError(f"Cannot find the UNSMRY or Snnnn files of summary {filepath}")
+    _check_summary_case(
+        tuple(_file_signature(path) for path in header),
+        tuple(_file_signature(path) for path in data),
+    )
 
 
 @contextlib.contextmanager
@@ -16,11 +169,10 @@ def open_EclSum(filepath):
     if not filepath.exists():
         raise FileNotFoundError(f"Cannot find input summary file {filepath}")
 
-    _ = test_open_eclfile(EclSum, filepath)
     efile = None
     # safety clause for loading eclipse data with ecl
     try:
-        efile = EclSum(str(filepath))
+        efile = session_cached("EclSum", filepath, lambda: _open_EclSum(filepath))
         yield efile
     except ValueError as e:
         print(e)
@@ -29,33 +181,545 @@ def open_EclSum(filepath):
         del efile
 
 
-def get_summary_keys(filepath):
-    """Load the curves keys from an Eclipse deck"""
+def _open_EclSum(filepath):
+    # EclSum can crash the interpreter on bad files, check them first
+    check_summary_files(filepath)
+    return EclSum(str(filepath))
+
+
+def _check_backend(backend):
+    if backend not in SUMMARY_BACKENDS:
+        raise ValueError(f"backend must be one of {SUMMARY_BACKENDS}, got {backend}")
+
+
+def _summary_key(keyword, wgname, num, dims):
+    """The ecl summary key of a SMSPEC vector, None if it is not a valid vector"""
+    nx, ny = dims[1], dims[2]
+
+    def ijk():
+        k, ij = divmod(num - 1, nx * ny)
+        j, i = divmod(ij, nx)
+        return f"{i + 1},{j + 1},{k + 1}"
+
+    if keyword in _SUMMARY_MISC_KEYWORDS:
+        return keyword
+
+    has_wgname = wgname not in ("", _SUMMARY_NO_WGNAME)
+    var_type = keyword[0]
+    if var_type in "WGN":
+        return f"{keyword}:{wgname}" if has_wgname else None
+    if var_type in "ARBCS" and num <= 0:
+        return None
+    if var_type == "A":
+        return f"{keyword}:{num}"
+    if var_type == "R":
+        if keyword[2:3] == "F":  # region to region flows
+            r1 = num % 32768
+            r2 = num // 32768 - 10
+            return f"{keyword}:{r1}-{r2}"
+        return f"{keyword}:{num}"
+    if var_type == "B":
+        return f"{keyword}:{ijk()}"
+    if var_type == "C":
+        return f"{keyword}:{wgname}:{ijk()}" if has_wgname else None
+    if var_type == "S":
+        return f"{keyword}:{wgname}:{num}" if has_wgname else None
+    if var_type == "L":  # local grid vectors are not supported
+        return None
+    return keyword
+
+
+def _summary_start_date(startdat):
+    day, month, year = startdat[:3]
+    hour, minute, microsecond = list(startdat[3:6]) + [0] * (6 - len(startdat))
+    return np.datetime64(
+        datetime.datetime(year, month, day, hour, minute)
+        + datetime.timedelta(microseconds=int(microsecond)),
+        "ms",
+    )
+
+
+def _open_summary_binary(filepath):
+    """Get the `EclBinaryFile` of an unformatted summary file from the session"""
+    if not is_ecl_binary_file(filepath):
+        raise ValueError(
+            f"The numpy summary backend needs unformatted files, {filepath} is formatted"
+        )
+    return session_cached("EclBinaryFile", filepath, lambda: EclBinaryFile(filepath))
+
+
+def _read_summary_spec(filepath):
+    """Read the vector index and start date of a SMSPEC file"""
+    spec = _open_summary_binary(filepath)
+    dims = spec["DIMENS"]
+    names = [name.decode().strip() for name in spec["KEYWORDS"]]
+    wgnames = spec["WGNAMES"] if "WGNAMES" in spec else spec["NAMES"]
+    wgnames = [name.decode().strip() for name in wgnames]
+    nums = spec["NUMS"] if "NUMS" in spec else np.zeros(len(names), dtype=int)
+    units = [unit.decode().strip() for unit in spec["UNITS"]]
+
+    index = pd.DataFrame(
+        dict(
+            key=[
+                _summary_key(name, wgname, int(num), dims)
+                for name, wgname, num in zip(names, wgnames, nums)
+            ],
+            keyword=names,
+            wgname=wgnames,
+            num=np.asarray(nums, dtype=int),
+            unit=units,
+            column=np.arange(len(names)),
+        )
+    )
+    return index, _summary_start_date(spec["STARTDAT"])
+
+
+def _summary_files(filepath):
+    """Get the SMSPEC and the unified or split data files of a summary"""
+    header, data = _summary_case_files(filepath)
+    if not header:
+        raise ValueError(f"Cannot find the SMSPEC file of summary {filepath}")
+    unified = [
+        path
+        for path in data
+        if EclFile.getFileType(str(path))[0] == EclFileEnum.ECL_UNIFIED_SUMMARY_FILE
+    ]
+    if not data:
+        raise ValueError(f"Cannot find the UNSMRY or Snnnn files of summary {filepath}")
+    return header[0], unified[:1] or data
+
+
+def load_summary_index(filepath):
+    """Load the vector index of a summary from the SMSPEC file
+
+    Args:
+        filepath (pathlike): A summary file or the case name
+
+    Returns:
+        pd.DataFrame: The key, keyword, wgname, num and unit of each vector and its
+            column in the PARAMS records. Vectors that aren't valid have a key of None.
+    """
+    spec_filepath, _ = _summary_files(filepath)
+    index, _ = session_cached(
+        "summary_spec", spec_filepath, lambda: _read_summary_spec(spec_filepath)
+    )
+    return index.copy()
+
+
+def _summary_vectors(index):
+    """The valid vectors of a summary index, the time vector is the frame index"""
+    vectors = index[index["key"].notna() & (index["keyword"] != "TIME")]
+    return vectors.drop_duplicates("key")
+
+
+def _summary_ministeps(data_filepaths):
+    """Get the PARAMS keywords of each data file and if they end a report step
+
+    Every report step starts with a SEQHDR keyword, the last ministep before it
+    and the last ministep of the summary end a report step.
+    """
+    ministeps = []
+    last = None  # the report_end list and position of the previous ministep
+    for data_filepath in data_filepaths:
+        efile = _open_summary_binary(data_filepath)
+        params, report_end = [], []
+        for kw in efile.keywords:
+            if kw.name == "SEQHDR" and last is not None:
+                last[0][last[1]] = True
+            elif kw.name == "PARAMS":
+                params.append(kw)
+                report_end.append(False)
+                last = (report_end, len(report_end) - 1)
+        ministeps.append((efile, params, report_end))
+    if last is not None:
+        last[0][last[1]] = True
+    return ministeps
+
+
+def _iter_summary_numpy(
+    filepath, curves=None, start=None, end=None, report_only=False, chunksize=None
+):
+    """Load summary vectors by gathering their columns from the PARAMS records
+
+    The TIME column of every ministep is read first to select the rows, then only
+    the requested columns of the selected rows are read, `chunksize` rows at a time.
+
+    Yields:
+        pd.DataFrame: The vectors of the next `chunksize` rows
+    """
+    spec_filepath, data_filepaths = _summary_files(filepath)
+    index, start_date = session_cached(
+        "summary_spec", spec_filepath, lambda: _read_summary_spec(spec_filepath)
+    )
+    vectors = _summary_vectors(index).set_index("key")["column"]
+    if curves is None:
+        curves = list(vectors.index)
+
+    time = index.loc[index["keyword"] == "TIME", "column"]
+    if time.empty:
+        raise ValueError(f"The summary {spec_filepath} has no TIME vector")
+    columns = np.array([vectors[curve] for curve in curves], dtype=np.int64)
+
+    rows, dates = [], []
+    for efile, params, report_end in _summary_ministeps(data_filepaths):
+        days = efile.read_keyword_items(params, [time.iloc[0]])[:, 0]
+        seconds = np.trunc(days.astype(np.float64) * 86400).astype(np.int64)
+        file_dates = pd.DatetimeIndex(start_date + seconds.astype("timedelta64[s]"))
+
+        mask = np.ones(len(params), dtype=bool)
+        if start is not None:
+            mask &= file_dates >= pd.Timestamp(start)
+        if end is not None:
+            mask &= file_dates <= pd.Timestamp(end)
+        if report_only:
+            mask &= np.array(report_end, dtype=bool)
+
+        rows.extend((efile, kw) for kw, keep in zip(params, mask) if keep)
+        dates.append(file_dates[mask].values)
+    dates = pd.DatetimeIndex(np.concatenate(dates))
+
+    chunksize = chunksize or max(len(rows), 1)
+    for i in range(0, max(len(rows), 1), chunksize):
+        chunk = rows[i : i + chunksize]
+        values = [
+            efile.read_keyword_items([kw for _, kw in group], columns)
+            for efile, group in itertools.groupby(chunk, key=lambda row: row[0])
+        ]
+        values = np.concatenate(values) if values else np.empty((0, len(columns)))
+        yield pd.DataFrame(
+            values.astype(np.float64),
+            index=dates[i : i + chunksize],
+            columns=list(curves),
+        )
+
+
+def _load_summary_numpy(filepath, curves=None, start=None, end=None, report_only=False):
+    """Load summary vectors by gathering their columns from the PARAMS records"""
+    (sum_df,) = _iter_summary_numpy(
+        filepath, curves=curves, start=start, end=end, report_only=report_only
+    )
+    return sum_df
+
+
+def get_summary_keys(filepath, backend="ecl"):
+    """Load the curves keys from an Eclipse deck
+
+    Args:
+        filepath (pathlike): The summary file
+        backend (str, optional): Defaults to "ecl"; "numpy" reads the keys from the
+            SMSPEC file with `load_summary_index`.
+    """
+    _check_backend(backend)
+    if backend == "numpy":
+        return sorted(_summary_vectors(load_summary_index(filepath))["key"])
+
     with open_EclSum(filepath) as esum:
         return list(esum.keys())
 
 
-def load_summary_df(filepath, curves=None):
+def _build_summary_key_index(keys):
+    """Index summary keys by keyword then by the rest of the key e.g. well, region"""
+    index = dict()
+    for key in keys:
+        keyword, _, rest = key.partition(":")
+        index.setdefault(keyword, dict())[rest] = key
+    return index
+
+
+def _has_wildcard(pattern):
+    return any(char in pattern for char in "*?[")
+
+
+def _fnmatch_filter(names, pattern):
+    return [name for name in names if fnmatch.fnmatchcase(name, pattern)]
+
+
+def _match_summary_keys(index, pattern):
+    """Get the keys of a summary key index matching a key or pattern"""
+    keyword, _, rest = pattern.partition(":")
+    if not _has_wildcard(keyword):
+        names = index.get(keyword, dict())
+        if not _has_wildcard(rest):
+            return [names[rest]] if rest in names else []
+        return sorted(names[name] for name in _fnmatch_filter(names, rest))
+
+    # wildcards in the keyword can match across the rest of the key e.g. W*
+    prefix = re.split(r"[*?[]", keyword, maxsplit=1)[0]
+    keys = [
+        key for name in index if name.startswith(prefix) for key in index[name].values()
+    ]
+    return sorted(_fnmatch_filter(keys, pattern))
+
+
+def _select_summary_keys(keys, curves=None):
+    """Resolve a list of curve keys and patterns against the summary keys
+
+    Patterns use shell style wildcards `*`, `?` and `[]` e.g. `WOPR:*`, `FIP*:REG1`.
+
+    Returns:
+        tuple: The selected keys in the order of the curves, each key once, and the
+            curves which don't match any key.
+    """
+    if not curves:
+        return list(keys), []
+
+    index = _build_summary_key_index(keys)
+    selected = dict()
+    unknown_curves = []
+    for curve in curves:
+        matches = _match_summary_keys(index, curve)
+        if not matches:
+            unknown_curves.append(curve)
+        selected.update(dict.fromkeys(matches))
+    return list(selected), unknown_curves
+
+
+def load_summary_df(
+    filepath,
+    curves=None,
+    backend="ecl",
+    start=None,
+    end=None,
+    report_only=False,
+    resample=None,
+):
     """Load a summary from an Eclipse deck as a pandas dataframe.
 
     Args:
         filepath ([type]): [description]
-        curves (list): A list of curve keys to load.
+        curves (list): A list of curve keys or patterns to load e.g. `FOPR`,
+            `WOPR:*`, `FIP*:REG1`.
+        backend (str, optional): Defaults to "ecl"; "numpy" memory-maps the
+            unformatted summary files and reads only the requested vector columns
+            of each ministep. The ecl backend also loads the history of a restarted
+            run, the numpy backend reads only this run.
+        start (datetime/str, optional): Only load ministeps from this date
+        end (datetime/str, optional): Only load ministeps up to this date
+        report_only (bool, optional): Defaults to False; Only load the last ministep
+            of each report step. The numpy backend reads only the selected rows.
+        resample (str, optional): Defaults to None; Interpolate the loaded rows to
+            the dates of a pandas frequency e.g. "MS", "YS".
 
 
     """
-    _has_curves = get_summary_keys(filepath)
+    _check_backend(backend)
+    if backend == "numpy":
+        _has_curves = get_summary_keys(filepath, backend=backend)
+        curves, unknown_curves = _select_summary_keys(_has_curves, curves)
+        if unknown_curves:
+            raise ValueError(f"Summary does not contain curves: {unknown_curves}")
+        sum_df = _load_summary_numpy(
+            filepath, curves=curves, start=start, end=end, report_only=report_only
+        )
+        return _resample_summary(sum_df, resample) if resample else sum_df
 
-    if curves:
-        unknown_curves = [c for c in curves if c not in _has_curves]
-    else:
-        curves = _has_curves
-        unknown_curves = []
+    with open_EclSum(filepath) as esum:
+        _has_curves = list(esum.keys())
+        curves, unknown_curves = _select_summary_keys(_has_curves, curves)
+
+        if not unknown_curves:
+            sum_df = esum.pandas_frame(column_keys=curves).copy()
+            if report_only:
+                sum_df = sum_df.iloc[list(esum.report_index_list())]
 
     if unknown_curves:
         raise ValueError(f"Summary does not contain curves: {unknown_curves}")
 
-    with open_EclSum(filepath) as esum:
-        sum_df = esum.pandas_frame(column_keys=curves).copy()
+    if start is not None:
+        sum_df = sum_df[sum_df.index >= pd.Timestamp(start)]
+    if end is not None:
+        sum_df = sum_df[sum_df.index <= pd.Timestamp(end)]
+    return _resample_summary(sum_df, resample) if resample else sum_df
 
-    return sum_df
+
+def _resample_summary(sum_df, resample):
+    """Interpolate the summary vectors to regular dates
+
+    Args:
+        sum_df (pd.DataFrame): Summary vectors with a date index
+        resample (str): A pandas frequency e.g. "MS", "YS", "7D"
+
+    Returns:
+        pd.DataFrame: The vectors linearly interpolated in time to the dates of the
+            frequency between the first and last dates of the summary
+    """
+    if sum_df.empty:
+        return sum_df
+    dates = pd.date_range(sum_df.index[0], sum_df.index[-1], freq=resample)
+    # restarted runs can repeat a date, keep the last value
+    sum_df = sum_df[~sum_df.index.duplicated(keep="last")]
+    sum_df = sum_df.reindex(sum_df.index.union(dates)).interpolate(method="time")
+    return sum_df.loc[dates]
+
+
+def _load_deck_summary(filepath, curves=None, resample=None, backend="ecl"):
+    deck = get_ecl_deck(filepath)
+    if not deck["SUM"]:
+        raise ValueError(f"Cannot find the summary files of deck {filepath}")
+    return load_summary_df(
+        deck["SUM"][0], curves=curves, backend=backend, resample=resample
+    )
+
+
+def load_ensemble_summary(
+    paths, curves=None, workers=None, resample=None, backend="ecl"
+):
+    """Load the summaries of an ensemble of decks into one dataframe
+
+    Args:
+        paths (list/dict): A file of each realisation deck e.g. the DATA file, or a
+            dict of the realisation names and deck files. Realisations in a list
+            are numbered from 0.
+        curves (list, optional): Curve keys or patterns to load, see
+            `load_summary_df`. Defaults to None - all curves.
+        workers (int, optional): Defaults to None; Load the decks in a pool of this
+            many processes.
+        resample (str, optional): Defaults to None; Interpolate each realisation to
+            the dates of a pandas frequency e.g. "MS", so the dates are aligned.
+        backend (str, optional): Defaults to "ecl"; see `load_summary_df`
+
+    Returns:
+        pd.DataFrame: The curves indexed by (realisation, date), curves missing
+            from a realisation are NaN.
+    """
+    _check_backend(backend)
+    if not isinstance(paths, dict):
+        paths = dict(enumerate(paths))
+    realisations = list(paths)
+    args = (
+        [paths[real] for real in realisations],
+        [curves] * len(paths),
+        [resample] * len(paths),
+        [backend] * len(paths),
+    )
+
+    if workers is not None and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            frames = list(pool.map(_load_deck_summary, *args))
+    else:
+        frames = list(map(_load_deck_summary, *args))
+
+    return pd.concat(frames, keys=realisations, names=["realisation", "date"])
+
+
+def _summary_vector_type(key):
+    """The type of a summary vector e.g. field, well, group, misc"""
+    keyword = key.partition(":")[0]
+    if keyword in _SUMMARY_MISC_KEYWORDS:
+        return "misc"
+    return _SUMMARY_VECTOR_TYPES.get(keyword[:1], "misc")
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("export_summary requires pyarrow, install it with pip")
+    return pyarrow
+
+
+def _iter_summary_chunks(filepath, curves, chunksize, backend, resample, **options):
+    """Load a summary `chunksize` rows at a time"""
+    if backend == "numpy" and resample is None:
+        _has_curves = get_summary_keys(filepath, backend=backend)
+        curves, unknown_curves = _select_summary_keys(_has_curves, curves)
+        if unknown_curves:
+            raise ValueError(f"Summary does not contain curves: {unknown_curves}")
+        yield from _iter_summary_numpy(
+            filepath, curves=curves, chunksize=chunksize, **options
+        )
+        return
+
+    sum_df = load_summary_df(
+        filepath, curves=curves, backend=backend, resample=resample, **options
+    )
+    for i in range(0, max(sum_df.shape[0], 1), chunksize):
+        yield sum_df.iloc[i : i + chunksize]
+
+
+def export_summary(
+    filepath,
+    outpath,
+    curves=None,
+    format="parquet",
+    partition=False,
+    chunksize=10000,
+    backend="ecl",
+    start=None,
+    end=None,
+    report_only=False,
+    resample=None,
+):
+    """Export summary vectors to a Parquet or Arrow IPC file
+
+    Rows are written in row groups (record batches for Arrow) of `chunksize` rows as
+    they are read, with the numpy backend only one chunk is held in memory.
+    Requires `pyarrow`.
+
+    Args:
+        filepath (pathlike): The summary file
+        outpath (pathlike): The output file, or directory if `partition` is True
+        curves (list, optional): Curve keys or patterns, see `load_summary_df`.
+        format (str, optional): Defaults to "parquet"; or "arrow" for Arrow IPC
+        partition (bool, optional): Defaults to False; Write the vectors of each
+            type (field, group, well, ...) to `outpath/vector_type=<type>/`
+        chunksize (int, optional): Defaults to 10000; The rows per row group
+        backend, start, end, report_only, resample: See `load_summary_df`, the
+            vectors are resampled before they are written.
+
+    Returns:
+        list: The written files
+    """
+    _check_backend(backend)
+    if format not in SUMMARY_EXPORT_FORMATS:
+        raise ValueError(
+            f"format must be one of {SUMMARY_EXPORT_FORMATS}, got {format}"
+        )
+    pa = _import_pyarrow()
+
+    outpath = pathlib.Path(outpath)
+    chunks = _iter_summary_chunks(
+        filepath,
+        curves,
+        chunksize,
+        backend,
+        resample,
+        start=start,
+        end=end,
+        report_only=report_only,
+    )
+
+    groups = None
+    writers = dict()
+    try:
+        for chunk in chunks:
+            if groups is None:
+                if partition:
+                    groups = dict()
+                    for key in chunk.columns:
+                        groups.setdefault(_summary_vector_type(key), []).append(key)
+                else:
+                    groups = {None: list(chunk.columns)}
+
+            for group, keys in groups.items():
+                table = pa.Table.from_pandas(
+                    chunk[keys].rename_axis("date").reset_index(), preserve_index=False
+                )
+                if group not in writers:
+                    path = outpath
+                    if partition:
+                        path = outpath / f"vector_type={group}" / f"part-0.{format}"
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    if format == "parquet":
+                        writer = pa.parquet.ParquetWriter(path, table.schema)
+                    else:
+                        writer = pa.ipc.new_file(path, table.schema)
+                    writers[group] = (path, writer)
+                writers[group][1].write_table(table)
+    finally:
+        for _, writer in writers.values():
+            writer.close()
+
+    return [path for path, _ in writers.values()]
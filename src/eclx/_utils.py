@@ -1,11 +1,25 @@
+import os
+import re
 import importlib
+import collections
+import shutil
 import pathlib
-import multiprocessing as mp
+import tempfile
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+    FIRST_COMPLETED,
+)
 from more_itertools import chunked
 
+import numpy as np
+
 from ecl.eclfile import EclFile
 from ecl.ecl_util import EclFileEnum, EclUtil
 
+from ._session import session_cached
+
 
 def import_tqdm():
     jup = importlib.util.find_spec("jupyter")
@@ -38,6 +52,45 @@ def get_filetype(filepath):
     return EclUtil.get_file_type(str(filepath))
 
 
+_ECL_FILE_EXTENSIONS = {
+    "DATA": EclFileEnum.ECL_DATA_FILE,
+    "EGRID": EclFileEnum.ECL_EGRID_FILE,
+    "FEGRID": EclFileEnum.ECL_EGRID_FILE,
+    "GRID": EclFileEnum.ECL_GRID_FILE,
+    "FGRID": EclFileEnum.ECL_GRID_FILE,
+    "INIT": EclFileEnum.ECL_INIT_FILE,
+    "FINIT": EclFileEnum.ECL_INIT_FILE,
+    "UNRST": EclFileEnum.ECL_UNIFIED_RESTART_FILE,
+    "FUNRST": EclFileEnum.ECL_UNIFIED_RESTART_FILE,
+    "UNSMRY": EclFileEnum.ECL_UNIFIED_SUMMARY_FILE,
+    "FUNSMRY": EclFileEnum.ECL_UNIFIED_SUMMARY_FILE,
+    "SMSPEC": EclFileEnum.ECL_SUMMARY_HEADER_FILE,
+    "FSMSPEC": EclFileEnum.ECL_SUMMARY_HEADER_FILE,
+    "RFT": EclFileEnum.ECL_RFT_FILE,
+    "FRFT": EclFileEnum.ECL_RFT_FILE,
+}
+
+# report numbered files e.g. X0001, S0001, first letter unformatted then formatted
+_ECL_REPORT_EXTENSIONS = {
+    "X": EclFileEnum.ECL_RESTART_FILE,
+    "F": EclFileEnum.ECL_RESTART_FILE,
+    "S": EclFileEnum.ECL_SUMMARY_FILE,
+    "A": EclFileEnum.ECL_SUMMARY_FILE,
+}
+
+
+def _ecl_file_type(name):
+    """Get the type of an ecl file from its extension, the same as `get_filetype`"""
+    ext = os.path.splitext(name)[1][1:].upper()
+    try:
+        return _ECL_FILE_EXTENSIONS[ext]
+    except KeyError:
+        pass
+    if ext[:1] in _ECL_REPORT_EXTENSIONS and re.fullmatch(r"[+-]?\d*", ext[1:]):
+        return _ECL_REPORT_EXTENSIONS[ext[:1]]
+    return EclFileEnum.ECL_OTHER_FILE
+
+
 def get_ecl_deck_files(filepath):
     """Scan a folder based upon a DATA file to find all corresponding files."""
     filepath = pathlib.Path(filepath)
@@ -48,17 +101,28 @@ def get_ecl_deck_files(filepath):
 
     stem = filepath.stem
 
-    deck = {
-        deck_file: get_filetype(deck_file)
-        for deck_file in parent_path.iterdir()
-        if deck_file.stem == stem
-    }
+    with os.scandir(parent_path) as entries:
+        deck = {
+            parent_path / entry.name: _ecl_file_type(entry.name)
+            for entry in entries
+            if os.path.splitext(entry.name)[0] == stem and entry.is_file()
+        }
     return deck
 
 
 def get_ecl_deck(filepath):
-    """"""
-    files = get_ecl_deck_files(filepath)
+    """Get the files of an ecl deck by type, DATA, GRID, INIT, SUM and RST"""
+    # all the files of a deck share the cached result
+    deck_stem = pathlib.Path(filepath).with_suffix("")
+    return dict(session_cached("ecl_deck", deck_stem, lambda: _get_ecl_deck(filepath)))
+
+
+def _get_ecl_deck(filepath):
+    return _group_deck_files(get_ecl_deck_files(filepath))
+
+
+def _group_deck_files(files):
+    """Group the files of a deck {path: EclFileEnum} by DATA, GRID, INIT, SUM and RST"""
     found_files = {
         "DATA": (f for f, v in files.items() if v == EclFileEnum.ECL_DATA_FILE),
         "GRID": (
@@ -85,42 +149,131 @@ def get_ecl_deck(filepath):
     return {k: tuple(sorted(v)) for k, v in found_files.items()}
 
 
-def _mp_eclsub(handler, filepath):
-    efile = handler(str(filepath))
-    del efile
+def _scan_deck_folder(folder):
+    """Group the ecl files of a folder by deck in a single scandir pass
 
-
-def test_open_eclfile(handler, filepath):
-    """Safely test whether a handler can open a file.
+    Returns:
+        tuple: The {deck: {path: EclFileEnum}} files of the folder and its sub-folders
+    """
+    decks = dict()
+    folders = []
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    folders.append(entry.path)
+                    continue
+                file_type = _ecl_file_type(entry.name)
+                if file_type != EclFileEnum.ECL_OTHER_FILE:
+                    stem = os.path.splitext(entry.name)[0]
+                    path = pathlib.Path(entry.path)
+                    decks.setdefault(path.with_name(stem), dict())[path] = file_type
+    except PermissionError:
+        pass
+    return decks, folders
+
+
+def find_ecl_decks(root, recursive=True, workers=8):
+    """Find all the ecl decks in a folder
+
+    Each folder is listed once with `os.scandir` and the files are classified by
+    their extension, sub-folders are scanned concurrently.
 
     Args:
-        handler: An EclFile instance or derivative.
-        filepath: The file to test
+        root (pathlike): The folder to search
+        recursive (bool, optional): Defaults to True; Search the sub-folders
+        workers (int, optional): Defaults to 8; The number of folders to scan at once
 
     Returns:
-        subprocess results
+        dict: The DATA, GRID, INIT, SUM and RST files of each deck, keyed by the deck
+            path without an extension, in the format of `get_ecl_deck`.
+    """
+    root = pathlib.Path(root)
+    if not root.is_dir():
+        raise FileNotFoundError(f"Cannot find folder {root}")
+
+    decks = dict()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(_scan_deck_folder, root)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                folder_decks, folders = future.result()
+                decks.update(folder_decks)
+                if recursive:
+                    pending.update(pool.submit(_scan_deck_folder, f) for f in folders)
+
+    catalogue = {deck: _group_deck_files(decks[deck]) for deck in sorted(decks)}
+    return {
+        deck: files
+        for deck, files in catalogue.items()
+        if any(files.values())  # skip decks with only e.g. RFT or SMSPEC files
+    }
+
+
+def _format_lines(values, cols, fmt=" %3.12g", block_lines=100000):
+    """Format values as lines of `cols` values, a block of lines at a time
 
-    Raise:
-        ValueErorr: If file opening does not exit cleanly.
+    Whole blocks are formatted with one `%` operation, the default format renders
+    values the same as `"{:3.12g}".format`.
+
+    Args:
+        values (numpy.ndarray): The values
+        cols (int): Number of values per row
+        fmt (str, optional): The %-format of each value, including its separator
+        block_lines (int, optional): The number of lines to format at once
+
+    Yields:
+        str: Blocks of lines
     """
-    proc = mp.Process(
-        target=_mp_eclsub,
-        args=(
-            handler,
-            filepath,
-        ),
-    )
-    proc.start()
-    proc.join()
-    if proc.exitcode != 0:
-        raise ValueError(
-            f"The ECL file {filepath} was incompatible with the handler {handler}"
-        )
-    return proc
+    line = fmt * cols + "\n"
+    full = values.size - values.size % cols
+    step = cols * block_lines
+    for start in range(0, full, step):
+        block = values[start : min(start + step, full)]
+        yield (line * (block.size // cols)) % tuple(block.tolist())
+    if full < values.size:
+        remainder = values[full:]
+        yield (fmt * remainder.size + "\n") % tuple(remainder.tolist())
+
+
+def _ecl_repeat_items(values):
+    """Run-length encode values as ecl `N*value` items, single values are unchanged
+
+    Returns:
+        numpy.ndarray: The items as strings
+    """
+    values = np.asarray(values).reshape(-1)
+    if values.size == 0:
+        return np.empty(0, dtype=str)
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    counts = np.diff(np.r_[starts, values.size])
+    items = values[starts].astype(str)
+    repeats = np.char.add(np.char.add(counts.astype(str), "*"), items)
+    return np.where(counts > 1, repeats, items)
+
+
+# lines of output formatted by each write_petrel worker task
+_PETREL_BLOCK_LINES = 100000
+
+
+def _write_petrel_block(values, cols, path):
+    """Pool worker, format a block of values to a file and return its path"""
+    with open(path, "w") as f:
+        f.writelines(_format_lines(values, cols))
+    return path
+
+
+def _iter_petrel_blocks(data, props, step):
+    """The property, start and values of each block of `step` values, in file order"""
+    for prp in props:
+        values = data[prp].to_numpy()
+        for start in range(0, max(values.size, 1), step):
+            yield prp, start, values[start : start + step]
 
 
 def write_petrel(
-    df, filename, props=None, cols=8, summary_header="all", fliphand=False
+    df, filename, props=None, cols=8, summary_header="all", fliphand=False, workers=None
 ):
     """Writes out a Petrel compatable property file for loading from an eclx loaded
     property dataframe.
@@ -139,14 +292,17 @@ def write_petrel(
         fliphand (Optional:bool): False by default this will reverse the cell order
             in the J direction. E.g. convert left handed to right handed grids.
             Petrel requires right handed grids for natural import.
+        workers (Optional:int): Defaults to None; Format blocks of lines in a pool
+            of this many processes, the workers write to temporary files next to
+            `filename` that are copied into it in property order.
     """
     if props is None:
         props = df.columns
 
-    if summary_header == "all":
-        summary_props = df.columns
-    elif summary_header == "active":
+    if summary_header == "active":
         summary_props = list(df.columns) + ["active"]
+    else:
+        summary_props = df.columns
 
     data = df[summary_props]
     ijk_dims = _check_ijk_dim(df)
@@ -163,14 +319,15 @@ def write_petrel(
         else:
             outfile.write(f"-- Properties in file:\n")
         if summary_header in ["all", "active"]:
-            query = "active > 0"
+            summary = data.query("active > 0") if summary_header == "active" else data
+            # describe everything once, groups are sliced from the one table
+            stats = summary[list(props)].describe()
             for gprp in chunked(props, 5):
                 outfile.write("-- ")
-                if summary_header == "all":
-                    data_des = data[list(gprp)].describe().to_string()
-                elif summary_header == "active":
-                    data_des = data.query(query)[list(gprp)]
-                    data_des = data_des.describe().to_string()
+                if set(gprp).issubset(stats.columns):
+                    data_des = stats[list(gprp)].to_string()
+                else:
+                    data_des = summary[list(gprp)].describe().to_string()
                 data_des = data_des.replace("\n", "\n-- ")
                 outfile.write(data_des + "\n")
         else:
@@ -179,26 +336,54 @@ def write_petrel(
                 for prp in gprp:
                     outfile.write(prp + " ")
                 outfile.write("\n")
-        # line format
-        # TODO: Perhaps offer fmt options for numbers.
-        def line_formatter(n, fmt="3.12g"):
-            return "".join([" {%d:%s}" % (d, fmt) for d in range(0, n)])
-
-        fmt = line_formatter(cols)
 
         if fliphand and "j" in data.columns:
             data["j"] = 1 + data["j"].max() - data["j"]
             data = data.sort_values(["k", "j", "i"])
-        else:
+        elif "j" in data.columns:
             data["j"] = data["j"] + 1
 
         # write data to file
-        for prp in props:
-            outfile.write(f"{prp}\n")
-            try:
-                for group in chunked(data[prp], cols):
-                    outfile.write(fmt.format(*group) + "\n")
-            except IndexError:
-                remfmt = line_formatter(len(group))
-                outfile.write(remfmt.format(*group) + "\n")
-            outfile.write("/\n")
+        if workers is not None and workers > 1:
+            _write_petrel_parallel(outfile, data, props, cols, workers, filename)
+        else:
+            for prp in props:
+                outfile.write(f"{prp}\n")
+                outfile.writelines(_format_lines(data[prp].to_numpy(), cols))
+                outfile.write("/\n")
+
+
+def _write_petrel_parallel(outfile, data, props, cols, workers, filename):
+    """Format the properties in a process pool a block of lines at a time
+
+    Each worker writes its block to a temporary file next to the output, the blocks
+    are copied into the output in order. Only a few blocks are in flight so the
+    memory used is bounded by the block size, not the grid size.
+    """
+    step = cols * _PETREL_BLOCK_LINES
+    tmp_parent = pathlib.Path(filename).absolute().parent
+    with tempfile.TemporaryDirectory(
+        dir=tmp_parent, prefix=".eclx-petrel-"
+    ) as tmp_dir, ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+
+        def write_next():
+            prp, start, size, future = pending.popleft()
+            if start == 0:
+                outfile.write(f"{prp}\n")
+            path = future.result()
+            with open(path, "r") as block:
+                shutil.copyfileobj(block, outfile)
+            os.unlink(path)
+            if start + step >= size:
+                outfile.write("/\n")
+
+        blocks = _iter_petrel_blocks(data, props, step)
+        for n, (prp, start, values) in enumerate(blocks):
+            path = os.path.join(tmp_dir, f"{n}.txt")
+            future = pool.submit(_write_petrel_block, values, cols, path)
+            pending.append((prp, start, len(data), future))
+            if len(pending) > workers:
+                write_next()
+        while pending:
+            write_next()
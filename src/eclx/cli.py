@@ -11,17 +11,22 @@ from dataicer.plugins import (
 
 from . import (
     load_summary_df,
+    export_summary,
     get_ecl_deck,
     get_summary_keys,
     get_ecl_property_keys,
     get_restart_reports,
     EclDeck,
+    EclSession,
     __version__,
 )
+from ._store import ARRAY_STORE_FORMATS, export_ecl_arrays
+from ._sum import SUMMARY_BACKENDS, _select_summary_keys
 
 
 ELASTIC_INIT = ["PORV", "PORO", "NTG", "SATNUM"]
 ELASTIC_RST = ["PRESSURE", "SWAT", "SGAS", "RS"]
+ARRAY_STORE_SUFFIXES = {"zarr": ".zarr", "hdf5-chunked": ".h5"}
 
 
 @click.group()
@@ -36,17 +41,81 @@ def main():
 @click.option("-k", "--keys", help="Print keys in file.", is_flag=True, default=False)
 @click.option("-csv", help="Export to csv file.", nargs=1)
 @click.option("-hdf", help="Export to hdf file.", nargs=1)
-def summary(file, curves, keys, csv, hdf):
-    """Export the summary data as a table."""
-    deck = get_ecl_deck(file)
-
-    has_curves = get_summary_keys(deck["SUM"][0])
+@click.option("-parquet", help="Export to parquet file.", nargs=1)
+@click.option("-arrow", help="Export to arrow IPC file.", nargs=1)
+@click.option(
+    "--partition",
+    help="Split the parquet/arrow export into a folder per vector type.",
+    is_flag=True,
+    default=False,
+)
+@click.option("--start", help="Only export from this date e.g. 2020-01-01.")
+@click.option("--end", help="Only export up to this date e.g. 2025-01-01.")
+@click.option(
+    "--report-only",
+    help="Only export the report steps.",
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--resample", help="Interpolate to the dates of a pandas frequency e.g. MS, YS."
+)
+@click.option(
+    "--backend",
+    help="Summary reader, numpy streams unformatted files in chunks.",
+    type=click.Choice(SUMMARY_BACKENDS),
+    default="ecl",
+)
+def summary(
+    file,
+    curves,
+    keys,
+    csv,
+    hdf,
+    parquet,
+    arrow,
+    partition,
+    start,
+    end,
+    report_only,
+    resample,
+    backend,
+):
+    """Export the summary data as a table.
+
+    CURVES are summary keys or wildcard patterns e.g. FOPR 'WOPR:*' 'FIP*:REG1'.
+    """
+    options = dict(
+        start=start,
+        end=end,
+        report_only=report_only,
+        resample=resample,
+        backend=backend,
+    )
+
+    with EclSession():
+        deck = get_ecl_deck(file)
+
+        if keys:
+            has_curves = get_summary_keys(deck["SUM"][0], backend=backend)
+            if curves:
+                has_curves, _ = _select_summary_keys(has_curves, curves)
+            print(has_curves)
+            raise SystemExit
 
-    if keys:
-        print(has_curves)
-        raise SystemExit
+        for fmt, outpath in (("parquet", parquet), ("arrow", arrow)):
+            if outpath:
+                export_summary(
+                    deck["SUM"][0],
+                    outpath,
+                    curves=curves,
+                    format=fmt,
+                    partition=partition,
+                    **options,
+                )
 
-    sumdf = load_summary_df(deck["SUM"][0], curves=curves)
+        if csv or hdf or not (parquet or arrow):
+            sumdf = load_summary_df(deck["SUM"][0], curves=curves, **options)
 
     if csv:
         sumdf.to_csv(csv)
@@ -54,7 +123,7 @@ def summary(file, curves, keys, csv, hdf):
     if hdf:
         sumdf.to_hdf(hdf)
 
-    if not csv and not hdf:
+    if not csv and not hdf and not parquet and not arrow:
         print(sumdf)
 
 
@@ -130,6 +199,26 @@ def report(file):
     default=None,
     type=click.STRING,
 )
+@click.option(
+    "--format",
+    "export_format",
+    type=click.Choice(["dataicer"] + list(ARRAY_STORE_FORMATS)),
+    default="dataicer",
+    help="Export the EclDeck with dataicer, or write each keyword/report as a "
+    "chunked, compressed dataset of a zarr store or HDF5 file as it is loaded.",
+)
+@click.option(
+    "--append",
+    is_flag=True,
+    default=False,
+    help="Add new reports to an existing zarr/hdf5-chunked export.",
+)
+@click.option(
+    "--active-only",
+    is_flag=True,
+    default=False,
+    help="Write zarr/hdf5-chunked datasets for the active cells only.",
+)
 # @click.option(
 #     "--flip_hand",
 #     is_flag=True,
@@ -148,9 +237,18 @@ def simx(
     elastic,
     keys_init,
     keys_rst,
+    export_format,
+    append,
+    active_only,
     verbose,
 ):
-    """Export the grid and simulation results as"""
+    """Export the grid and simulation results as a dataicer folder, zarr store or
+    chunked HDF5 file.
+
+    The zarr and hdf5-chunked formats hold grid/ACTNUM, init/<key> and
+    rst/<report>/<key> datasets shaped (nk, nj, ni), or (nactive,) with
+    --active-only.
+    """
     deck = get_ecl_deck(file)
 
     if verbose:
@@ -168,6 +266,8 @@ def simx(
     file = pathlib.Path(file)
     if export_dir is None:
         export_dir = file.parent / file.stem
+        if export_format in ARRAY_STORE_SUFFIXES:
+            export_dir = export_dir.with_suffix(ARRAY_STORE_SUFFIXES[export_format])
     else:
         export_dir = pathlib.Path(export_dir)
 
@@ -198,7 +298,7 @@ def simx(
         keys_init += ELASTIC_INIT
     elif elastic:
         keys_init = ELASTIC_INIT
-    else:
+    elif keys_init is None:
         keys_init = get_ecl_property_keys(deck["INIT"][0])
 
     if keys_rst is not None:
@@ -209,7 +309,7 @@ def simx(
         keys_rst += ELASTIC_RST
     elif elastic:
         keys_rst = ELASTIC_RST
-    else:
+    elif keys_rst is None:
         keys_rst = get_ecl_property_keys(deck["RST"][0])
 
     if verbose:
@@ -218,6 +318,20 @@ def simx(
         click.secho(keys_init)
         click.secho(keys_rst)
 
+    if export_format != "dataicer":
+        export_ecl_arrays(
+            file,
+            export_dir,
+            format=export_format,
+            init_keys=keys_init,
+            rst_keys=keys_rst,
+            reports=list(time_steps),
+            active_only=active_only,
+            append=append,
+            silent=not verbose,
+        )
+        return
+
     sim.load_grid()
     sim.load_init(keys=keys_init)
     sim.load_rst(reports=list(time_steps), keys=keys_rst)
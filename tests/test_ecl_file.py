@@ -1,8 +1,16 @@
 import pytest
 
+import numpy as np
 import pandas as pd
 
-from eclx._ecl_file import open_EclFile, get_ecl_property_keys, load_ecl_property, get_ecl_deck
+from eclx._ecl_file import (
+    open_EclFile,
+    get_ecl_property_keys,
+    load_ecl_property,
+    expand_ecl_property,
+    get_ecl_file_reports,
+    get_ecl_deck,
+)
 
 from ecl.eclfile import EclFile
 
@@ -112,3 +120,27 @@ def test_load_ecl_proprty_rst_reportn(eclipse_runs_unified, rep):
     assert rst.shape == (75, 7)
     assert f"PRESSURE_{rep}" in rst.columns
     assert f"SWAT_{rep}" in rst.columns
+
+
+def test_load_ecl_proprty_active_only(eclipse_runs):
+    filepath = eclipse_runs["INIT"][0]
+    full = load_ecl_property(filepath, keys=["PORO", "SATNUM"])
+    init = load_ecl_property(filepath, keys=["PORO", "SATNUM"], active_only=True)
+    n_active = full["actnum"].sum()
+    assert init.shape == (n_active, 7)
+    assert (init["active"].values == np.arange(n_active)).all()
+    assert np.array_equal(init["PORO"].values, full.loc[init.index, "PORO"].values)
+
+
+def test_expand_ecl_property(eclipse_runs):
+    filepath = eclipse_runs["RST"][0]
+    full = load_ecl_property(filepath, keys=["SWAT", "PRESSURE"])
+    rst = load_ecl_property(filepath, keys=["SWAT", "PRESSURE"], active_only=True)
+    expanded = expand_ecl_property(rst, eclipse_runs["GRID"][0])
+    pd.testing.assert_frame_equal(expanded, full[expanded.columns])
+
+
+def test_get_ecl_file_reports(eclipse_runs):
+    filepath = eclipse_runs["RST"][0]
+    assert get_ecl_file_reports(filepath) == EclFile.file_report_list(str(filepath))
+    assert get_ecl_file_reports(eclipse_runs["INIT"][0]) == []
@@ -0,0 +1,178 @@
+import numpy as np
+import pytest
+
+import eclx
+from eclx import EclAsciiParser, parse_ecl_deck
+
+
+@pytest.mark.parametrize(
+    "filename", ["COMPLEX_PVT.inc", "ECL_KW.inc", "t1a/TUT1A.DATA"]
+)
+def test_scanner_parser(resources, filename):
+    earley = EclAsciiParser()
+    earley.parse(resources / filename)
+    scanner = EclAsciiParser("scanner")
+    scanner.parse(resources / filename)
+    assert scanner.tree is None
+    assert set(earley.get_keywords()) <= set(scanner.get_keywords())
+    for kw in ["PVTO", "PVTG", "SWOF", "SGOF", "DXV", "PORO", "EQUIL"]:
+        if kw in earley.data:
+            assert scanner[kw] == earley[kw]
+
+
+def test_scanner_parser_records(tmp_path):
+    filepath = tmp_path / "TEST.inc"
+    filepath.write_text(
+        "-- comment\n"
+        "TITLE\n"
+        "A1 title -- with a comment\n"
+        "DZ\n"
+        "2*1.0 -- dz\n"
+        "3.0 / ignored\n"
+        "WELSPECS\n"
+        "'PROD' 'G1' 1 1 1* 'OIL' /\n"
+        "/\n"
+        "FOPR\n"
+        "\n"
+        "WBHP\n"
+        "/\n"
+    )
+    p = EclAsciiParser("scanner")
+    p.parse(filepath)
+    assert p.data == {
+        "TITLE": [["A1", "title"]],
+        "DZ": [["2*1.0", "3.0"]],
+        "WELSPECS": [["'PROD'", "'G1'", "1", "1", "1*", "'OIL'"]],
+        "FOPR": [],
+        "WBHP": [],
+    }
+
+
+def test_scanner_parser_errors(tmp_path):
+    with pytest.raises(ValueError):
+        EclAsciiParser("lalr")
+    filepath = tmp_path / "TEST.inc"
+    filepath.write_text("1 2 3 /\n")
+    with pytest.raises(ValueError):
+        EclAsciiParser("scanner").parse(filepath)
+
+
+@pytest.mark.parametrize(
+    "filename", ["COMPLEX_PVT.inc", "ECL_KW.inc", "t1a/TUT1A.DATA"]
+)
+def test_iter_keywords(resources, filename):
+    scanner = EclAsciiParser("scanner")
+    scanner.parse(resources / filename)
+    keywords = dict(EclAsciiParser().iter_keywords(resources / filename))
+    assert keywords.keys() == scanner.data.keys()
+    for kw, value in keywords.items():
+        records = [value] if isinstance(value, np.ndarray) else value
+        for record, items in zip(records, scanner[kw]):
+            if isinstance(record, np.ndarray):
+                assert "*" in " ".join(items) or record.size == len(items)
+            else:
+                assert record == items
+
+
+def test_iter_keywords_arrays(tmp_path):
+    filepath = tmp_path / "TEST.inc"
+    filepath.write_text(
+        "PERMX\n"
+        "3*0.25 1.5 -- comment\n"
+        "2* 2*1E2\n"
+        "/\n"
+        "ACTNUM\n"
+        "2*1 0 /\n"
+        "SWOF\n"
+        "0.1 0.0 1.0 0.0\n"
+        "1.0 1.0 0.0 0.0 /\n"
+        "0.2 0.0 1.0 1* /\n"
+        "WCONPROD\n"
+        "'PROD' 'OPEN' 2* /\n"
+        "/\n"
+    )
+    p = EclAsciiParser()
+    keywords = dict(p.iter_keywords(filepath, types={"ACTNUM": "INTE"}))
+
+    permx = keywords["PERMX"]
+    assert permx.dtype == np.float64
+    assert permx.tolist() == [0.25, 0.25, 0.25, 1.5, None, None, 100.0, 100.0]
+    assert keywords["ACTNUM"].dtype == np.int64
+    assert keywords["ACTNUM"].tolist() == [1, 1, 0]
+    assert len(keywords["SWOF"]) == 2
+    assert keywords["SWOF"][1].mask.tolist() == [False, False, False, True]
+    assert keywords["WCONPROD"] == [["'PROD'", "'OPEN'", "2*"]]
+
+    keywords = dict(p.iter_keywords(filepath, types={"ACTNUM": "REAL"}))
+    assert keywords["ACTNUM"].dtype == np.float64
+
+
+@pytest.fixture
+def include_deck(tmp_path):
+    (tmp_path / "include").mkdir()
+    (tmp_path / "include" / "GRID.inc").write_text(
+        "DXV\n5*500 /\nINCLUDE\n'$INC/PORO.inc' /\n"
+    )
+    (tmp_path / "include" / "PORO.inc").write_text("PORO\n75*0.2 /\n")
+    (tmp_path / "DECK.DATA").write_text(
+        "RUNSPEC\nPATHS\n'INC' 'include' /\n/\nGRID\n"
+        "INCLUDE\n'include/GRID.inc' /\n"
+        "PROPS\nINCLUDE\n'$INC/PORO.inc' /\n"
+    )
+    return tmp_path / "DECK.DATA"
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_parse_ecl_deck(include_deck, monkeypatch, workers):
+    monkeypatch.setattr(
+        eclx._eclascii, "ECLX_INDEX_CACHE", include_deck.parent / "cache"
+    )
+    data = parse_ecl_deck(include_deck, workers=workers)
+    assert list(data) == ["RUNSPEC", "PATHS", "GRID", "DXV", "PORO", "PROPS"]
+    assert data["DXV"].tolist() == [500] * 5
+    assert [poro.tolist() for poro in data["PORO"]] == [[0.2] * 75] * 2
+    assert data["PATHS"] == [["'INC'", "'include'"]]
+    assert data["GRID"] == []
+    assert len(list((include_deck.parent / "cache" / "ascii").iterdir())) == 3
+
+    # cached files are not parsed again
+    monkeypatch.setattr(eclx._eclascii, "_parse_keyword_arrays", None)
+    cached = parse_ecl_deck(include_deck)
+    assert list(cached) == list(data)
+    assert cached["DXV"].dtype == data["DXV"].dtype
+    assert cached["DXV"].tolist() == data["DXV"].tolist()
+    assert [poro.tolist() for poro in cached["PORO"]] == [[0.2] * 75] * 2
+    assert cached["PATHS"] == data["PATHS"]
+
+
+def test_parse_ecl_deck_cache_arrays(tmp_path, monkeypatch):
+    monkeypatch.setattr(eclx._eclascii, "ECLX_INDEX_CACHE", tmp_path / "cache")
+    filepath = tmp_path / "DECK.DATA"
+    filepath.write_text(
+        "ACTNUM\n2*1 0 /\nSWOF\n0.1 0.0 1.0 0.0 /\n0.2 0.0 1.0 1* /\n"
+        "WCONPROD\n'PROD' 'OPEN' 2* /\n/\nEND\n"
+    )
+    data = parse_ecl_deck(filepath)
+    (cache_path,) = (tmp_path / "cache" / "ascii").iterdir()
+    with np.load(cache_path, allow_pickle=False) as cache:
+        assert "items" in cache.files
+
+    cached = parse_ecl_deck(filepath)
+    assert cached["ACTNUM"].dtype == data["ACTNUM"].dtype
+    assert cached["ACTNUM"].tolist() == [1, 1, 0]
+    assert cached["SWOF"][1].tolist() == [0.2, 0.0, 1.0, None]
+    assert cached["WCONPROD"] == [["'PROD'", "'OPEN'", "2*"]]
+    assert cached["END"] == []
+
+    # a corrupt cache file is a cache miss
+    cache_path.write_bytes(b"PK\x03\x04 not a cache")
+    assert parse_ecl_deck(filepath)["ACTNUM"].tolist() == [1, 1, 0]
+
+
+def test_parse_ecl_deck_errors(include_deck, tmp_path):
+    (tmp_path / "include" / "PORO.inc").write_text("INCLUDE\n'include/GRID.inc' /\n")
+    with pytest.raises(ValueError):
+        parse_ecl_deck(include_deck, use_cache=False)
+    (tmp_path / "include" / "GRID.inc").write_text("INCLUDE\n'MISSING.inc' /\n")
+    with pytest.raises(FileNotFoundError):
+        parse_ecl_deck(include_deck, use_cache=False)
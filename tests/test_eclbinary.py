@@ -0,0 +1,130 @@
+import os
+import shutil
+
+import pytest
+
+import numpy as np
+
+from eclx._eclbinary import (
+    EclBinaryFile,
+    open_EclBinaryFile,
+    load_keyword_index,
+    _keyword_index_paths,
+    _read_keyword_index,
+    write_ecl_binary,
+)
+
+from ecl import EclDataType
+from ecl.eclfile import EclFile, EclKW, FortIO
+
+
+@pytest.mark.parametrize("fext", ["GRID", "INIT", "RST"])
+def test_EclBinaryFile_matches_EclFile(eclipse_runs, fext):
+    filepath = eclipse_runs[fext][0]
+    with open_EclBinaryFile(filepath) as bfile:
+        efile = EclFile(str(filepath))
+        assert bfile.headers == [
+            (name, length, bfile.keywords[n].type)
+            for n, (name, length, _) in enumerate(efile.headers)
+        ]
+        for n, kw in enumerate(efile):
+            values = bfile.read_keyword(bfile.keywords[n])
+            assert len(values) == len(kw)
+            if len(kw) and bfile.keywords[n].type in ("INTE", "REAL", "DOUB"):
+                assert np.array_equal(values, kw.numpy_view())
+
+
+def test_EclBinaryFile_iget_named_kw(eclipse_runs):
+    with open_EclBinaryFile(eclipse_runs["GRID"][0]) as bfile:
+        assert "ZCORN" in bfile
+        assert bfile.num_named_kw("ZCORN") == 1
+        assert bfile["ZCORN"].shape == (600,)
+        assert bfile["ZCORN"].dtype == np.dtype(">f4")
+        with pytest.raises(KeyError):
+            bfile.iget_named_kw("ZCORN", 1)
+
+
+def test_EclBinaryFile_bad_file(eclipse_runs):
+    with pytest.raises(ValueError):
+        EclBinaryFile(eclipse_runs["DATA"][0])
+    with pytest.raises(FileNotFoundError):
+        with open_EclBinaryFile(eclipse_runs["DATA"][0].with_suffix(".NOFILE")):
+            pass
+
+
+def test_keyword_index_sidecar(eclipse_runs, tmp_path):
+    filepath = tmp_path / eclipse_runs["RST"][0].name
+    shutil.copy(eclipse_runs["RST"][0], filepath)
+    sidecar = _keyword_index_paths(filepath)[0]
+    assert not sidecar.exists()
+
+    keywords = load_keyword_index(filepath)
+    assert sidecar.exists()
+    assert _read_keyword_index(filepath) == keywords
+    with open_EclBinaryFile(filepath, use_index=False) as bfile:
+        assert bfile.keywords == keywords
+
+    # the index is rebuilt when the file changes
+    os.utime(filepath, ns=(0, 0))
+    assert _read_keyword_index(filepath) is None
+    assert load_keyword_index(filepath) == keywords
+    assert _read_keyword_index(filepath) == keywords
+
+
+def test_EclBinaryFile_reports(eclipse_runs_unified):
+    with open_EclBinaryFile(eclipse_runs_unified["RST"][0]) as bfile:
+        assert bfile.reports == list(range(11))
+    with open_EclBinaryFile(eclipse_runs_unified["INIT"][0]) as bfile:
+        assert bfile.reports == []
+
+
+@pytest.mark.parametrize(
+    "ecl_type", [EclDataType.ECL_FLOAT, EclDataType.ECL_DOUBLE, EclDataType.ECL_INT]
+)
+def test_EclBinaryFile_read_keyword_items(tmp_path, ecl_type):
+    filepath = tmp_path / "ITEMS.INIT"
+    fortio = FortIO(str(filepath), FortIO.WRITE_MODE)
+    for n in range(3):
+        kw = EclKW("PARAMS", 2500, ecl_type)
+        kw.numpy_view()[:] = np.arange(2500) + n * 10000
+        kw.fwrite(fortio)
+    fortio.close()
+
+    items = [0, 5, 999, 1000, 2499]
+    with open_EclBinaryFile(filepath, use_index=False) as bfile:
+        values = bfile.read_keyword_items(bfile.keywords, items)
+        assert values.shape == (3, 5)
+        for n, kw in enumerate(bfile.keywords):
+            assert np.array_equal(values[n], bfile.read_keyword(kw)[items])
+        with pytest.raises(IndexError):
+            bfile.read_keyword_items(bfile.keywords, [2500])
+
+
+def test_write_ecl_binary(tmp_path):
+    keywords = [
+        ("INTS", np.arange(2500, dtype=np.int32)),
+        ("REALS", np.linspace(0, 1, 1000, dtype=np.float32)),
+        ("DOUBS", np.random.default_rng(0).random(1001)),
+        ("LOGIS", np.array([True, False, True])),
+        ("NAMES", np.array(["PROD", "INJ"] * 60)),
+        ("LONG", np.array(["A" * 20, "B"]), "C020"),
+        ("ENDGRID", np.zeros(0, dtype=np.int32)),
+    ]
+    filepath = write_ecl_binary(tmp_path / "TEST.INIT", keywords)
+
+    with open_EclBinaryFile(filepath, use_index=False) as bfile:
+        assert bfile.keys() == [kw[0] for kw in keywords]
+        types = [kw.type for kw in bfile.keywords]
+        assert types == ["INTE", "REAL", "DOUB", "LOGI", "CHAR", "C020", "INTE"]
+        for name, values, *_ in keywords:
+            read = bfile[name]
+            if read.dtype.kind == "S":
+                read = np.char.strip(read.astype(str))
+            assert np.array_equal(read, values)
+
+    efile = EclFile(str(filepath))
+    assert np.array_equal(efile["DOUBS"][0].numpy_copy(), keywords[2][1])
+    assert list(efile["LOGIS"][0]) == [True, False, True]
+
+    with pytest.raises(ValueError):
+        write_ecl_binary(tmp_path / "BAD.INIT", [("TOOLONGNAME", np.zeros(1))])
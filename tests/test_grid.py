@@ -1,6 +1,11 @@
 import pytest
+import numpy as np
 
 from eclx._grid import (
+    EclGridGeometry,
+    EclGridSurfaces,
+    get_sim_surface,
+    load_ecl_geometry,
     load_ecl_grid,
     load_ecl_grid_index,
     _corner_names,
@@ -8,6 +13,8 @@ from eclx._grid import (
     open_EclGrid,
 )
 
+from ecl import EclDataType
+from ecl.eclfile import EclFile, EclKW, FortIO
 from ecl.grid import EclGrid
 
 
@@ -51,3 +58,150 @@ def test_load_ecl_grid_index(eclipse_runs):
 def test_load_ecl_grid(eclipse_runs):
     result = load_ecl_grid(eclipse_runs["GRID"][0])
     assert result.shape == (75, 28)
+
+
+def test_load_ecl_geometry(eclipse_runs):
+    filepath = eclipse_runs["GRID"][0]
+    geom = load_ecl_geometry(filepath)
+    assert isinstance(geom, EclGridGeometry)
+    assert geom.shape == (5, 5, 3)
+    assert geom.corners().shape == (75, 8, 3)
+    assert geom.corners([0, 74]).shape == (2, 8, 3)
+
+
+def test_geometry_corners_match_ecl(eclipse_runs):
+    filepath = eclipse_runs["GRID"][0]
+    geom = load_ecl_geometry(filepath)
+    with open_EclGrid(filepath) as egrid:
+        index = egrid.export_index()
+        expected = egrid.export_corners(index)
+    assert np.allclose(geom.corners().reshape(-1, 24), expected)
+    assert np.array_equal(geom.active_index, index["active"].values)
+
+
+def test_geometry_mapaxes_match_ecl(eclipse_runs, tmp_path):
+    # write a copy of the grid with a rotated MAPAXES
+    filepath = tmp_path / "MAPAXES.EGRID"
+    fortio = FortIO(str(filepath), FortIO.WRITE_MODE)
+    for kw in EclFile(str(eclipse_runs["GRID"][0])):
+        if kw.get_name() == "GRIDHEAD":
+            mapaxes = EclKW("MAPAXES", 6, EclDataType.ECL_FLOAT)
+            for n, v in enumerate((1000.0, 2100.0, 1000.0, 2000.0, 1100.0, 2010.0)):
+                mapaxes[n] = v
+            mapaxes.fwrite(fortio)
+        kw.fwrite(fortio)
+    fortio.close()
+
+    with open_EclGrid(filepath) as egrid:
+        expected = egrid.export_corners(egrid.export_index())
+    for backend in ("ecl", "numpy"):
+        geom = load_ecl_geometry(filepath, backend=backend)
+        assert geom.mapaxes is not None
+        assert np.allclose(geom.corners().reshape(-1, 24), expected)
+
+
+def test_geometry_to_dataframe(eclipse_runs):
+    filepath = eclipse_runs["GRID"][0]
+    geom = load_ecl_geometry(filepath)
+    result = geom.to_dataframe()
+    assert result.shape == (75, 28)
+    assert list(result.columns[4:]) == _corner_names()
+    assert geom.to_dataframe([1, 2]).index.tolist() == [1, 2]
+
+
+def test_geometry_centers(eclipse_runs):
+    filepath = eclipse_runs["GRID"][0]
+    geom = load_ecl_geometry(filepath)
+    centers = geom.centers()
+    assert centers.shape == (75, 3)
+    assert np.allclose(centers, geom.corners().mean(axis=1))
+    assert np.allclose(geom.centers([3, 7]), centers[[3, 7]])
+
+
+def test_geometry_index_dataframe(eclipse_runs):
+    filepath = eclipse_runs["GRID"][0]
+    result = load_ecl_geometry(filepath).index_dataframe()
+    expected = load_ecl_grid_index(filepath)
+    assert np.array_equal(result.values, expected.values)
+    assert list(result.columns) == list(expected.columns)
+
+
+@pytest.mark.parametrize("face", ["top", "base"])
+def test_geometry_surfaces_match_get_sim_surface(eclipse_runs, face):
+    filepath = eclipse_runs["GRID"][0]
+    surfaces = load_ecl_geometry(filepath).surfaces(active_only=False)
+    assert isinstance(surfaces, EclGridSurfaces)
+    assert surfaces.shape == (6, 6)
+    xyzcorn = load_ecl_grid(filepath)
+    for k in range(3):
+        x, y, z = surfaces.get(k, face)
+        assert not z.mask.any()
+        nodes = np.unique(np.c_[x.ravel(), y.ravel(), z.ravel()], axis=0)
+        assert np.array_equal(nodes, get_sim_surface(xyzcorn, k, face=face))
+
+
+def test_geometry_surfaces_mask(eclipse_runs):
+    filepath = eclipse_runs["GRID"][0]
+    geom = load_ecl_geometry(filepath)
+    surfaces = geom.surfaces()
+    for k in range(3):
+        for face in ("top", "base"):
+            _, _, z = surfaces.get(k, face)
+            assert z.mask.any() == (geom.actnum.reshape(3, -1)[k] == 0).any()
+    with pytest.raises(ValueError):
+        surfaces.get(3)
+
+
+def test_numpy_backend_grid_dims(eclipse_runs):
+    filepath = eclipse_runs["GRID"][0]
+    assert get_ecl_grid_dims(filepath, backend="numpy") == (5, 5, 3)
+    with pytest.raises(ValueError):
+        get_ecl_grid_dims(filepath, backend="cpp")
+
+
+def test_numpy_backend_grid_index(eclipse_runs):
+    filepath = eclipse_runs["GRID"][0]
+    result = load_ecl_grid_index(filepath, backend="numpy")
+    expected = load_ecl_grid_index(filepath)
+    assert np.array_equal(result.values, expected.values)
+    assert list(result.columns) == list(expected.columns)
+
+
+def test_numpy_backend_grid(eclipse_runs):
+    filepath = eclipse_runs["GRID"][0]
+    result = load_ecl_grid(filepath, backend="numpy")
+    expected = load_ecl_grid(filepath)
+    assert np.allclose(result.values, expected.values)
+    assert list(result.columns) == list(expected.columns)
+
+
+def test_numpy_backend_bad_file(eclipse_runs):
+    with pytest.raises(ValueError):
+        load_ecl_geometry(eclipse_runs["INIT"][0], backend="numpy")
+
+
+@pytest.mark.parametrize("backend", ["ecl", "numpy"])
+def test_EclGridGeometry_to_egrid(eclipse_runs, tmp_path, backend):
+    geometry = load_ecl_geometry(eclipse_runs["GRID"][0], backend=backend)
+    filepath = geometry.to_egrid(tmp_path / "OUT.EGRID", units="FEET")
+
+    egrid = EclGrid(str(filepath))
+    assert egrid.getDims()[:3] == geometry.shape
+    assert egrid.getNumActive() == geometry.actnum.sum()
+
+    written = load_ecl_geometry(filepath, backend="numpy")
+    assert np.array_equal(written.coord, geometry.coord)
+    assert np.array_equal(written.zcorn, geometry.zcorn)
+    assert np.array_equal(written.actnum, geometry.actnum)
+    assert np.allclose(written.corners(), geometry.corners())
+
+
+def test_EclGridGeometry_to_grdecl(eclipse_runs, tmp_path):
+    geometry = load_ecl_geometry(eclipse_runs["GRID"][0], backend="numpy")
+    filepath = geometry.to_grdecl(tmp_path / "OUT.GRDECL", units="FEET", block_lines=7)
+
+    egrid = EclGrid.loadFromGrdecl(str(filepath))
+    assert egrid.getDims()[:3] == geometry.shape
+    assert egrid.getNumActive() == geometry.actnum.sum()
+    assert np.array_equal(egrid.export_zcorn().numpy_copy(), geometry.zcorn.ravel())
+    assert np.array_equal(egrid.export_coord().numpy_copy(), geometry.coord.ravel())
@@ -1,9 +1,17 @@
+import shutil
+
 import pytest
 
+import numpy as np
 import pandas as pd
+from ecl.eclfile import EclFile, EclInitFile
+from ecl.grid import EclGrid
 
+from eclx import EclDeck
 from eclx._init import (
     load_init_intehead,
+    load_init_headers,
+    write_ecl_init,
 )
 
 
@@ -14,3 +22,75 @@ def test_load_init_intehead(eclipse_runs):
     assert isinstance(intehead, dict)
     for var in ("NI", "NJ", "NK"):
         assert var in intehead
+
+
+def test_EclDeck_write_init(eclipse_runs, tmp_path):
+    deck = EclDeck(silent=True)
+    deck.load_grid(eclipse_runs["GRID"][0], corners=False)
+    deck.load_init(eclipse_runs["INIT"][0])
+    deck.data["PORO"] *= 0.5
+    deck.write_egrid(tmp_path / "OUT.EGRID")
+    deck.write_init(tmp_path / "OUT.INIT")
+    deck.write_grdecl(tmp_path / "OUT.GRDECL")
+    assert "GRIDUNIT\n'FEET' ' ' /" in (tmp_path / "OUT.GRDECL").read_text()
+
+    written = EclDeck(silent=True)
+    written.load_grid(tmp_path / "OUT.EGRID", corners=False)
+    written.load_init(tmp_path / "OUT.INIT")
+    assert written.init_intehead == deck.init_intehead
+    pd.testing.assert_frame_equal(written.data, deck.data)
+
+    deck.write_init(tmp_path / "PORO.INIT", keys="PORO")
+    assert load_init_intehead(tmp_path / "PORO.INIT") == deck.init_intehead
+
+
+def test_EclDeck_write_egrid_onto_source(eclipse_runs, tmp_path):
+    filepath = tmp_path / "GRID.EGRID"
+    shutil.copy(eclipse_runs["GRID"][0], filepath)
+    deck = EclDeck(silent=True)
+    deck.load_grid(filepath, corners=False, backend="numpy")
+    zcorn = deck.geometry.zcorn.copy()
+
+    deck.write_egrid(filepath)
+    assert np.array_equal(deck.geometry.zcorn, zcorn)
+    assert not list(tmp_path.glob("*.tmp"))
+
+    written = EclDeck(silent=True)
+    written.load_grid(filepath, corners=False, backend="numpy")
+    assert np.array_equal(written.geometry.zcorn, zcorn)
+
+
+def test_EclDeck_write_init_headers(eclipse_runs, tmp_path):
+    deck = EclDeck(silent=True)
+    deck.load_grid(eclipse_runs["GRID"][0], corners=False)
+    deck.load_init(eclipse_runs["INIT"][0])
+    deck.write_egrid(tmp_path / "OUT.EGRID")
+    deck.write_init(tmp_path / "OUT.INIT", keys="PORO")
+
+    source = EclFile(str(eclipse_runs["INIT"][0]))
+    written = EclFile(str(tmp_path / "OUT.INIT"))
+    for name in ("INTEHEAD", "LOGIHEAD", "DOUBHEAD"):
+        assert list(written.iget_named_kw(name, 0)) == list(
+            source.iget_named_kw(name, 0)
+        )
+    grid = EclGrid(str(tmp_path / "OUT.EGRID"))
+    init = EclInitFile(grid, str(tmp_path / "OUT.INIT"))
+    assert len(init.iget_named_kw("PORO", 0)) == grid.getNumActive()
+
+
+def test_write_ecl_init_default_headers(eclipse_runs, tmp_path):
+    deck = EclDeck(silent=True)
+    deck.load_grid(eclipse_runs["GRID"][0], corners=False)
+    deck.load_init(eclipse_runs["INIT"][0], keys="PORO")
+    filepath = write_ecl_init(
+        tmp_path / "OUT.INIT", deck.data, (deck.nx, deck.ny, deck.nz), ["PORO"]
+    )
+
+    headers = load_init_headers(filepath)
+    assert [len(headers[name]) for name in headers] == [411, 121, 229]
+    intehead = load_init_intehead(filepath)
+    assert intehead["UNITS"] == 1
+    assert intehead["IPROG"] == 100
+    assert (intehead["IDAY"], intehead["IMON"], intehead["IYEAR"]) == (1, 1, 1970)
+    assert intehead["NACTIV"] == deck.init_intehead["NACTIV"]
+    assert not any(EclFile(str(filepath)).iget_named_kw("LOGIHEAD", 0))
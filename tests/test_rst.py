@@ -1,13 +1,19 @@
 import pytest
 
+import numpy as np
 import pandas as pd
 
+from eclx._ecl_file import load_ecl_property
+from ecl.eclfile import EclFile
 from eclx._rst import (
+    EclReportStore,
+    load_ecl_rst_store,
     is_restart_file,
     is_restart_unified,
     _get_restart_reports_unified,
     get_restart_reports,
     load_ecl_rst,
+    iter_ecl_rst,
 )
 
 
@@ -42,3 +48,77 @@ def test_load_ecl_rst(eclipse_runs):
     filepath = eclipse_runs["RST"][0]
     rst_df = load_ecl_rst(filepath)
     assert isinstance(rst_df, pd.DataFrame)
+
+
+def test_load_ecl_rst_active_only(eclipse_runs):
+    filepath = eclipse_runs["RST"][0]
+    rst_df = load_ecl_rst(filepath, reports=[0, 1], keys="SWAT", active_only=True)
+    assert (rst_df["actnum"] > 0).all()
+    assert list(rst_df.columns[5:]) == ["SWAT_0", "SWAT_1"]
+
+
+def test_load_ecl_rst_store(eclipse_runs):
+    filepath = eclipse_runs["RST"][0]
+    store = load_ecl_rst_store(filepath, reports=[0, 5, 10], keys=["SWAT", "PRESSURE"])
+    assert isinstance(store, EclReportStore)
+    assert store.shape == (75, 2, 3)
+    rst_df = store.to_dataframe()
+    assert rst_df.shape == (75, 11)
+    report = get_restart_reports(filepath).set_index("report").loc[5]
+    expected = load_ecl_property(
+        report["file"], keys="SWAT", report_index=report["file_index"]
+    )
+    assert np.array_equal(rst_df["SWAT_5"].values, expected["SWAT_5"].values)
+
+
+def test_EclReportStore_to_xarray(eclipse_runs):
+    filepath = eclipse_runs["RST"][0]
+    store = load_ecl_rst_store(filepath, reports=[0, 1], keys="SWAT", active_only=True)
+    ds = store.to_xarray()
+    assert ds["SWAT"].dims == ("report", "cell")
+    assert ds["SWAT"].shape == (2, store.index.shape[0])
+    assert list(ds["report"].values) == [0, 1]
+
+
+@pytest.mark.parametrize("active_only", [False, True])
+def test_load_ecl_rst_workers(eclipse_runs, active_only):
+    filepath = eclipse_runs["RST"][0]
+    serial = load_ecl_rst(filepath, active_only=active_only)
+    parallel = load_ecl_rst(filepath, active_only=active_only, workers=2)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_iter_ecl_rst(eclipse_runs, prefetch):
+    filepath = eclipse_runs["RST"][0]
+    rst_df = load_ecl_rst(filepath, keys=["SWAT", "PRESSURE"])
+    reports = get_restart_reports(filepath)
+    n = 0
+    for report, values in iter_ecl_rst(
+        filepath, keys=["SWAT", "PRESSURE"], prefetch=prefetch
+    ):
+        assert report["report"] == reports["report"].iloc[n]
+        assert report["date"] == reports["date"].iloc[n]
+        for key, value in values.items():
+            assert np.array_equal(value, rst_df[f"{key}_{report['report']}"].values)
+        n += 1
+    assert n == reports.shape[0]
+
+
+def test_iter_ecl_rst_active_only(eclipse_runs):
+    filepath = eclipse_runs["RST"][0]
+    rst_df = load_ecl_rst(filepath, reports=[0, 1], keys="SWAT", active_only=True)
+    for report, values in iter_ecl_rst(
+        filepath, reports=[0, 1], keys="SWAT", active_only=True
+    ):
+        assert np.array_equal(values["SWAT"], rst_df[f"SWAT_{report['report']}"].values)
+
+
+def test_get_restart_reports_dates(eclipse_runs):
+    reports = get_restart_reports(eclipse_runs["RST"][0])
+    for filepath, file_reports in reports.groupby("file"):
+        edates = EclFile(filepath).dates
+        assert file_reports["date"].to_list() == [
+            d.strftime("%Y-%m-%d") for d in edates
+        ]
+        assert file_reports["report"].to_list() == EclFile.file_report_list(filepath)
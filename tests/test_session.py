@@ -0,0 +1,97 @@
+import pickle
+import shutil
+
+import pytest
+
+import pandas as pd
+
+from eclx import EclSession, EclDeck, load_ecl_rst
+from eclx._session import get_active_session, session_cached
+
+
+def test_EclSession_lru():
+    opened = []
+
+    def opener(name):
+        opened.append(name)
+        return name
+
+    with EclSession(maxsize=2) as session:
+        assert get_active_session() is session
+        assert session_cached("kind", "a", lambda: opener("a")) == "a"
+        assert session_cached("kind", "b", lambda: opener("b")) == "b"
+        assert session_cached("kind", "a", lambda: opener("a")) == "a"
+        assert session_cached("kind", "c", lambda: opener("c")) == "c"
+        assert len(session) == 2
+        # b was the least recently used
+        assert session.key("kind", "b") not in session
+        assert session.key("kind", "a") in session
+    assert opened == ["a", "b", "c"]
+    assert len(session) == 0
+    assert get_active_session() is None
+
+    with pytest.raises(ValueError):
+        EclSession(maxsize=0)
+
+
+def test_session_cached_without_session():
+    opened = []
+    session_cached("kind", "a", lambda: opened.append("a"))
+    session_cached("kind", "a", lambda: opened.append("a"))
+    assert opened == ["a", "a"]
+
+
+def test_EclSession_load_ecl_rst(eclipse_runs):
+    filepath = eclipse_runs["RST"][0]
+    expected = load_ecl_rst(filepath, keys="SWAT")
+    with EclSession() as session:
+        result = load_ecl_rst(filepath, keys="SWAT")
+        assert session.key("ecl_deck", filepath.with_suffix("")) in session
+        assert len(session) > 0
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_EclSession_pickle():
+    deck = EclDeck(session=EclSession(maxsize=4))
+    session = pickle.loads(pickle.dumps(deck.session))
+    assert session.maxsize == 4
+    assert len(session) == 0
+
+
+def test_EclSession_key_file_changed(tmp_path):
+    filepath = tmp_path / "A.INIT"
+    filepath.write_bytes(b"a")
+    key = EclSession.key("kind", filepath)
+    filepath.write_bytes(b"ab")
+    assert EclSession.key("kind", filepath) != key
+
+
+def test_EclDeck_set_rst_new_reports(resources, tmp_path):
+    source = resources / "t1an"
+    for filepath in source.glob("TUT1AN.*"):
+        if filepath.suffix[:2] != ".X" or int(filepath.suffix[2:]) < 5:
+            shutil.copy(filepath, tmp_path)
+
+    for session in (None, EclSession()):
+        deck = EclDeck(silent=True, session=session)
+        deck.set_rst(tmp_path / "TUT1AN.X0000")
+        reports = deck.reports
+        for filepath in source.glob("TUT1AN.X00*"):
+            shutil.copy(filepath, tmp_path)
+        deck.set_rst(tmp_path / "TUT1AN.X0000")
+        assert len(deck.reports) > len(reports)
+        for filepath in tmp_path.glob("TUT1AN.X00*"):
+            if int(filepath.suffix[2:]) >= 5:
+                filepath.unlink()
+
+
+def test_EclDeck_releases_handles(eclipse_runs):
+    deck = EclDeck(silent=True)
+    deck.load_grid(eclipse_runs["GRID"][0], corners=False)
+    deck.load_init(eclipse_runs["INIT"][0])
+    assert deck.session is None
+    assert get_active_session() is None
+
+    with EclSession() as session:
+        deck.load_grid(eclipse_runs["GRID"][0], corners=False)
+    assert len(session) == 0
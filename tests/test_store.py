@@ -0,0 +1,102 @@
+import pytest
+
+import numpy as np
+
+from eclx import load_ecl_property, load_ecl_rst, get_restart_reports
+from eclx import EclGridGeometry, load_ecl_geometry
+from eclx._store import export_ecl_arrays, _store_chunks
+
+
+def _read_store(path, format):
+    if format == "zarr":
+        zarr = pytest.importorskip("zarr")
+        root = zarr.open_group(str(path), mode="r")
+        return root, dict(root.attrs)
+    h5py = pytest.importorskip("h5py")
+    root = h5py.File(path, "r")
+    attrs = {k: getattr(v, "tolist", lambda: v)() for k, v in root.attrs.items()}
+    return root, attrs
+
+
+@pytest.mark.parametrize("format", ["zarr", "hdf5-chunked"])
+def test_export_ecl_arrays(eclipse_runs, tmp_path, format):
+    pytest.importorskip("zarr" if format == "zarr" else "h5py")
+    outpath = tmp_path / "store"
+    deck = eclipse_runs["DATA"][0]
+    export_ecl_arrays(deck, outpath, format=format, reports=[0, 1])
+    export_ecl_arrays(deck, outpath, format=format, reports=[1, 2], append=True)
+
+    root, attrs = _read_store(outpath, format)
+    ni, nj, nk = attrs["shape"]
+    assert attrs["reports"] == [0, 1, 2]
+    assert len(attrs["dates"]) == 3
+    assert sorted(root["rst"]) == ["0", "1", "2"]
+
+    init = load_ecl_property(eclipse_runs["INIT"][0], keys=["PORO", "FIPNUM"])
+    for key in ["PORO", "FIPNUM"]:
+        values = np.asarray(root[f"init/{key}"])
+        assert values.shape == (nk, nj, ni)
+        assert np.array_equal(values.ravel(), init[key].values)
+
+    rst = load_ecl_rst(eclipse_runs["RST"][0], reports=[2], keys=["PRESSURE"])
+    pressure = np.asarray(root["rst/2/PRESSURE"])
+    assert np.array_equal(pressure.ravel(), rst["PRESSURE_2"].values)
+    assert np.array_equal(np.asarray(root["grid/ACTNUM"]).ravel(), init["actnum"])
+
+
+def test_export_ecl_arrays_active_only(eclipse_runs, tmp_path):
+    pytest.importorskip("h5py")
+    outpath = tmp_path / "store.h5"
+    export_ecl_arrays(
+        eclipse_runs["DATA"][0],
+        outpath,
+        format="hdf5-chunked",
+        init_keys=["PORO"],
+        rst_keys=["SWAT"],
+        reports=1,
+        active_only=True,
+    )
+    root, attrs = _read_store(outpath, "hdf5-chunked")
+    assert list(root["init"]) == ["PORO"]
+    assert list(root["rst/1"]) == ["SWAT"]
+    assert root["rst/1/SWAT"].shape == (attrs["nactive"],)
+    root.close()
+
+    with pytest.raises(ValueError):
+        export_ecl_arrays(
+            eclipse_runs["DATA"][0], outpath, format="hdf5-chunked", append=True
+        )
+    with pytest.raises(ValueError):
+        export_ecl_arrays(eclipse_runs["DATA"][0], outpath, format="netcdf")
+
+
+@pytest.mark.parametrize("format", ["zarr", "hdf5-chunked"])
+def test_export_ecl_arrays_append_other_grid(eclipse_runs, tmp_path, format):
+    pytest.importorskip("zarr" if format == "zarr" else "h5py")
+    outpath = tmp_path / "store"
+    export_ecl_arrays(eclipse_runs["DATA"][0], outpath, format=format, reports=0)
+
+    geometry = load_ecl_geometry(eclipse_runs["GRID"][0], backend="numpy")
+    nx, ny, nz = geometry.shape
+    actnum = geometry.actnum.copy()
+    actnum[0] = 0
+    EclGridGeometry(nx, ny, nz, geometry.coord, geometry.zcorn, actnum).to_egrid(
+        tmp_path / "INACTIVE.EGRID"
+    )
+    EclGridGeometry(
+        nx, ny, nz - 1, geometry.coord, geometry.zcorn[:-1], geometry.actnum[nx * ny :]
+    ).to_egrid(tmp_path / "LAYERS.EGRID")
+
+    for deck, name in (("INACTIVE", "nactive"), ("LAYERS", "shape")):
+        with pytest.raises(ValueError, match=name):
+            export_ecl_arrays(
+                tmp_path / f"{deck}.EGRID", outpath, format=format, append=True
+            )
+    root, attrs = _read_store(outpath, format)
+    assert attrs["reports"] == [0]
+
+
+def test_store_chunks():
+    assert _store_chunks((10, 20, 30), 1200) == (2, 20, 30)
+    assert _store_chunks((10, 20, 30), 10) == (1, 20, 30)
+    assert _store_chunks((100,), 1000) == (100,)
@@ -1,6 +1,22 @@
+import shutil
+import pathlib
+
 import pytest
 
-from eclx import open_EclSum, get_summary_keys, load_summary_df
+import numpy as np
+import pandas as pd
+
+import eclx
+from eclx import (
+    open_EclSum,
+    get_summary_keys,
+    load_summary_df,
+    load_summary_index,
+    load_ensemble_summary,
+    export_summary,
+)
+from eclx._eclbinary import EclBinaryFile, native_array, write_ecl_binary
+from eclx._sum import check_summary_files, _select_summary_keys
 
 from ecl.summary import EclSum
 
@@ -22,3 +38,184 @@ def test_open_EclSum(eclipse_runs):
 #     with pytest.raises(ValueError):
 #         with open_EclSum(not_a_sum_file) as sf:
 #             pass
+
+
+def test_check_summary_files(eclipse_runs):
+    check_summary_files(eclipse_runs["SUM"][0])
+
+
+def test_check_summary_files_err(eclipse_runs, tmp_path):
+    sum_file = pathlib.Path(eclipse_runs["SUM"][0])
+    shutil.copy(sum_file.with_suffix(".SMSPEC"), tmp_path / "BAD.SMSPEC")
+    (tmp_path / "BAD.UNSMRY").write_bytes(b"\x00\x00\x00\x10BADFILE")
+    with pytest.raises(ValueError):
+        check_summary_files(tmp_path / "BAD.UNSMRY")
+
+    (tmp_path / "BAD.UNSMRY").unlink()
+    with pytest.raises(ValueError):
+        check_summary_files(tmp_path / "BAD.SMSPEC")
+
+
+def test_check_summary_files_mismatch(resources, tmp_path, monkeypatch):
+    monkeypatch.setattr(eclx._eclbinary, "ECLX_INDEX_CACHE", tmp_path / "cache")
+    source = resources / "t1a" / "TUT1A"
+    shutil.copy(source.with_suffix(".UNSMRY"), tmp_path / "CASE.UNSMRY")
+    with EclBinaryFile(source.with_suffix(".SMSPEC"), use_index=False) as spec:
+        nlist = int(spec["DIMENS"][0])
+        keywords = []
+        for kw in spec.keywords:
+            values = native_array(spec.read_keyword(kw))
+            if kw.name == "DIMENS":
+                values = values.copy()
+                values[0] = nlist - 1
+            elif kw.length == nlist:
+                values = values[:-1]
+            keywords.append((kw.name, values, kw.type))
+    write_ecl_binary(tmp_path / "CASE.SMSPEC", keywords)
+
+    with pytest.raises(ValueError, match="PARAMS"):
+        check_summary_files(tmp_path / "CASE.UNSMRY")
+    # checking a summary doesn't save keyword indexes
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "CASE.SMSPEC",
+        "CASE.UNSMRY",
+    ]
+
+
+def test_load_summary_df_unknown_curves(eclipse_runs):
+    sum_file = eclipse_runs["SUM"][0]
+    with pytest.raises(ValueError, match="NOTACURVE"):
+        load_summary_df(sum_file, curves=["FOPR", "NOTACURVE"])
+
+
+def test_load_summary_index(eclipse_runs):
+    index = load_summary_index(eclipse_runs["SUM"][0])
+    assert list(index.columns) == ["key", "keyword", "wgname", "num", "unit", "column"]
+    assert "WBHP:PROD" in set(index["key"])
+    assert get_summary_keys(eclipse_runs["SUM"][0], backend="numpy") == (
+        get_summary_keys(eclipse_runs["SUM"][0])
+    )
+
+
+@pytest.mark.parametrize("curves", [None, ["WBHP:PROD", "FOPT"]])
+def test_load_summary_df_numpy(eclipse_runs, curves):
+    sum_file = eclipse_runs["SUM"][0]
+    expected = load_summary_df(sum_file, curves=curves)
+    sum_df = load_summary_df(sum_file, curves=curves, backend="numpy")
+    pd.testing.assert_frame_equal(sum_df, expected)
+    with pytest.raises(ValueError):
+        load_summary_df(sum_file, curves=["NOTACURVE"], backend="numpy")
+
+
+@pytest.mark.parametrize(
+    "curves,expected",
+    [
+        (["WBHP:*"], ["WBHP:INJ", "WBHP:PROD"]),
+        (["W*:PROD"], ["WBHP:PROD", "WWCT:PROD"]),
+        (["F?PT", "FOPT"], ["FOPT", "FWPT"]),
+        (["FOPR", "W*:P[R]OD"], ["FOPR", "WBHP:PROD", "WWCT:PROD"]),
+        (["W*"], ["WBHP:INJ", "WBHP:PROD", "WWCT:PROD"]),
+    ],
+)
+@pytest.mark.parametrize("backend", ["ecl", "numpy"])
+def test_load_summary_df_patterns(eclipse_runs, curves, expected, backend):
+    sum_df = load_summary_df(eclipse_runs["SUM"][0], curves=curves, backend=backend)
+    assert list(sum_df.columns) == expected
+
+
+def test_select_summary_keys():
+    keys = ["FOPR", "FIPOIL:REG1", "FIPGAS:REG1", "FIPOIL:REG2", "WOPR:OP1"]
+    assert _select_summary_keys(keys, ["FIP*:REG1", "WOPR:*", "NOPE*"]) == (
+        ["FIPGAS:REG1", "FIPOIL:REG1", "WOPR:OP1"],
+        ["NOPE*"],
+    )
+    assert _select_summary_keys(keys) == (keys, [])
+
+
+ENSEMBLE = [("t1a", "TUT1A"), ("t1e", "TUT1E"), ("t1an", "TUT1AN"), ("t1uu", "TUT1UU")]
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_load_ensemble_summary(resources, workers):
+    paths = [resources / folder / deck for folder, deck in ENSEMBLE]
+    sum_df = load_ensemble_summary(paths, curves=["FOPR", "WBHP:*"], workers=workers)
+    assert sum_df.index.names == ["realisation", "date"]
+    assert list(sum_df.columns) == ["FOPR", "WBHP:INJ", "WBHP:PROD"]
+    for n, path in enumerate(paths):
+        expected = load_summary_df(
+            path.with_suffix(".SMSPEC"), curves=["FOPR", "WBHP:*"]
+        )
+        assert sum_df.loc[n].values.tolist() == expected.values.tolist()
+
+
+def test_load_ensemble_summary_resample(resources):
+    paths = {folder: resources / folder / deck for folder, deck in ENSEMBLE[:2]}
+    sum_df = load_ensemble_summary(paths, curves=["FOPT"], resample="MS")
+    assert list(sum_df.index.levels[0]) == ["t1a", "t1e"]
+    dates = sum_df.loc["t1a"].index
+    assert (dates.day == 1).all()
+    assert dates.equals(sum_df.loc["t1e"].index)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        dict(report_only=True),
+        dict(start="2021-01-01", end="2023-01-01"),
+        dict(start="2021-01-01", report_only=True),
+        dict(start="2030-01-01"),
+    ],
+)
+def test_load_summary_df_rows(eclipse_runs, options):
+    sum_file = eclipse_runs["SUM"][0]
+    sum_df = load_summary_df(sum_file, curves=["FOPT"], **options)
+    if "start" in options:
+        assert (sum_df.index >= pd.Timestamp(options["start"])).all()
+    if "end" in options:
+        assert (sum_df.index <= pd.Timestamp(options["end"])).all()
+    if options.get("report_only"):
+        with open_EclSum(sum_file) as esum:
+            assert set(sum_df.index.date).issubset(esum.report_dates)
+    numpy_df = load_summary_df(sum_file, curves=["FOPT"], backend="numpy", **options)
+    pd.testing.assert_frame_equal(sum_df, numpy_df)
+
+
+def test_load_summary_df_resample(eclipse_runs):
+    sum_file = eclipse_runs["SUM"][0]
+    sum_df = load_summary_df(sum_file, curves=["FOPT"])
+    yearly = load_summary_df(sum_file, curves=["FOPT"], resample="YS")
+    assert (yearly.index.dayofyear == 1).all()
+    assert yearly["FOPT"].iloc[0] == sum_df["FOPT"].iloc[0]
+    assert yearly["FOPT"].is_monotonic_increasing
+
+
+@pytest.mark.parametrize("backend", ["ecl", "numpy"])
+def test_export_summary_parquet(eclipse_runs, tmp_path, backend):
+    pq = pytest.importorskip("pyarrow.parquet")
+    sum_file = eclipse_runs["SUM"][0]
+    (path,) = export_summary(
+        sum_file, tmp_path / "sum.parquet", chunksize=5, backend=backend
+    )
+    assert pq.ParquetFile(path).num_row_groups == 5
+    sum_df = pq.read_table(path).to_pandas().set_index("date")
+    expected = load_summary_df(sum_file)
+    assert list(sum_df.columns) == list(expected.columns)
+    assert np.array_equal(sum_df.values, expected.values)
+    assert np.array_equal(sum_df.index.values, expected.index.values)
+
+
+def test_export_summary_arrow_partition(eclipse_runs, tmp_path):
+    ipc = pytest.importorskip("pyarrow.ipc")
+    paths = export_summary(
+        eclipse_runs["SUM"][0], tmp_path, format="arrow", partition=True
+    )
+    assert sorted(path.parent.name for path in paths) == [
+        "vector_type=field",
+        "vector_type=misc",
+        "vector_type=well",
+    ]
+    for path in paths:
+        table = ipc.open_file(path).read_all()
+        assert table.column_names[0] == "date"
+        if path.parent.name == "vector_type=well":
+            assert table.column_names[1:] == ["WBHP:INJ", "WBHP:PROD", "WWCT:PROD"]
@@ -1,10 +1,18 @@
+import numpy as np
+import pandas as pd
 import pytest
 
-from eclx._utils import test_open_eclfile as t_open_eclfile
+import eclx
+from eclx._utils import (
+    get_filetype,
+    find_ecl_decks,
+    _ecl_file_type,
+    _get_ecl_deck,
+    write_petrel,
+    _ecl_repeat_items,
+    _format_lines,
+)
 
-from ecl.summary import EclSum
-from ecl.eclfile import EclFile
-from ecl.grid import EclGrid
 
 # def test_scan_ecl_kw(eclipse_props):
 #     scan_ecl_kw(eclipse_props)
@@ -12,10 +20,72 @@ from ecl.grid import EclGrid
 
 
 @pytest.mark.parametrize(
-    "fext,hand",
-    [("SUM", EclSum), ("RST", EclFile), ("INIT", EclFile), ("GRID", EclGrid)],
+    "name",
+    ["A.DATA", "A.data", "A.FEGRID", "A.X0001", "A.F12", "A.A0001", "A.SMSPEC"]
+    + ["A.FUNSMRY", "A.RFT", "A.PRT", "A.XAB", "A.Y0001", "A"],
 )
-def test_test_open_eclfile(eclipse_runs, fext, hand):
-    filepath = eclipse_runs[fext][0]
-    proc = t_open_eclfile(hand, filepath)
-    assert proc.exitcode == 0
+def test_ecl_file_type(tmp_path, name):
+    (tmp_path / name).touch()
+    assert _ecl_file_type(name) == get_filetype(tmp_path / name)
+
+
+def test_find_ecl_decks(resources):
+    decks = find_ecl_decks(resources)
+    assert [deck.name for deck in decks] == ["TUT1A", "TUT1AN", "TUT1E", "TUT1UU"]
+    for deck, files in decks.items():
+        assert files == _get_ecl_deck(deck.with_suffix(".DATA"))
+    assert find_ecl_decks(resources, recursive=False) == dict()
+
+
+@pytest.fixture
+def petrel_df():
+    i, j, k = np.meshgrid(np.arange(1, 4), np.arange(1, 4), np.arange(1, 3))
+    df = pd.DataFrame(dict(i=i.ravel(), j=j.ravel(), k=k.ravel()))
+    df["PORO"] = np.linspace(0, 0.3, df.shape[0])
+    df.loc[::5, "PORO"] = np.nan
+    df["PERMX"] = np.logspace(-8, 14, df.shape[0])
+    df["FIPNUM"] = np.arange(df.shape[0]) % 3
+    return df
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+@pytest.mark.parametrize("cols", [8, 5])
+def test_write_petrel(tmp_path, petrel_df, cols, workers, monkeypatch):
+    # a worker task for every line
+    monkeypatch.setattr(eclx._utils, "_PETREL_BLOCK_LINES", 1)
+    props = ["PORO", "PERMX", "FIPNUM", "j"]
+    filepath = tmp_path / "props.GRDECL"
+    write_petrel(petrel_df, filepath, props=props, cols=cols, workers=workers)
+    text = filepath.read_text()
+    assert list(tmp_path.iterdir()) == [filepath]
+
+    expected = ""
+    for prp in props:
+        values = petrel_df[prp] + (prp == "j")
+        expected += f"{prp}\n"
+        for n in range(0, values.size, cols):
+            group = values.iloc[n : n + cols]
+            expected += "".join(" {:3.12g}".format(v) for v in group) + "\n"
+        expected += "/\n"
+    assert text.endswith(expected)
+    assert text.startswith("-- Python eclx output")
+    assert "-- 3, 3, 2\n" in text
+    assert petrel_df[props].describe().to_string().split("\n")[1] in text
+
+
+def test_write_petrel_no_summary(tmp_path, petrel_df):
+    filepath = tmp_path / "props.GRDECL"
+    write_petrel(petrel_df, filepath, props=["PORO"], summary_header="none")
+    assert "-- PORO \nPORO\n" in filepath.read_text()
+
+
+def test_ecl_repeat_items():
+    items = _ecl_repeat_items(np.array([1, 1, 1, 0, 1, 0, 0]))
+    assert items.tolist() == ["3*1", "0", "1", "2*0"]
+    assert _ecl_repeat_items(np.array([], dtype=int)).size == 0
+
+
+def test_format_lines():
+    values = np.arange(7, dtype=np.float32) / 4
+    text = "".join(_format_lines(values, 3, fmt=" %.9g", block_lines=1))
+    assert text == " 0 0.25 0.5\n 0.75 1 1.25\n 1.5\n"